@@ -0,0 +1,104 @@
+"""Synthetic MJPEG-over-HTTP cameras for benchmarks
+
+Serves http://127.0.0.1:<port>/cam/<n> as multipart MJPEG at a fixed
+frame rate. Frames are a moving test pattern pre-encoded once, so the
+server itself costs almost no CPU and does not skew the numbers of the
+process under test. Run it in its own process:
+
+    python benchmarks/mjpeg_server.py --port 8554 --width 1280 --height 720 --fps 15
+"""
+import time
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+
+BOUNDARY = 'rednvrframe'
+
+
+def render_pattern(width, height, fps, seconds=2, quality=80):
+    """Pre-encode a looping test pattern as JPEG frames"""
+    frames = []
+    count = max(1, int(fps * seconds))
+    gradient = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+    for i in range(count):
+        frame = cv2.merge([gradient, np.roll(gradient, i * width // count, axis=1), gradient[::-1]])
+        x = int((width - width // 8) * i / count)
+        cv2.rectangle(frame, (x, height // 3), (x + width // 8, 2 * height // 3), (255, 255, 255), -1)
+        cv2.putText(frame, f"{i:04d}", (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 4)
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        frames.append(jpeg.tobytes())
+    return frames
+
+
+class MJPEGServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, frames, fps):
+        super().__init__(address, MJPEGHandler)
+        self.frames = frames
+        self.fps = fps
+
+
+class MJPEGHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if not self.path.startswith('/cam/'):
+            self.send_error(404)
+            return
+        try:
+            camera = int(self.path.rsplit('/', 1)[1])
+        except ValueError:
+            camera = 0
+        frames = self.server.frames
+        interval = 1.0 / self.server.fps
+
+        self.send_response(200)
+        self.send_header('Content-Type', f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        # Offset cameras so they do not all show the same frame
+        index = camera * 7
+        next_time = time.monotonic()
+        try:
+            while True:
+                jpeg = frames[index % len(frames)]
+                self.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode()
+                )
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+                index += 1
+                # Absolute schedule so the rate does not drift with write time
+                next_time += interval
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_time = time.monotonic()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic MJPEG cameras")
+    parser.add_argument('--port', type=int, default=8554)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--fps', type=float, default=15)
+    args = parser.parse_args()
+
+    server = MJPEGServer(('127.0.0.1', args.port), render_pattern(args.width, args.height, args.fps), args.fps)
+    print(f"Serving http://127.0.0.1:{args.port}/cam/<n>", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""End-to-end capture/display benchmark with synthetic cameras
+
+Drives the real CameraWidget/CaptureThread pipeline headlessly against
+N synthetic MJPEG cameras served from a separate process, and reports
+delivered fps, capture-to-GUI latency percentiles, CPU per camera, RSS
+growth and dropped frames for each N as JSON:
+
+    python benchmarks/run_benchmark.py --counts 1,4,16,36,64 --output bench.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import socket
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import cv2
+import psutil
+import numpy as np
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication, QGridLayout, QWidget
+
+from ui.camera_widget import CameraWidget
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def run_events(seconds):
+    """Run the Qt event loop for a while"""
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec_()
+
+
+def percentiles(samples):
+    if not samples:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+    values = np.array(samples) * 1000
+    return {
+        'p50': round(float(np.percentile(values, 50)), 1),
+        'p95': round(float(np.percentile(values, 95)), 1),
+        'p99': round(float(np.percentile(values, 99)), 1),
+        'max': round(float(values.max()), 1)
+    }
+
+
+def wait_for_clocks(cameras, timeout=30):
+    """Run events until every camera has frames and its PTS clock has settled
+
+    Until then timestamps can still be re-anchored, which would show up as
+    latency that has nothing to do with the pipeline.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all(camera.metrics.received and camera.capture_thread.clock.settled for camera in cameras):
+            return True
+        run_events(0.1)
+    return False
+
+
+def counters(cameras):
+    fields = ('received', 'decoded', 'displayed', 'dropped')
+    return {field: sum(getattr(camera.metrics, field) for camera in cameras) for field in fields}
+
+
+def run_case(count, args):
+    """Measure one camera count; returns a result dict"""
+    port = free_port()
+    server = subprocess.Popen([
+        sys.executable, str(ROOT / 'benchmarks' / 'mjpeg_server.py'),
+        '--port', str(port), '--width', str(args.width), '--height', str(args.height), '--fps', str(args.fps)
+    ], stdout=subprocess.DEVNULL)
+    try:
+        if not wait_for_port(port):
+            raise RuntimeError("Synthetic camera server did not start")
+
+        # Tiles laid out like the real grid so painting and scaling cost the same
+        window = QWidget()
+        layout = QGridLayout(window)
+        layout.setSpacing(2)
+        columns = math.ceil(math.sqrt(count))
+        window.resize(1920, 1080)
+
+        latencies = []
+        first_frame = {}
+        started = time.monotonic()
+
+        def on_frame(index, frame, timestamp):
+            now = time.monotonic()
+            latencies.append(now - timestamp.monotonic)
+            first_frame.setdefault(index, now - started)
+
+        cameras = []
+        for i in range(count):
+            camera = CameraWidget(
+                f"bench{i}", f"Bench {i}", f"http://127.0.0.1:{port}/cam/{i}",
+                pacing=args.pacing, display_fps=args.display_fps
+            )
+            camera.capture_thread.frame_ready.connect(
+                lambda frame, timestamp, index=i: on_frame(index, frame, timestamp)
+            )
+            layout.addWidget(camera, i // columns, i % columns)
+            cameras.append(camera)
+        window.show()
+
+        process = psutil.Process()
+        run_events(args.warmup)
+        if not wait_for_clocks(cameras):
+            print("  Frame clocks did not settle; latency may include re-anchoring", file=sys.stderr, flush=True)
+
+        # Measurement window
+        latencies.clear()
+        before = counters(cameras)
+        cpu_before = process.cpu_times()
+        rss_before = process.memory_info().rss
+        measure_start = time.monotonic()
+        run_events(args.duration)
+        elapsed = time.monotonic() - measure_start
+        cpu_after = process.cpu_times()
+        rss_after = process.memory_info().rss
+        after = counters(cameras)
+
+        for camera in cameras:
+            camera.stop()
+        window.close()
+        window.deleteLater()
+        QApplication.processEvents()
+    finally:
+        server.terminate()
+        server.wait(5)
+
+    delta = {field: after[field] - before[field] for field in after}
+    cpu_seconds = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    cpu_percent = 100.0 * cpu_seconds / elapsed
+    ttff = sorted(first_frame.values())
+    return {
+        'cameras': count,
+        'connected': len(first_frame),
+        'duration': round(elapsed, 2),
+        'source_fps': args.fps,
+        'fps_per_camera': {
+            'received': round(delta['received'] / elapsed / count, 2),
+            'decoded': round(delta['decoded'] / elapsed / count, 2),
+            'displayed': round(delta['displayed'] / elapsed / count, 2)
+        },
+        'fps_total_displayed': round(delta['displayed'] / elapsed, 1),
+        'dropped': delta['dropped'],
+        'drop_ratio': round(delta['dropped'] / delta['received'], 4) if delta['received'] else None,
+        'latency_ms': percentiles(latencies),
+        'time_to_first_frame_s': {
+            'first': round(ttff[0], 2) if ttff else None,
+            'last': round(ttff[-1], 2) if ttff else None
+        },
+        'cpu_percent': round(cpu_percent, 1),
+        'cpu_percent_per_camera': round(cpu_percent / count, 2),
+        'rss_mb': round(rss_after / 2**20, 1),
+        'rss_growth_mb': round((rss_after - rss_before) / 2**20, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RedNVR pipeline benchmark")
+    parser.add_argument('--counts', default='1,4,16,36,64', help="comma-separated camera counts")
+    parser.add_argument('--duration', type=float, default=20, help="measured seconds per count")
+    parser.add_argument('--warmup', type=float, default=5, help="seconds before measuring (at least until frame clocks settle)")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--fps', type=float, default=15, help="synthetic camera frame rate")
+    parser.add_argument('--pacing', default='drain', choices=['drain', 'fixed'])
+    parser.add_argument('--display-fps', type=float, default=None)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = []
+    for count in [int(c) for c in args.counts.split(',') if c.strip()]:
+        print(f"Benchmarking {count} cameras...", file=sys.stderr, flush=True)
+        result = run_case(count, args)
+        results.append(result)
+        print(f"  {result['fps_per_camera']['displayed']} fps/camera displayed, "
+              f"p95 latency {result['latency_ms']['p95']} ms, CPU {result['cpu_percent']}%, "
+              f"RSS +{result['rss_growth_mb']} MB, dropped {result['dropped']}", file=sys.stderr, flush=True)
+
+    report = {
+        'machine': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'opencv': cv2.__version__,
+            'cpu_count': os.cpu_count(),
+            'memory_gb': round(psutil.virtual_memory().total / 2**30, 1)
+        },
+        'config': {
+            'width': args.width, 'height': args.height, 'fps': args.fps,
+            'pacing': args.pacing, 'display_fps': args.display_fps,
+            'duration': args.duration, 'warmup': args.warmup
+        },
+        'results': results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,46 +1,71 @@
-import json
-from pathlib import Path
+from core.config_store import ConfigStore
 
 
 class AppConfig:
     """Simple application configuration"""
     
+    # Default configuration
+    DEFAULTS = {
+        'theme': 'dark',
+        'recording_path': 'recordings',
+        'recording_quality': 'high',
+        'recording_format': 'mp4',
+        'default_fps': 30,
+        'enable_audio': True,  # record audio for cameras whose entry has no record_audio setting
+        'motion_detection': False,
+        'auto_start': True,
+        'capture_pacing': 'drain',  # 'drain' (grab/retrieve) or 'fixed' (~30 fps sleep)
+        'display_fps': None,  # None decodes every frame for display
+        'recording_mode': 'continuous',  # or 'smart' (reduced rate while static)
+        'smart_static_fps': 1.0,
+        'smart_change_threshold': 0.01,  # fraction of pixels that must change
+        'replay_seconds': 30,
+        'replay_memory_mb': 256,  # shared by all instant replay buffers
+        'audio_event_threshold_db': -20.0,  # loudness (dBFS) that always triggers
+        'audio_event_sigma': 4.0,  # jump above background level that triggers
+        'event_recording_seconds': 30,  # recording length after the last audio event
+        'retention_days': None,  # None keeps recordings forever
+        'metrics_port': None,  # Prometheus endpoint on localhost, None disables it
+        'tracing': False,  # record pipeline spans from startup
+        'lag_threshold_ms': 250,  # GUI stalls longer than this are logged with a stack
+        'startup_concurrency': 4,  # cameras connecting at the same time
+        'grid_page_size': 16,  # cameras per page in the automatic grid; the rest are paged
+        'tour_interval': 10,  # seconds each tour page is shown
+        'tour_prewarm': 3,  # seconds before a switch the next page starts decoding
+        'tour_release_delay': 5,  # seconds a page keeps decoding after it was left
+        'tour_groups': None,  # lists of camera ids to tour instead of pages
+        'main_streams_warm': 2,  # main streams kept connected for single view (0 disables warming)
+        'main_stream_release_delay': 10,  # seconds a main stream stays connected after it was wanted
+        'video_wall_layouts': None,  # layout per screen, e.g. ['4x4', '1+5']; None uses the automatic grid
+        'video_wall_cameras': None,  # lists of camera ids per screen; None spreads all cameras over the screens
+        'video_wall_fps': 25  # render rate limit of each video wall screen
+    }
+    
     def __init__(self):
-        self.config_file = Path("config/app_config.json")
+        self.store = ConfigStore("config/app_config.json", default={})
+        self.config_file = self.store.path
         self.config = self.load_config()
+        # The store writes the merged config, as save_config always has
+        self.store.data = self.config
         
     def load_config(self):
         """Load configuration from file"""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-                
-        # Default configuration
-        return {
-            'theme': 'dark',
-            'recording_path': 'recordings',
-            'recording_quality': 'high',
-            'recording_format': 'mp4',
-            'default_fps': 30,
-            'enable_audio': True,
-            'motion_detection': False,
-            'auto_start': True
-        }
+        config = dict(self.DEFAULTS)
+        if isinstance(self.store.data, dict):
+            config.update(self.store.data)
+        return config
         
     def save_config(self):
-        """Save configuration to file"""
-        self.config_file.parent.mkdir(exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
-            
+        """Save configuration to file now"""
+        self.store.mark_dirty()
+        self.store.flush()
+        
     def get(self, key, default=None):
         """Get configuration value"""
         return self.config.get(key, default)
         
     def set(self, key, value):
-        """Set configuration value"""
-        self.config[key] = value
-        self.save_config()
+        """Set configuration value (written shortly after, batched with other changes)"""
+        with self.store.lock:
+            self.config[key] = value
+        self.store.mark_dirty()
@@ -0,0 +1,92 @@
+import math
+import time
+
+import numpy as np
+
+
+class AudioAnalyzer:
+    """Short-term loudness and band energy with threshold/anomaly events
+
+    Runs as an AudioSource sink on the decoder thread, so it works for any
+    camera whose audio is decoded, whether or not its video is. PCM is
+    analysed in WINDOW-second blocks: loudness is the RMS level in dBFS and
+    band energy comes from one real FFT per block. An event fires when
+    loudness crosses threshold_db or jumps anomaly_sigma standard
+    deviations above the camera's slowly adapting background level.
+    """
+
+    WINDOW = 0.1  # seconds per analysis block
+    BANDS = {
+        'low': (20, 300),
+        'mid': (300, 2000),
+        'high': (2000, 8000)
+    }
+    # Background level adaptation per block (~30 s time constant)
+    BASELINE_ALPHA = 0.003
+    # Blocks before the background is trusted for anomaly detection
+    WARMUP_BLOCKS = 50
+
+    def __init__(self, rate, channels, on_event, threshold_db=-20.0, anomaly_sigma=4.0, cooldown=5.0):
+        self.rate = rate
+        self.channels = channels
+        self.on_event = on_event  # callable(event dict)
+        self.threshold_db = threshold_db
+        self.anomaly_sigma = anomaly_sigma
+        self.cooldown = cooldown
+        self.block_size = int(rate * self.WINDOW)
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.window = np.hanning(self.block_size).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.block_size, 1.0 / rate)
+        self.band_masks = {name: (freqs >= low) & (freqs < high) for name, (low, high) in self.BANDS.items()}
+        self.baseline = None
+        self.variance = 1.0
+        self.blocks = 0
+        self.last_event = 0.0
+        self.loudness = -96.0
+        self.bands = {}
+
+    def __call__(self, samples, timestamp):
+        """AudioSource sink entry point"""
+        mono = samples.reshape(-1, self.channels).mean(axis=1, dtype=np.float32) / 32768.0
+        self.pending = np.concatenate([self.pending, mono])
+        while len(self.pending) >= self.block_size:
+            block, self.pending = self.pending[:self.block_size], self.pending[self.block_size:]
+            self.analyze(block, timestamp)
+
+    def analyze(self, block, timestamp):
+        rms = float(np.sqrt(np.mean(block * block)))
+        self.loudness = 20 * math.log10(max(rms, 1e-5))
+
+        spectrum = np.abs(np.fft.rfft(block * self.window)) ** 2
+        total = float(spectrum.sum()) or 1.0
+        self.bands = {name: float(spectrum[mask].sum()) / total for name, mask in self.band_masks.items()}
+
+        # Background loudness (EWMA mean/variance) for anomaly scoring
+        if self.baseline is None:
+            self.baseline = self.loudness
+        deviation = self.loudness - self.baseline
+        score = deviation / math.sqrt(self.variance)
+        self.blocks += 1
+
+        kind = None
+        if self.loudness >= self.threshold_db:
+            kind = 'loud'
+        elif self.blocks > self.WARMUP_BLOCKS and score >= self.anomaly_sigma:
+            kind = 'anomaly'
+        else:
+            # Only adapt to non-event audio so a long alarm is not learned away quickly
+            self.baseline += self.BASELINE_ALPHA * deviation
+            self.variance = max(1.0, (1 - self.BASELINE_ALPHA) * self.variance
+                                + self.BASELINE_ALPHA * deviation * deviation)
+
+        now = time.monotonic()
+        if kind and now - self.last_event >= self.cooldown:
+            self.last_event = now
+            self.on_event({
+                'type': kind,
+                'loudness': round(self.loudness, 1),
+                'baseline': round(self.baseline, 1),
+                'score': round(score, 1),
+                'bands': {name: round(value, 3) for name, value in self.bands.items()},
+                'time': timestamp.wall
+            })
@@ -0,0 +1,110 @@
+import logging
+import threading
+
+import numpy as np
+
+from core.audio_processor import AudioProcessor
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+
+
+class AudioMixer:
+    """Single shared output stream mixing every audible camera
+
+    The PyAudio device is opened when the first source becomes audible and
+    closed again when the last one goes quiet, so muted cameras never hold
+    a sound device or push silence through it.
+    """
+
+    def __init__(self, rate=SAMPLE_RATE, channels=CHANNELS, frames_per_buffer=1024):
+        self.rate = rate
+        self.channels = channels
+        self.frames_per_buffer = frames_per_buffer
+        self.sources = []
+        self.lock = threading.Lock()
+        self.pyaudio_instance = None
+        self.stream = None
+        self.output_latency = 0.0  # device buffer latency (seconds)
+
+    def add_source(self, source):
+        """Start mixing a source into the output"""
+        with self.lock:
+            if source in self.sources:
+                return
+            self.sources.append(source)
+            if self.stream is None:
+                self.open()
+
+    def remove_source(self, source):
+        """Stop mixing a source"""
+        with self.lock:
+            if source in self.sources:
+                self.sources.remove(source)
+            if not self.sources:
+                self.close()
+
+    def open(self):
+        """Open the shared output stream"""
+        import pyaudio
+        try:
+            if self.pyaudio_instance is None:
+                self.pyaudio_instance = pyaudio.PyAudio()
+            self.stream = self.pyaudio_instance.open(
+                format=pyaudio.paInt16,
+                channels=self.channels,
+                rate=self.rate,
+                output=True,
+                frames_per_buffer=self.frames_per_buffer,
+                stream_callback=self.callback
+            )
+            self.output_latency = self.stream.get_output_latency()
+            logger.info("Audio output opened")
+        except Exception as e:
+            logger.error(f"Audio output error: {e}")
+            self.stream = None
+
+    def close(self):
+        """Close the output stream"""
+        if self.stream is None:
+            return
+        try:
+            self.stream.stop_stream()
+            self.stream.close()
+        except Exception:
+            pass
+        self.stream = None
+        logger.info("Audio output closed")
+
+    def callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: sum all sources into one buffer"""
+        import pyaudio
+        samples = frame_count * self.channels
+        mix = np.zeros(samples, dtype=np.float32)
+        for source in list(self.sources):
+            chunk = source.read(samples)
+            if chunk is not None:
+                mix += source.processor.apply_gain(chunk)
+        return AudioProcessor.clip(mix).tobytes(), pyaudio.paContinue
+
+    def terminate(self):
+        """Release the audio device"""
+        with self.lock:
+            self.sources = []
+            self.close()
+            if self.pyaudio_instance:
+                self.pyaudio_instance.terminate()
+                self.pyaudio_instance = None
+
+
+_shared_mixer = None
+
+
+def shared_mixer():
+    """Return the process-wide audio mixer"""
+    global _shared_mixer
+    if _shared_mixer is None:
+        _shared_mixer = AudioMixer()
+    return _shared_mixer
@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+
+
+class AudioProcessor:
+    """Vectorized gain, clipping, resampling and level metering for PCM
+
+    Works on interleaved int16 arrays. Gain changes are ramped over one
+    chunk to avoid zipper noise, and the meter only looks at every
+    METER_DECIMATION-th sample, which is plenty for a level display.
+    """
+
+    METER_DECIMATION = 8
+    # Meter range shown on the UI
+    METER_FLOOR_DB = -60.0
+
+    def __init__(self, channels=2, input_rate=44100, output_rate=44100):
+        self.channels = channels
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.gain = 0.0
+        self.applied_gain = 0.0
+        self.rms = 0.0  # 0-1 of full scale
+        self.peak = 0.0
+        self.resample_position = 0.0
+        self.last_frame = None
+
+    def set_volume(self, volume):
+        """Set gain from a 0-100 volume (perceptual curve)"""
+        volume = max(0, min(100, volume)) / 100.0
+        # Squared curve so the slider feels linear in loudness
+        self.gain = volume * volume
+
+    def process_input(self, pcm):
+        """Resample decoded PCM to the output rate and update the meter"""
+        samples = np.frombuffer(pcm, dtype=np.int16) if isinstance(pcm, (bytes, bytearray)) else pcm
+        samples = samples[:len(samples) - len(samples) % self.channels]
+        self.measure(samples)
+        if self.input_rate != self.output_rate:
+            samples = self.resample(samples)
+        return samples
+
+    def measure(self, samples):
+        """Decimated RMS/peak metering"""
+        if len(samples) == 0:
+            return
+        probe = samples[::self.METER_DECIMATION].astype(np.float32) / 32768.0
+        self.rms = float(np.sqrt(np.mean(probe * probe)))
+        self.peak = float(np.max(np.abs(probe)))
+
+    def resample(self, samples):
+        """Linear-interpolation resampling, keeping phase across chunks"""
+        frames = samples.reshape(-1, self.channels).astype(np.float32)
+        # The last frame of the previous chunk becomes index 0 so
+        # interpolation is continuous across chunk boundaries
+        if self.last_frame is not None:
+            frames = np.vstack([self.last_frame, frames])
+
+        step = self.input_rate / self.output_rate
+        positions = np.arange(self.resample_position, len(frames) - 1, step)
+        if len(positions) == 0:
+            self.resample_position -= len(frames) - 1
+            self.last_frame = frames[-1:]
+            return np.zeros(0, dtype=np.int16)
+
+        base = np.arange(len(frames))
+        out = np.empty((len(positions), self.channels), dtype=np.float32)
+        for channel in range(self.channels):
+            out[:, channel] = np.interp(positions, base, frames[:, channel])
+
+        # Carry the read position (relative to the last frame) into the next chunk
+        self.resample_position = positions[-1] + step - (len(frames) - 1)
+        self.last_frame = frames[-1:]
+        return np.clip(out, -32768, 32767).astype(np.int16).reshape(-1)
+
+    def apply_gain(self, samples):
+        """Apply (ramped) gain and return float32 samples for mixing"""
+        target = self.gain
+        out = samples.astype(np.float32)
+        if target == self.applied_gain:
+            if target != 1.0:
+                out *= target
+        else:
+            frames = len(out) // self.channels
+            ramp = np.linspace(self.applied_gain, target, frames, dtype=np.float32)
+            out = (out.reshape(-1, self.channels) * ramp[:, None]).reshape(-1)
+            self.applied_gain = target
+        return out
+
+    @staticmethod
+    def clip(mix):
+        """Clip a float mix to int16 PCM"""
+        np.clip(mix, -32768, 32767, out=mix)
+        return mix.astype(np.int16)
+
+    def meter_level(self):
+        """Peak level on a 0-100 scale for the UI meter"""
+        if self.peak <= 0:
+            return 0
+        db = 20 * math.log10(self.peak)
+        return int(max(0.0, min(1.0, 1 - db / self.METER_FLOOR_DB)) * 100)
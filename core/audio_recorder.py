@@ -0,0 +1,205 @@
+import os
+import time
+import wave
+import logging
+import threading
+import subprocess
+
+from core.audio_mixer import CHANNELS
+from core.frame_clock import FrameClock
+from core.sources import is_synthetic, synthetic_audio_codec, ffmpeg_input_args
+
+logger = logging.getLogger(__name__)
+
+
+class AudioRecorder:
+    """Records a camera's audio track alongside a VideoRecorder
+
+    AAC audio is stream-copied by ffmpeg into an ADTS sidecar. Other codecs
+    (G.711, G.726, ...) cannot go into MP4 as-is, so the PCM already
+    decoded by the camera's shared AudioSource is written to a WAV sidecar
+    and encoded to AAC once, when muxing. Muxing runs when the video
+    recorder closes (on the encoder pool) and shifts the audio by the
+    difference between the first audio and first video capture times.
+    Audio index entries map wall-clock time to seconds in the audio track.
+    """
+
+    COPY_CODECS = {'aac'}
+    # Seconds between audio index entries
+    INDEX_INTERVAL = 1.0
+
+    def __init__(self, video_recorder, url, audio_source):
+        self.video = video_recorder
+        self.url = url
+        self.source = audio_source  # the camera's shared AudioSource, decodes non-AAC codecs
+        self.index = video_recorder.index
+        base, _ = os.path.splitext(video_recorder.filepath)
+        self.base = base
+        self.sidecar = None
+        self.mode = None  # 'copy' or 'pcm'
+        self.start_wall = None
+        self.media_time = 0.0
+        self.last_index = None
+        self.running = False
+        self.process = None
+        self.thread = None
+        self.audio_source = None  # self.source while its PCM is written
+        self.wav = None
+        self.lock = threading.Lock()
+        video_recorder.on_close.append(self.mux)
+
+    def start(self):
+        """Probe the audio track and start capturing it"""
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        codec = self.probe_codec()
+        if not self.running:
+            return
+        if codec is None:
+            logger.info(f"No audio track to record for {self.video.filepath}")
+        elif codec in self.COPY_CODECS:
+            self.record_copy()
+        else:
+            self.record_pcm()
+
+    def probe_codec(self):
+        """Return the codec name of the stream's first audio track"""
+        if is_synthetic(self.url):
+            return synthetic_audio_codec(self.url)
+        import ffmpeg
+        try:
+            info = ffmpeg.probe(self.url, select_streams='a', timeout=5000000)
+        except Exception as e:
+            logger.warning(f"Audio probe failed: {e}")
+            return None
+        streams = info.get('streams') or []
+        return streams[0].get('codec_name') if streams else None
+
+    def record_copy(self):
+        """Stream-copy AAC into an ADTS sidecar"""
+        self.mode = 'copy'
+        self.sidecar = self.base + '.audio.aac'
+        ffmpeg_cmd = [
+            'ffmpeg',
+            *ffmpeg_input_args(self.url),
+            '-vn',
+            '-c:a', 'copy',
+            '-f', 'adts',
+            '-loglevel', 'quiet',
+            '-'
+        ]
+        try:
+            self.process = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE)
+        except Exception as e:
+            logger.error(f"Audio recording error: {e}")
+            return
+        clock = FrameClock()
+        with open(self.sidecar, 'wb') as f:
+            while self.running:
+                data = self.process.stdout.read(4096)
+                if not data:
+                    break
+                f.write(data)
+                self.mark(clock.stamp())
+        # Reap ffmpeg (stop() terminates it unless the stream ended first)
+        if self.process.poll() is None:
+            self.process.terminate()
+        self.process.stdout.close()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+    def record_pcm(self):
+        """Write the shared decoder's PCM to a WAV sidecar"""
+        self.mode = 'pcm'
+        self.sidecar = self.base + '.audio.wav'
+        self.audio_source = self.source
+        self.wav = wave.open(self.sidecar, 'wb')
+        self.wav.setnchannels(CHANNELS)
+        self.wav.setsampwidth(2)
+        self.wav.setframerate(self.audio_source.mixer.rate)
+        self.audio_source.add_sink(self.write_pcm)
+        self.audio_source.acquire('record')
+
+    def write_pcm(self, samples, timestamp):
+        """AudioSource sink: append decoded samples (decoder thread)"""
+        with self.lock:
+            if not self.wav:
+                return
+            if self.start_wall is None:
+                self.start_wall = timestamp.wall
+            self.wav.writeframes(samples.tobytes())
+            self.media_time += len(samples) / CHANNELS / self.wav.getframerate()
+            self.mark(timestamp, self.media_time)
+
+    def mark(self, timestamp, media_time=None):
+        """Add an audio index entry every INDEX_INTERVAL seconds"""
+        if self.start_wall is None:
+            self.start_wall = timestamp.wall
+        if media_time is None:
+            media_time = timestamp.wall - self.start_wall
+        if self.last_index is None or media_time - self.last_index >= self.INDEX_INTERVAL:
+            self.last_index = media_time
+            self.index.add('audio', round(media_time, 3), timestamp)
+
+    def stop(self):
+        """Stop capturing (the sidecar is muxed when the video closes)"""
+        self.running = False
+        if self.process:
+            try:
+                self.process.terminate()
+            except Exception:
+                pass
+        if self.audio_source:
+            self.audio_source.remove_sink(self.write_pcm)
+            self.audio_source.release('record')
+        if self.thread:
+            self.thread.join(timeout=1)
+        with self.lock:
+            if self.wav:
+                self.wav.close()
+                self.wav = None
+
+    def mux(self, video_recorder):
+        """Mux the audio sidecar into the finished video file"""
+        if not self.sidecar or not os.path.exists(self.sidecar) or self.start_wall is None:
+            return
+        if video_recorder.start_wall is None or os.path.getsize(self.sidecar) == 0:
+            os.remove(self.sidecar)
+            return
+
+        video_path = video_recorder.filepath
+        root, extension = os.path.splitext(video_path)
+        muxed_path = f"{root}.muxing{extension}"
+        offset = self.start_wall - video_recorder.start_wall
+
+        # Positive offset: audio started after video, delay it; negative:
+        # audio started first, skip the part before the first video frame
+        audio_input = ['-itsoffset', f"{offset:.3f}"] if offset >= 0 else ['-ss', f"{-offset:.3f}"]
+        audio_codec = ['-c:a', 'copy'] if self.mode == 'copy' else ['-c:a', 'aac', '-b:a', '96k']
+        ffmpeg_cmd = [
+            'ffmpeg', '-y',
+            '-i', video_path,
+            *audio_input, '-i', self.sidecar,
+            '-map', '0:v', '-map', '1:a',
+            '-c:v', 'copy', *audio_codec,
+            '-loglevel', 'error',
+            muxed_path
+        ]
+        started = time.monotonic()
+        try:
+            subprocess.run(ffmpeg_cmd, check=True, timeout=600)
+            os.replace(muxed_path, video_path)
+            os.remove(self.sidecar)
+            logger.info(f"Muxed audio into {video_path} ({self.mode}, offset {offset:+.3f}s, "
+                        f"{time.monotonic() - started:.1f}s)")
+        except Exception as e:
+            # Keep the sidecar so nothing is lost
+            logger.error(f"Audio mux failed for {video_path}: {e}")
+            if os.path.exists(muxed_path):
+                os.remove(muxed_path)
@@ -0,0 +1,221 @@
+import time
+import logging
+import threading
+import subprocess
+
+import numpy as np
+
+from core.audio_mixer import SAMPLE_RATE, CHANNELS, shared_mixer
+from core.audio_processor import AudioProcessor
+from core.frame_clock import FrameClock
+from core.jitter_buffer import JitterBuffer
+from core.sources import ffmpeg_input_args
+
+logger = logging.getLogger(__name__)
+
+
+class AudioSource:
+    """On-demand audio decoder for one camera
+
+    Decoding runs only while something needs the audio. Consumers take a
+    named reference ('listen' when unmuted, 'record' while a recording
+    needs decoded audio); when the last one is released
+    the ffmpeg process is kept for GRACE_PERIOD seconds so quickly toggling
+    mute does not reconnect, then stopped.
+    """
+
+    GRACE_PERIOD = 10.0
+    # Small reads keep pipe latency low (~12 ms at 44.1 kHz stereo)
+    READ_SIZE = 2048
+    # Playout latency bounds; the target follows the video latency in between
+    MIN_LATENCY = 0.08
+    MAX_LATENCY = 1.0
+
+    def __init__(self, url, mixer=None, sample_rate=SAMPLE_RATE):
+        self.url = url
+        self.mixer = mixer or shared_mixer()
+        self.sample_rate = sample_rate  # decode rate; resampled to the mixer rate
+        self.processor = AudioProcessor(CHANNELS, sample_rate, self.mixer.rate)
+        self.reasons = set()  # 'listen', 'record', ...
+        self.sinks = []  # callables(samples, FrameTimestamp) fed decoded PCM
+        self._volume = 0
+        self.process = None
+        self.thread = None
+        self.stop_timer = None
+        self.lock = threading.Lock()
+        self.clock = FrameClock()
+        self.samples_received = 0  # frames since decoder start, at output rate
+        self.jitter = JitterBuffer(self.mixer.rate, CHANNELS, target_latency=0.15, max_latency=self.MAX_LATENCY)
+
+    @property
+    def volume(self):
+        return self._volume
+
+    @volume.setter
+    def volume(self, volume):
+        """Playback volume 0-100"""
+        self._volume = volume
+        self.processor.set_volume(volume)
+
+    @property
+    def level(self):
+        """Current input level 0-100 for meters"""
+        return self.processor.meter_level() if self.process is not None else 0
+
+    @property
+    def running(self):
+        return self.process is not None
+
+    def acquire(self, reason):
+        """Start decoding on behalf of reason"""
+        with self.lock:
+            self.reasons.add(reason)
+            if self.stop_timer:
+                self.stop_timer.cancel()
+                self.stop_timer = None
+            if self.process is None:
+                self.start()
+        if reason == 'listen':
+            self.mixer.add_source(self)
+
+    def release(self, reason):
+        """Drop reason; decoding stops after the grace period if unused"""
+        if reason == 'listen':
+            self.mixer.remove_source(self)
+        with self.lock:
+            self.reasons.discard(reason)
+            if not self.reasons and self.process is not None and self.stop_timer is None:
+                self.stop_timer = threading.Timer(self.GRACE_PERIOD, self.stop_if_unused)
+                self.stop_timer.daemon = True
+                self.stop_timer.start()
+
+    def start(self):
+        """Spawn the ffmpeg decoder (lock held)"""
+        # Note: ffmpeg must be installed on the system
+        ffmpeg_cmd = [
+            'ffmpeg',
+            *ffmpeg_input_args(self.url),
+            '-vn',  # no video
+            '-acodec', 'pcm_s16le',
+            '-ar', str(self.sample_rate),
+            '-ac', str(CHANNELS),
+            '-f', 's16le',
+            '-loglevel', 'quiet',
+            '-'
+        ]
+        try:
+            self.process = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE, bufsize=self.READ_SIZE)
+        except Exception as e:
+            logger.error(f"Audio decoder error: {e}")
+            self.process = None
+            return
+        self.clock.reset()
+        self.samples_received = 0
+        self.jitter.clear()
+        self.thread = threading.Thread(target=self.read_loop, args=(self.process,), daemon=True)
+        self.thread.start()
+
+    def read_loop(self, process):
+        """Move decoded PCM from ffmpeg into the buffer"""
+        while True:
+            data = process.stdout.read(self.READ_SIZE)
+            if not data:
+                break
+            received = time.monotonic()
+            samples = self.processor.process_input(data)
+            frames = len(samples) // CHANNELS
+            if frames == 0:
+                continue
+            # Sample clock anchored to arrival time, like video frames; the
+            # chunk's last sample arrived now, so its first one is earlier
+            pts_ms = self.samples_received * 1000.0 / self.mixer.rate
+            timestamp = self.clock.stamp(pts_ms or None, received - frames / self.mixer.rate)
+            self.samples_received += frames
+            with self.lock:
+                self.jitter.push(samples, timestamp.monotonic)
+            for sink in list(self.sinks):
+                sink(samples, timestamp)
+
+        # Reap ffmpeg, whether stop_process() terminated it or the stream ended
+        process.stdout.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+        with self.lock:
+            if self.process is not process:
+                return
+            # Stream ended on its own (camera gone); retry while still needed
+            self.process = None
+            if self.reasons:
+                logger.warning("Audio stream ended, reconnecting")
+                self.stop_timer = threading.Timer(2.0, self.restart)
+                self.stop_timer.daemon = True
+                self.stop_timer.start()
+
+    def restart(self):
+        with self.lock:
+            self.stop_timer = None
+            if self.reasons and self.process is None:
+                self.start()
+
+    def read(self, samples):
+        """Take samples int16 values for the mixer (None if nothing to play)"""
+        with self.lock:
+            chunk = self.jitter.pull(samples // CHANNELS, self.mixer.output_latency)
+        if chunk is None:
+            return None
+        if len(chunk) < samples:
+            chunk = np.pad(chunk, (0, samples - len(chunk)))
+        return chunk
+
+    def add_sink(self, sink):
+        """Receive decoded PCM (before playback gain) on the decoder thread"""
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def set_video_latency(self, latency):
+        """Delay audio to match the video's capture-to-display latency"""
+        self.jitter.target_latency = max(self.MIN_LATENCY, min(self.MAX_LATENCY * 0.8, latency))
+
+    def stats(self):
+        """Latency and underrun counters"""
+        return {
+            'latency': self.jitter.latency,
+            'target_latency': self.jitter.target_latency,
+            'buffered': self.jitter.buffered / self.mixer.rate,
+            'underruns': self.jitter.underruns,
+            'dropped': self.jitter.dropped
+        }
+
+    def stop_if_unused(self):
+        with self.lock:
+            self.stop_timer = None
+            if not self.reasons:
+                self.stop_process()
+
+    def stop_process(self):
+        """Terminate the decoder (lock held); read_loop() reaps it"""
+        if self.process is not None:
+            try:
+                self.process.terminate()
+            except Exception:
+                pass
+            self.process = None
+            self.jitter.clear()
+            self.processor.peak = self.processor.rms = 0.0
+
+    def close(self):
+        """Stop immediately regardless of consumers"""
+        self.mixer.remove_source(self)
+        with self.lock:
+            self.reasons.clear()
+            if self.stop_timer:
+                self.stop_timer.cancel()
+                self.stop_timer = None
+            self.stop_process()
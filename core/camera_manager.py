@@ -1,9 +1,17 @@
+import re
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def build_stream_url(url, username="", password=""):
+    """Insert credentials into an RTSP URL"""
+    if username and password:
+        return re.sub(r'(rtsp://)', lambda m: f"{m.group(1)}{username}:{password}@", url, count=1)
+    return url
+
+
 class CameraManager:
     """Simple camera manager"""
     
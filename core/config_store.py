@@ -0,0 +1,194 @@
+import os
+import copy
+import json
+import uuid
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigStore:
+    """JSON config file with batched, atomic writes
+
+    Changes only mark the store dirty. The file is written once, delay
+    seconds after the first change of a batch, so a burst of edits costs
+    one write. Writes go to a temporary file that is fsynced and renamed
+    over the old one, so a crash never leaves a truncated config. Call
+    flush() to write immediately (e.g. on exit).
+
+    self.data is shared with the writer thread: mutate it only while
+    holding self.lock, then call mark_dirty(). The lock is not held
+    during the disk write, so callers never wait for an fsync.
+    """
+
+    def __init__(self, path, default=None, delay=0.5):
+        self.path = Path(path)
+        self.default = default
+        self.delay = delay
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()  # one writer at a time, never under self.lock
+        self.timer = None
+        self.dirty = False
+        self.written = None  # file contents as last read or written
+        self.data = self.load()
+
+    def read(self):
+        """Current file contents, or None when missing"""
+        try:
+            return self.path.read_text()
+        except FileNotFoundError:
+            return None
+
+    def load(self):
+        """Parse the file, falling back to the default"""
+        text = self.read()
+        self.written = text
+        if text is not None:
+            try:
+                return json.loads(text)
+            except ValueError as e:
+                logger.error(f"Invalid config file {self.path}: {e}")
+        return copy.deepcopy(self.default)
+
+    def mark_dirty(self):
+        """Schedule a write of the current data"""
+        with self.lock:
+            self.dirty = True
+            if self.timer is None:
+                self.timer = threading.Timer(self.delay, self.flush)
+                self.timer.name = f"config-{self.path.stem}"
+                self.timer.start()
+
+    def flush(self):
+        """Write pending changes now"""
+        with self.write_lock:
+            with self.lock:
+                if self.timer is not None:
+                    self.timer.cancel()
+                    self.timer = None
+                if not self.dirty:
+                    return True
+                text = json.dumps(self.data, indent=2)
+                self.dirty = False
+                previous, self.written = self.written, text
+            try:
+                self.write(text)
+            except OSError as e:
+                logger.error(f"Failed to save {self.path}: {e}")
+                with self.lock:
+                    self.written = previous
+                    self.dirty = True
+                return False
+        return True
+
+    def write(self, text):
+        """Atomically replace the file with text"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(self.path.name + '.tmp')
+        with open(temp, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
+        if os.name == 'posix':
+            # Make the rename itself durable
+            fd = os.open(self.path.parent, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+
+class CameraStore(ConfigStore):
+    """The camera list (config/cameras.json) with bulk and incremental updates"""
+
+    def __init__(self, path="config/cameras.json", delay=0.5, new_id=None):
+        super().__init__(path, default=[], delay=delay)
+        self.new_id = new_id or (lambda: uuid.uuid4().hex[:8])
+        if not isinstance(self.data, list):
+            logger.error(f"{self.path} does not hold a camera list")
+            self.data = []
+        if self.assign_ids(self.data):
+            self.mark_dirty()
+
+    def assign_ids(self, cameras):
+        """Give hand-written entries without an id a new one, in place"""
+        assigned = False
+        for camera in cameras:
+            if isinstance(camera, dict) and not camera.get('id'):
+                camera['id'] = self.new_id()
+                assigned = True
+        return assigned
+
+    def cameras(self):
+        """Copy of all camera entries in configured order"""
+        with self.lock:
+            return copy.deepcopy(self.data)
+
+    def add(self, camera):
+        self.add_many([camera])
+
+    def add_many(self, cameras):
+        """Append camera entries with a single write"""
+        with self.lock:
+            self.data.extend(copy.deepcopy(camera) for camera in cameras)
+        self.mark_dirty()
+
+    def remove(self, camera_id):
+        self.remove_many([camera_id])
+
+    def remove_many(self, camera_ids):
+        """Drop camera entries with a single write"""
+        camera_ids = set(camera_ids)
+        with self.lock:
+            self.data = [camera for camera in self.data if camera.get('id') not in camera_ids]
+        self.mark_dirty()
+
+    def update(self, camera_id, camera):
+        """Replace one camera entry"""
+        with self.lock:
+            for i, entry in enumerate(self.data):
+                if entry.get('id') == camera_id:
+                    self.data[i] = copy.deepcopy(camera)
+                    break
+            else:
+                return
+        self.mark_dirty()
+
+    def reload(self):
+        """Re-read an externally edited file
+
+        Returns (added, removed, changed): new entries, ids of entries that
+        are gone and entries whose settings differ. The file wins over
+        changes that were not written yet.
+        """
+        # Not while our own write is in progress, or it would read as external
+        with self.write_lock, self.lock:
+            text = self.read()
+            if text is None or text == self.written:
+                return [], [], []
+            try:
+                data = json.loads(text)
+            except ValueError:
+                # Half-written by an editor; the next change event brings the rest
+                return [], [], []
+            if not isinstance(data, list):
+                return [], [], []
+            old = {camera.get('id'): camera for camera in self.data}
+            self.written = text
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self.dirty = False
+            self.data = data
+            if self.assign_ids(data):
+                # Store the new ids so the next start sees the same cameras
+                self.mark_dirty()
+            new = {camera.get('id'): camera for camera in data}
+            added = [copy.deepcopy(camera) for camera_id, camera in new.items() if camera_id not in old]
+            removed = [camera_id for camera_id in old if camera_id not in new]
+            changed = [copy.deepcopy(camera) for camera_id, camera in new.items()
+                       if camera_id in old and camera != old[camera_id]]
+        return added, removed, changed
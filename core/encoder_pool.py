@@ -0,0 +1,185 @@
+import os
+import queue
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class EncoderPool:
+    """Shared, bounded pool of encoder workers for all recordings
+
+    Capture threads only enqueue frames; a fixed number of workers (one per
+    core by default) do the resizing and encoding. Each recording gets an
+    EncoderChannel that keeps its frames in order and is scheduled on
+    whichever worker is free, so total encode load never exceeds the pool
+    size however many cameras record at once.
+    """
+
+    # Frames a worker encodes for one channel before giving others a turn
+    BATCH = 8
+    # Upper bound for raw frames waiting in all channels together
+    MAX_PENDING_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, workers=None):
+        self.worker_count = workers or os.cpu_count() or 2
+        self.ready = queue.Queue()
+        self.lock = threading.Lock()
+        self.pending_bytes = 0
+        self.channels = set()
+        self.threads = []
+        self.running = False
+
+    def start(self):
+        """Start worker threads"""
+        if self.running:
+            return
+        self.running = True
+        for i in range(self.worker_count):
+            thread = threading.Thread(target=self.worker, name=f"encoder-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        logger.info(f"Encoder pool started with {self.worker_count} workers")
+
+    def open_channel(self, recorder, max_pending=60):
+        """Create an ordered frame channel for a recorder"""
+        self.start()
+        channel = EncoderChannel(self, recorder, max_pending)
+        with self.lock:
+            self.channels.add(channel)
+        return channel
+
+    def schedule(self, channel):
+        self.ready.put(channel)
+
+    def worker(self):
+        """Encode frames from ready channels"""
+        while True:
+            channel = self.ready.get()
+            if channel is None:
+                break
+            try:
+                channel.process(self.BATCH)
+            except Exception as e:
+                logger.error(f"Encoder error ({channel.recorder.filepath}): {e}")
+                channel.fail()
+
+    def queue_depth(self):
+        """Total frames waiting to be encoded"""
+        with self.lock:
+            return sum(len(c.pending) for c in self.channels)
+
+    def shutdown(self, timeout=10):
+        """Finish open channels and stop workers"""
+        with self.lock:
+            channels = list(self.channels)
+        for channel in channels:
+            channel.close()
+        for channel in channels:
+            channel.closed.wait(timeout)
+        for _ in self.threads:
+            self.ready.put(None)
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+        self.running = False
+
+
+class EncoderChannel:
+    """Ordered frame queue feeding one recorder through the shared pool"""
+
+    def __init__(self, pool, recorder, max_pending):
+        self.pool = pool
+        self.recorder = recorder
+        self.max_pending = max_pending
+        self.pending = deque()
+        self.scheduled = False
+        self.closing = False
+        self.closed = threading.Event()
+        self.frames_dropped = 0
+
+    def submit(self, frame, timestamp):
+        """Queue a frame; returns False when it had to be dropped"""
+        with self.pool.lock:
+            if self.closing:
+                return False
+            if (len(self.pending) >= self.max_pending
+                    or self.pool.pending_bytes + frame.nbytes > self.pool.MAX_PENDING_BYTES):
+                # Encoders are saturated; the recorder's timeline repeats the
+                # previous frame for this slot
+                self.frames_dropped += 1
+                return False
+            self.pending.append((frame, timestamp))
+            self.pool.pending_bytes += frame.nbytes
+            schedule = not self.scheduled
+            self.scheduled = True
+        if schedule:
+            self.pool.schedule(self)
+        return True
+
+    def close(self):
+        """Finalize the recorder once queued frames are encoded"""
+        with self.pool.lock:
+            if self.closing:
+                return
+            self.closing = True
+            schedule = not self.scheduled
+            self.scheduled = True
+        if schedule:
+            self.pool.schedule(self)
+
+    def process(self, batch):
+        """Encode up to batch frames (called from a pool worker)"""
+        for _ in range(batch):
+            with self.pool.lock:
+                if not self.pending:
+                    break
+                frame, timestamp = self.pending.popleft()
+                self.pool.pending_bytes -= frame.nbytes
+            self.recorder.write(frame, timestamp)
+
+        reschedule = finish = False
+        with self.pool.lock:
+            if self.pending:
+                reschedule = True
+            else:
+                self.scheduled = False
+                finish = self.closing and not self.closed.is_set()
+        if reschedule:
+            self.pool.schedule(self)
+        elif finish:
+            self.finish()
+
+    def fail(self):
+        """Drop queued frames after an encoder error"""
+        with self.pool.lock:
+            for frame, _ in self.pending:
+                self.pool.pending_bytes -= frame.nbytes
+            self.pending.clear()
+            self.scheduled = False
+            self.closing = True
+        self.finish()
+
+    def finish(self):
+        try:
+            self.recorder.close()
+            logger.info(f"Stopped recording: {self.recorder.filepath} "
+                        f"({self.recorder.duration:.1f}s, {self.frames_dropped} frames dropped by encoder pool)")
+        finally:
+            with self.pool.lock:
+                self.pool.channels.discard(self)
+            self.closed.set()
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    """Return the process-wide encoder pool"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = EncoderPool()
+        return _shared_pool
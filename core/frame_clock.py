@@ -0,0 +1,112 @@
+import time
+from collections import namedtuple
+
+
+# pts       - stream presentation time in seconds (None when the stream has none)
+# monotonic - time.monotonic() instant the frame was captured at
+# wall      - the same instant as a time.time() value
+FrameTimestamp = namedtuple('FrameTimestamp', ['pts', 'monotonic', 'wall'])
+
+
+class FrameClock:
+    """Maps stream PTS onto a monotonic wall-clock anchor"""
+
+    # Re-anchor when PTS and the receive clock disagree by more than this (seconds)
+    MAX_DRIFT = 1.0
+    # Repeated drift re-anchors within this window mean the PTS clock runs at
+    # the wrong rate (e.g. MJPEG over HTTP with a made-up 25 fps timebase)
+    DRIFT_WINDOW = 30.0
+    MAX_DRIFT_RESETS = 3
+    # PTS must advance at the rate of the receive clock. It is compared over
+    # windows of this many seconds of arrivals, and PTS is no longer trusted
+    # after RATE_CHECKS windows in a row are off by more than MAX_RATE_ERROR,
+    # well before the drift re-anchors above add up
+    RATE_WINDOW = 2.0
+    MAX_RATE_ERROR = 0.2
+    RATE_CHECKS = 2
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget the current anchor (e.g. after a reconnect)"""
+        self.anchor_pts = None
+        self.anchor_monotonic = None
+        self.last_pts = None
+        self.last_monotonic = None
+        self.wall_offset = time.time() - time.monotonic()
+        self.trust_pts = True
+        self.drift_resets = 0
+        self.last_drift_reset = None
+        self.rate_start = None  # (pts, received) at the start of the rate window
+        self.rate_misses = 0
+        self.rate_checks = 0  # windows compared since the last anchor
+
+    @property
+    def settled(self):
+        """Whether PTS has been checked against arrival times or given up on"""
+        return not self.trust_pts or self.rate_checks >= self.RATE_CHECKS
+
+    def stamp(self, pts_ms=None, received=None):
+        """Timestamp a frame from its stream PTS in milliseconds"""
+        if received is None:
+            received = time.monotonic()
+        pts = pts_ms / 1000.0 if pts_ms is not None and pts_ms > 0 else None
+
+        if pts is not None and self.trust_pts:
+            # PTS went backwards or stalled: stream restarted, anchor again
+            if self.anchor_pts is None or self.last_pts is None or pts <= self.last_pts:
+                self.anchor_pts = pts
+                self.anchor_monotonic = received
+                self.rate_start = (pts, received)
+                self.rate_misses = 0
+                self.rate_checks = 0
+            else:
+                self.check_rate(pts, received)
+
+        if pts is None or not self.trust_pts:
+            monotonic = received
+        else:
+            monotonic = self.anchor_monotonic + (pts - self.anchor_pts)
+
+            if abs(received - monotonic) > self.MAX_DRIFT:
+                self.count_drift_reset(received)
+                self.anchor_pts = pts
+                self.anchor_monotonic = received
+                monotonic = received
+            elif monotonic > received:
+                # A frame cannot be captured after it arrived; the anchor was
+                # taken on a late frame, so pull it towards the earliest arrival
+                self.anchor_monotonic -= monotonic - received
+                monotonic = received
+            self.last_pts = pts
+
+        # Keep timestamps strictly increasing for writers and index lookups
+        if self.last_monotonic is not None and monotonic <= self.last_monotonic:
+            monotonic = self.last_monotonic + 1e-6
+        self.last_monotonic = monotonic
+
+        return FrameTimestamp(pts, monotonic, monotonic + self.wall_offset)
+
+    def count_drift_reset(self, received):
+        """Stop using PTS for timing when it keeps drifting from arrival times"""
+        if self.last_drift_reset is None or received - self.last_drift_reset > self.DRIFT_WINDOW:
+            self.drift_resets = 0
+        self.drift_resets += 1
+        self.last_drift_reset = received
+        if self.drift_resets >= self.MAX_DRIFT_RESETS:
+            # Arrival time is then the best capture estimate available
+            self.trust_pts = False
+
+    def check_rate(self, pts, received):
+        """Stop using PTS for timing when it advances at the wrong rate"""
+        start_pts, start_received = self.rate_start
+        elapsed = received - start_received
+        if elapsed < self.RATE_WINDOW:
+            return
+        rate = (pts - start_pts) / elapsed
+        self.rate_checks += 1
+        self.rate_misses = self.rate_misses + 1 if abs(rate - 1.0) > self.MAX_RATE_ERROR else 0
+        self.rate_start = (pts, received)
+        if self.rate_misses >= self.RATE_CHECKS:
+            self.trust_pts = False
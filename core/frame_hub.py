@@ -0,0 +1,53 @@
+import threading
+
+
+class FrameHub:
+    """Latest display frame of each camera, shared by every screen showing it
+
+    Capture threads publish the frames they decode for display and video
+    wall render threads read the newest one, so a camera shown on several
+    monitors is decoded and converted once. Published frames are never
+    modified, so readers use them without copying.
+    """
+
+    def __init__(self):
+        self.frames = {}  # camera_id -> (sequence, RGB ndarray, FrameTimestamp)
+        self.sequence = 0  # bumped on every publish
+        self.changed = threading.Condition()
+
+    def publish(self, camera_id, frame, timestamp=None):
+        with self.changed:
+            self.sequence += 1
+            self.frames[camera_id] = (self.sequence, frame, timestamp)
+            self.changed.notify_all()
+
+    def latest(self, camera_id):
+        """(sequence, frame, timestamp) of the camera's newest frame, or None"""
+        with self.changed:
+            return self.frames.get(camera_id)
+
+    def wait(self, sequence, timeout=None):
+        """Block until a frame newer than sequence is published; returns the current sequence"""
+        with self.changed:
+            self.changed.wait_for(lambda: self.sequence > sequence, timeout)
+            return self.sequence
+
+    def remove(self, camera_id):
+        """Drop a camera's frame (stopped or no longer shown)"""
+        with self.changed:
+            self.frames.pop(camera_id, None)
+            self.sequence += 1
+            self.changed.notify_all()
+
+
+_shared_hub = None
+_shared_hub_lock = threading.Lock()
+
+
+def shared_hub():
+    """Return the process-wide frame hub"""
+    global _shared_hub
+    with _shared_hub_lock:
+        if _shared_hub is None:
+            _shared_hub = FrameHub()
+        return _shared_hub
@@ -0,0 +1,47 @@
+class FramePacer:
+    """Decides which grabbed frames consumers need at their requested rates
+
+    The capture loop grabs every packet as soon as it arrives so the socket
+    and FFmpeg buffer never back up, then asks the pacer which consumers
+    (display, recording, ...) are due for the frame. Only frames with at
+    least one due consumer are retrieved and converted.
+    """
+
+    # Fraction of a consumer interval a frame may arrive early and still count
+    EARLY_TOLERANCE = 0.25
+
+    def __init__(self):
+        self.rates = {}  # consumer -> fps (None = every frame, 0 = paused)
+        self.next_due = {}  # consumer -> monotonic time of next wanted frame
+
+    def set_rate(self, consumer, fps=None):
+        """Request frames for consumer at fps (None for every frame)"""
+        self.rates[consumer] = fps
+        self.next_due.pop(consumer, None)
+
+    def remove(self, consumer):
+        """Stop delivering frames to consumer"""
+        self.rates.pop(consumer, None)
+        self.next_due.pop(consumer, None)
+
+    def due(self, monotonic):
+        """Return consumers that want a frame captured at monotonic"""
+        consumers = []
+        for consumer, fps in list(self.rates.items()):
+            if fps is None:
+                consumers.append(consumer)
+                continue
+            if fps <= 0:
+                continue
+
+            interval = 1.0 / fps
+            next_due = self.next_due.get(consumer)
+            if next_due is None or monotonic >= next_due - interval * self.EARLY_TOLERANCE:
+                consumers.append(consumer)
+                next_due = monotonic if next_due is None else next_due
+                next_due += interval
+                # Fell behind (stall, reconnect): restart the schedule from now
+                if next_due < monotonic:
+                    next_due = monotonic + interval
+                self.next_due[consumer] = next_due
+        return consumers
@@ -0,0 +1,128 @@
+import time
+from collections import deque
+
+import numpy as np
+
+
+class JitterBuffer:
+    """Timestamped PCM buffer played out at a target latency
+
+    Chunks are stored with the capture time of their first sample. The
+    playout side measures how long the sample it is about to play has been
+    waiting and nudges the consumption rate by up to MAX_CORRECTION
+    (inaudible resampling) to hold that at target_latency. This absorbs
+    network jitter, corrects clock drift between camera and sound card,
+    and lets audio be delayed to line up with the video latency.
+    """
+
+    MAX_CORRECTION = 0.02  # +-2% playback speed
+    CORRECTION_GAIN = 0.1  # speed change per second of latency error
+
+    def __init__(self, rate, channels, target_latency=0.15, max_latency=1.0):
+        self.rate = rate
+        self.channels = channels
+        self.target_latency = target_latency
+        self.max_latency = max_latency
+        self.chunks = deque()  # [capture_time, frames array (n, channels)]
+        self.buffered = 0  # frames
+        self.priming = True
+        self.latency = 0.0
+        self.underruns = 0
+        self.dropped = 0  # frames discarded for being too late
+
+    def push(self, samples, capture_time):
+        """Add interleaved int16 samples whose first sample was captured at capture_time"""
+        frames = samples.reshape(-1, self.channels)
+        if len(frames) == 0:
+            return
+        self.chunks.append([capture_time, frames])
+        self.buffered += len(frames)
+        # Nothing may be pulling (decoding only to record or analyse): keep
+        # at most max_latency of audio, the oldest would be skipped anyway
+        excess = self.buffered - int(self.max_latency * self.rate)
+        if excess > 0:
+            self.dropped += len(self.take(excess))
+
+    def clear(self):
+        self.chunks.clear()
+        self.buffered = 0
+        self.priming = True
+
+    def head_time(self):
+        """Capture time of the next sample to be played"""
+        return self.chunks[0][0] if self.chunks else None
+
+    def pull(self, frame_count, output_latency=0.0):
+        """Return frame_count frames (interleaved int16) or None while priming"""
+        now = time.monotonic() + output_latency
+        if not self.chunks:
+            if not self.priming:
+                self.underruns += 1
+                self.priming = True
+            return None
+
+        latency = now - self.head_time()
+        if self.priming:
+            # Wait until the oldest sample is old enough before starting
+            if latency < self.target_latency:
+                return None
+            self.priming = False
+
+        if latency > self.max_latency:
+            # Far behind (stall, device hiccup): skip straight to the target
+            self.skip(latency - self.target_latency)
+            if not self.chunks:
+                return None
+            latency = now - self.head_time()
+        self.latency = latency
+
+        error = latency - self.target_latency
+        correction = max(-self.MAX_CORRECTION, min(self.MAX_CORRECTION, error * self.CORRECTION_GAIN))
+        needed = max(1, int(round(frame_count * (1 + correction))))
+
+        frames = self.take(needed)
+        if len(frames) < needed:
+            self.underruns += 1
+            self.priming = True
+            needed = len(frames)
+            if needed == 0:
+                return None
+            frame_count = max(1, int(round(needed / (1 + correction))))
+
+        if needed != frame_count:
+            frames = self.stretch(frames, frame_count)
+        return frames.reshape(-1)
+
+    def take(self, count):
+        """Remove up to count frames from the head"""
+        parts = []
+        while count > 0 and self.chunks:
+            chunk = self.chunks[0]
+            frames = chunk[1]
+            if len(frames) <= count:
+                parts.append(frames)
+                self.chunks.popleft()
+                count -= len(frames)
+            else:
+                parts.append(frames[:count])
+                chunk[1] = frames[count:]
+                chunk[0] += count / self.rate
+                count = 0
+        if not parts:
+            return np.zeros((0, self.channels), dtype=np.int16)
+        taken = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        self.buffered -= len(taken)
+        return taken
+
+    def skip(self, seconds):
+        frames = self.take(int(seconds * self.rate))
+        self.dropped += len(frames)
+
+    def stretch(self, frames, count):
+        """Resample frames to count frames (speed correction)"""
+        source = np.arange(len(frames))
+        positions = np.linspace(0, len(frames) - 1, count)
+        out = np.empty((count, self.channels), dtype=np.float32)
+        for channel in range(self.channels):
+            out[:, channel] = np.interp(positions, source, frames[:, channel])
+        return out.astype(np.int16)
@@ -0,0 +1,98 @@
+import re
+import math
+from collections import namedtuple
+
+# A tile of a layout template, in units of the template's cell grid
+Cell = namedtuple('Cell', ['row', 'col', 'rows', 'cols'])
+LayoutTemplate = namedtuple('LayoutTemplate', ['rows', 'cols', 'cells'])
+
+ASPECT_RATIO = 16 / 9
+
+
+def grid_template(rows, cols):
+    """Plain rows x cols grid"""
+    return LayoutTemplate(rows, cols, [Cell(r, c, 1, 1) for r in range(rows) for c in range(cols)])
+
+
+def featured_template(size, big):
+    """One big tile in the top-left corner with small tiles around it
+
+    1+5 is a 3x3 grid with a 2x2 tile, 1+7 a 4x4 grid with a 3x3 tile.
+    Small tiles run down the right column, then along the bottom row.
+    """
+    cells = [Cell(0, 0, big, big)]
+    cells += [Cell(r, size - 1, 1, 1) for r in range(big)]
+    cells += [Cell(size - 1, c, 1, 1) for c in range(size)]
+    return LayoutTemplate(size, size, cells)
+
+
+def two_plus_eight():
+    """Two large tiles on top of two rows of four"""
+    cells = [Cell(0, 0, 2, 2), Cell(0, 2, 2, 2)]
+    cells += [Cell(r, c, 1, 1) for r in (2, 3) for c in range(4)]
+    return LayoutTemplate(4, 4, cells)
+
+
+TEMPLATES = {
+    '1+5': featured_template(3, 2),
+    '1+7': featured_template(4, 3),
+    '2+8': two_plus_eight(),
+}
+
+
+def auto_grid(count):
+    """Grid that fits count cameras"""
+    if count <= 1:
+        return grid_template(1, 1)
+    if count == 2:
+        return grid_template(1, 2)
+    if count <= 4:
+        return grid_template(2, 2)
+    if count <= 9:
+        return grid_template(math.ceil(count / 3), 3)
+    return grid_template(math.ceil(count / 4), 4)
+
+
+def get_template(name, count=0):
+    """Template for a layout name: 'grid' (auto), 'single', 'NxM' or a key of TEMPLATES"""
+    if name == 'grid':
+        return auto_grid(count)
+    if name == 'single':
+        return grid_template(1, 1)
+    if name in TEMPLATES:
+        return TEMPLATES[name]
+    match = re.fullmatch(r'(\d+)x(\d+)', name or '')
+    if match:
+        rows, cols = int(match.group(1)), int(match.group(2))
+        if rows > 0 and cols > 0:
+            return grid_template(rows, cols)
+    raise ValueError(f"Unknown layout: {name}")
+
+
+def tile_rects(template, width, height, spacing=10, margin=10, aspect=ASPECT_RATIO):
+    """Pixel rectangles (x, y, w, h) of a template's cells in a width x height area
+
+    Grid cells keep the aspect ratio and the whole grid is centered. Each
+    tile fills its cell (spanning cells include the spacing between them).
+    """
+    rows, cols = template.rows, template.cols
+    cell_width = max(1.0, (width - 2 * margin - (cols - 1) * spacing) / cols)
+    cell_height = max(1.0, (height - 2 * margin - (rows - 1) * spacing) / rows)
+    if aspect:
+        if cell_width / cell_height > aspect:
+            cell_width = cell_height * aspect
+        else:
+            cell_height = cell_width / aspect
+    grid_width = cols * cell_width + (cols - 1) * spacing
+    grid_height = rows * cell_height + (rows - 1) * spacing
+    left = (width - grid_width) / 2
+    top = (height - grid_height) / 2
+
+    rects = []
+    for cell in template.cells:
+        x = left + cell.col * (cell_width + spacing)
+        y = top + cell.row * (cell_height + spacing)
+        w = cell.cols * cell_width + (cell.cols - 1) * spacing
+        h = cell.rows * cell_height + (cell.rows - 1) * spacing
+        rects.append((int(round(x)), int(round(y)), int(w), int(h)))
+    return rects
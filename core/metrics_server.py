@@ -0,0 +1,95 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + '}'
+
+
+class MetricsServer:
+    """Prometheus text-format endpoint served from a daemon thread
+
+    Nothing is counted here: collectors are plain callables that read the
+    counters the pipeline already keeps (single-writer ints, no locks) at
+    scrape time. Each collector returns metric families as
+    (name, type, help, [(labels, value), ...]).
+    """
+
+    def __init__(self, port, host='127.0.0.1'):
+        self.host = host
+        self.port = port
+        self.collectors = []
+        self.httpd = None
+        self.thread = None
+
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+
+    def render(self):
+        """Render all collectors in the Prometheus text exposition format"""
+        lines = []
+        for collector in list(self.collectors):
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.error(f"Metrics collector failed: {e}")
+                continue
+            for name, metric_type, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    if isinstance(value, float):
+                        value = repr(value)
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def start(self):
+        """Start serving /metrics"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = server.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would flood the log
+                pass
+
+        try:
+            self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            logger.error(f"Metrics endpoint unavailable on {self.host}:{self.port}: {e}")
+            return False
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='metrics', daemon=True)
+        self.thread.start()
+        logger.info(f"Metrics endpoint on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        """Stop serving"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
@@ -0,0 +1,105 @@
+import time
+import bisect
+
+
+class Histogram:
+    """Fixed-bucket timing histogram (milliseconds)"""
+
+    BOUNDS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        ms = seconds * 1000.0
+        self.buckets[bisect.bisect_left(self.BOUNDS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile"""
+        if not self.count:
+            return 0.0
+        rank = self.count * p / 100.0
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return self.BOUNDS[i] if i < len(self.BOUNDS) else self.max
+        return self.max
+
+
+class PipelineMetrics:
+    """Frame counters and timings for one camera's capture pipeline
+
+    Every field has exactly one writer: the capture thread updates most
+    of them, the GUI thread bumps displayed after painting and the encoder
+    pool adds bytes_recorded when a recording is finalized.
+    Readers only ever see slightly stale integers, so no locking is
+    needed. Rates are derived from counter deltas by snapshot().
+    """
+
+    COUNTERS = ('received', 'decoded', 'displayed', 'recorded', 'dropped')
+
+    def __init__(self):
+        self.received = 0   # packets grabbed from the stream
+        self.decoded = 0    # frames retrieved (converted) for a consumer; grab() decodes every packet
+        self.displayed = 0  # frames painted by the GUI
+        self.recorded = 0   # frames handed to the encoder
+        self.dropped = 0    # frames skipped for a busy GUI or full encoder queue
+        self.reconnects = 0
+        self.bytes_recorded = 0  # finished recordings; written by the encoder pool
+        self.finalizing = []  # VideoRecorders stopped but not in bytes_recorded yet
+        self.bytes_reported = 0  # highest recording_bytes() value, so the counter never drops
+        self.decode_time = Histogram()
+        self.convert_time = Histogram()
+        self.bitrate = 0.0  # kbit/s reported by the demuxer (0 if unknown)
+        self.ingest_latency = 0.0
+        self.display_latency = None
+        self.connected_since = None
+        self.last = None
+        self.rates = {name: 0.0 for name in self.COUNTERS}
+
+    def snapshot(self, now=None):
+        """Counters, per-second rates and timing summary as a dict
+
+        Rates are recomputed at most once per second, from the GUI thread.
+        """
+        now = time.monotonic() if now is None else now
+        counts = {name: getattr(self, name) for name in self.COUNTERS}
+        if self.last is None:
+            self.last = (now, counts)
+        else:
+            last_time, last_counts = self.last
+            elapsed = now - last_time
+            if elapsed >= 1.0:
+                self.rates = {name: (counts[name] - last_counts[name]) / elapsed for name in self.COUNTERS}
+                self.last = (now, counts)
+
+        stats = dict(counts)
+        stats.update({
+            'fps': self.rates['decoded'],
+            'received_fps': self.rates['received'],
+            'display_fps': self.rates['displayed'],
+            'record_fps': self.rates['recorded'],
+            'drop_rate': self.rates['dropped'],
+            'decode_ms': self.decode_time.mean,
+            'decode_p95_ms': self.decode_time.percentile(95),
+            'convert_ms': self.convert_time.mean,
+            'convert_p95_ms': self.convert_time.percentile(95),
+            'bitrate_kbps': self.bitrate,
+            'reconnects': self.reconnects,
+            'ingest_latency_ms': self.ingest_latency * 1000,
+            'display_latency_ms': self.display_latency * 1000 if self.display_latency is not None else None,
+            'uptime': now - self.connected_since if self.connected_since else 0.0
+        })
+        return stats
@@ -0,0 +1,82 @@
+import json
+import bisect
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingIndex:
+    """Sidecar index mapping recorded positions to capture timestamps
+
+    Every line of the ``.idx`` file is a JSON object with the stream name,
+    its position in the recording (output frame number for video) and the
+    wall-clock capture time, so recordings can be seeked and lined up
+    against each other by real time rather than by frame count.
+    """
+
+    SUFFIX = '.idx'
+
+    def __init__(self, media_path):
+        self.path = Path(media_path).with_suffix(self.SUFFIX)
+        self.file = None
+        # Video (encoder pool) and audio threads share one index file
+        self.lock = threading.Lock()
+
+    def open(self):
+        """Open index for writing"""
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, 'a', buffering=64 * 1024)
+
+    def add(self, stream, position, timestamp, **extra):
+        """Append an entry for a FrameTimestamp"""
+        entry = {
+            'stream': stream,
+            'pos': position,
+            't': round(timestamp.wall, 6),
+        }
+        if timestamp.pts is not None:
+            entry['pts'] = round(timestamp.pts, 6)
+        entry.update(extra)
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, 'a', buffering=64 * 1024)
+            self.file.write(line)
+
+    def close(self):
+        """Flush and close index"""
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+
+    @classmethod
+    def load(cls, media_path, stream=None):
+        """Load index entries, optionally for a single stream"""
+        path = Path(media_path).with_suffix(cls.SUFFIX)
+        entries = []
+        if not path.exists():
+            return entries
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Last line may be truncated if the app was killed
+                    continue
+                if stream is None or entry.get('stream') == stream:
+                    entries.append(entry)
+        return entries
+
+    @classmethod
+    def find_position(cls, media_path, wall_time, stream='video'):
+        """Find the recorded position closest to (not after) a wall-clock time"""
+        entries = cls.load(media_path, stream)
+        if not entries:
+            return None
+        times = [e['t'] for e in entries]
+        i = bisect.bisect_right(times, wall_time) - 1
+        return entries[max(i, 0)]['pos']
@@ -1,7 +1,14 @@
+import time
 import logging
+import threading
+import subprocess
 from pathlib import Path
 from datetime import datetime
 
+from core.recording_profiles import FORMATS
+from core.recording_index import RecordingIndex
+from core.frame_clock import FrameTimestamp
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,6 +19,12 @@ class RecordingManager:
         self.recordings = {}
         self.recording_path = Path("recordings")
         self.recording_path.mkdir(exist_ok=True)
+        self.retention_days = None
+        self.retention_stop = threading.Event()
+        self.retention_thread = None
+        # Written only by the retention thread
+        self.retention_deleted = 0
+        self.retention_deleted_bytes = 0
         
     def start_recording(self, camera_id, camera_name):
         """Start recording for camera"""
@@ -47,11 +60,56 @@ class RecordingManager:
         camera_ids = list(self.recordings.keys())
         for camera_id in camera_ids:
             self.stop_recording(camera_id)
+        self.retention_stop.set()
+            
+    def start_retention(self, days, interval=3600):
+        """Delete recordings older than days, checking every interval seconds"""
+        self.retention_days = days
+        if not days or self.retention_thread:
+            return
+        self.retention_thread = threading.Thread(
+            target=self.retention_loop, args=(interval,), name='retention', daemon=True
+        )
+        self.retention_thread.start()
+        
+    def retention_loop(self, interval):
+        while True:
+            try:
+                self.apply_retention(self.retention_days)
+            except Exception as e:
+                logger.error(f"Retention failed: {e}")
+            if self.retention_stop.wait(interval):
+                break
+                
+    def apply_retention(self, days):
+        """Delete recordings (and their sidecars) older than days"""
+        cutoff = time.time() - days * 86400
+        deleted = 0
+        for recording in self.get_recordings():
+            path = Path(recording['filepath'])
+            if path.stat().st_mtime >= cutoff:
+                continue
+            # Index and audio sidecars share the recording's stem
+            prefix = path.stem + '.'
+            for file in list(self.recording_path.iterdir()):
+                if not file.name.startswith(prefix):
+                    continue
+                size = file.stat().st_size
+                file.unlink()
+                self.retention_deleted_bytes += size
+            self.retention_deleted += 1
+            deleted += 1
+        if deleted:
+            logger.info(f"Retention removed {deleted} recordings older than {days} days")
+        return deleted
             
     def get_recordings(self):
         """Get list of recorded files"""
         recordings = []
-        for file in self.recording_path.glob("*.mp4"):
+        extensions = {f".{extension}" for extension, _ in FORMATS.values()}
+        for file in self.recording_path.iterdir():
+            if file.suffix not in extensions:
+                continue
             recordings.append({
                 'filename': file.name,
                 'filepath': str(file),
@@ -59,7 +117,66 @@ class RecordingManager:
                 'created': datetime.fromtimestamp(file.stat().st_ctime)
             })
         return sorted(recordings, key=lambda x: x['created'], reverse=True)
-
-
-# ui/__init__.py
-# Empty file to make ui a package
+        
+    def event_log_path(self, camera_id):
+        """Per-camera index of events that happened while not recording"""
+        return self.recording_path / f"events_{camera_id}{RecordingIndex.SUFFIX}"
+        
+    def log_event(self, camera_id, label, wall_time=None):
+        """Bookmark an event in the camera's event log (no recording needed)"""
+        if wall_time is None:
+            wall_time = time.time()
+        monotonic = time.monotonic() - (time.time() - wall_time)
+        index = RecordingIndex(self.event_log_path(camera_id))
+        try:
+            index.add('bookmark', None, FrameTimestamp(None, monotonic, wall_time), label=label)
+        except OSError as e:
+            logger.error(f"Could not log event for {camera_id}: {e}")
+            return False
+        finally:
+            index.close()
+        return True
+        
+    def events(self, camera_id):
+        """Bookmarks logged for a camera outside recordings, in logged order"""
+        return RecordingIndex.load(self.event_log_path(camera_id), 'bookmark')
+        
+    def find_audio(self, start_time, end_time):
+        """Find recordings with audio between two wall-clock times (epoch seconds)"""
+        matches = []
+        for recording in self.get_recordings():
+            entries = RecordingIndex.load(recording['filepath'], 'audio')
+            if entries and entries[0]['t'] <= end_time and entries[-1]['t'] >= start_time:
+                matches.append(recording)
+        return matches
+        
+    def export_audio(self, filepath, start_time, end_time, output_path):
+        """Export the audio track between two wall-clock times to its own file"""
+        video_entries = RecordingIndex.load(filepath, 'video')
+        if not video_entries:
+            logger.error(f"No index for {filepath}")
+            return False
+            
+        # Container time 0 is the first video frame
+        origin = video_entries[0]['t']
+        start = max(0.0, start_time - origin)
+        duration = end_time - max(start_time, origin)
+        if duration <= 0:
+            return False
+            
+        ffmpeg_cmd = [
+            'ffmpeg', '-y',
+            '-ss', f"{start:.3f}",
+            '-i', str(filepath),
+            '-t', f"{duration:.3f}",
+            '-vn', '-c:a', 'copy',
+            '-loglevel', 'error',
+            str(output_path)
+        ]
+        try:
+            subprocess.run(ffmpeg_cmd, check=True, timeout=300)
+        except Exception as e:
+            logger.error(f"Audio export failed: {e}")
+            return False
+        logger.info(f"Exported audio: {output_path}")
+        return True
@@ -0,0 +1,97 @@
+# Recording profiles applied when frames are transcoded for recording
+
+# Named presets selectable per camera
+PROFILES = {
+    'evidence': {
+        'name': 'Evidence 1080p25 High',
+        'resolution': '1920x1080',
+        'fps': 25,
+        'quality': 'high'
+    },
+    'overview': {
+        'name': 'Overview 720p10',
+        'resolution': '1280x720',
+        'fps': 10,
+        'quality': 'medium',
+        'mode': 'smart'
+    },
+    'archive': {
+        'name': 'Archive 480p5 Low',
+        'resolution': '640x480',
+        'fps': 5,
+        'quality': 'low'
+    }
+}
+
+# recording_format -> (file extension, fourcc)
+FORMATS = {
+    'mp4': ('mp4', 'mp4v'),
+    'avi': ('avi', 'MJPG'),
+    'mkv': ('mkv', 'XVID')
+}
+
+# Encoder quality (0-100) for writers that support VIDEOWRITER_PROP_QUALITY
+QUALITY_LEVELS = {
+    'high': 95,
+    'medium': 75,
+    'low': 50
+}
+
+
+def build_profile(settings=None, config=None):
+    """Resolve the effective recording profile for a camera
+
+    Camera settings either name a preset in PROFILES or carry explicit
+    resolution/fps/quality values; anything left unset falls back to the
+    application defaults (recording_quality, recording_format, default_fps).
+    """
+    settings = settings or {}
+    config = config or {}
+
+    profile = {
+        'profile': 'custom',
+        'resolution': None,
+        'fps': config.get('default_fps'),
+        'quality': config.get('recording_quality', 'high'),
+        'format': config.get('recording_format', 'mp4'),
+        # 'continuous' records every frame; 'smart' drops to static_fps
+        # while the scene does not change
+        'mode': config.get('recording_mode', 'continuous'),
+        'static_fps': config.get('smart_static_fps', 1.0),
+        'change_threshold': config.get('smart_change_threshold', 0.01)
+    }
+
+    preset = PROFILES.get(settings.get('profile'))
+    if preset:
+        profile.update(preset)
+        profile['profile'] = settings['profile']
+    else:
+        for key in ('resolution', 'fps', 'quality', 'format', 'mode'):
+            if settings.get(key):
+                profile[key] = settings[key]
+
+    profile['quality'] = str(profile['quality']).lower()
+    if profile['format'] not in FORMATS:
+        profile['format'] = 'mp4'
+    return profile
+
+
+def parse_resolution(resolution):
+    """Parse '1920x1080' into (1920, 1080)"""
+    if not resolution:
+        return None
+    try:
+        width, height = str(resolution).lower().split('x')
+        return int(width), int(height)
+    except ValueError:
+        return None
+
+
+def fit_frame_size(source_size, max_size):
+    """Scale source_size down to fit max_size, keeping aspect ratio"""
+    width, height = source_size
+    if max_size:
+        scale = min(max_size[0] / width, max_size[1] / height, 1.0)
+        width, height = int(width * scale), int(height * scale)
+    # Most encoders need even dimensions
+    return max(2, width - width % 2), max(2, height - height % 2)
@@ -0,0 +1,112 @@
+import time
+import logging
+import threading
+from collections import deque
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayBuffer:
+    """Last few seconds of one camera kept in RAM as JPEG frames
+
+    Frames are downscaled and JPEG-compressed on the capture thread at a
+    reduced rate, so a 30 s buffer costs a few MB rather than the
+    gigabytes raw frames would take.
+    """
+
+    def __init__(self, camera_id, budget, seconds=30, fps=10, width=640, quality=70):
+        self.camera_id = camera_id
+        self.budget = budget
+        self.seconds = seconds
+        self.fps = fps
+        self.width = width
+        self.quality = quality
+        self.frames = deque()  # (FrameTimestamp, jpeg bytes)
+        self.size = 0
+        self.last_viewed = time.monotonic()
+        budget.register(self)
+
+    def add(self, frame, timestamp):
+        """Compress and append a BGR frame"""
+        height, width = frame.shape[:2]
+        if width > self.width:
+            frame = cv2.resize(frame, (self.width, height * self.width // width), interpolation=cv2.INTER_AREA)
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            return
+        self.budget.append(self, timestamp, jpeg.tobytes())
+
+    def touch(self):
+        """Mark camera as viewed (protects it from eviction)"""
+        self.last_viewed = time.monotonic()
+
+    def snapshot(self):
+        """Copy of buffered (timestamp, jpeg) frames, oldest first"""
+        with self.budget.lock:
+            return list(self.frames)
+
+    def clear(self):
+        self.budget.unregister(self)
+
+
+class ReplayMemoryBudget:
+    """Global bound on replay memory shared by all cameras
+
+    When the total goes over max_bytes the oldest frames of the least
+    recently viewed camera are dropped first.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total = 0
+        self.buffers = set()
+        self.lock = threading.Lock()
+
+    def register(self, buffer):
+        with self.lock:
+            self.buffers.add(buffer)
+
+    def unregister(self, buffer):
+        with self.lock:
+            self.buffers.discard(buffer)
+            self.total -= buffer.size
+            buffer.frames.clear()
+            buffer.size = 0
+
+    def append(self, buffer, timestamp, data):
+        """Add a frame to buffer, trimming by age and by global budget"""
+        with self.lock:
+            if buffer not in self.buffers:
+                return
+            buffer.frames.append((timestamp, data))
+            buffer.size += len(data)
+            self.total += len(data)
+
+            oldest = timestamp.monotonic - buffer.seconds
+            while buffer.frames and buffer.frames[0][0].monotonic < oldest:
+                self.drop_oldest(buffer)
+
+            while self.total > self.max_bytes:
+                victims = [b for b in self.buffers if b.frames]
+                victim = min(victims, key=lambda b: b.last_viewed)
+                self.drop_oldest(victim)
+
+    def drop_oldest(self, buffer):
+        _, data = buffer.frames.popleft()
+        buffer.size -= len(data)
+        self.total -= len(data)
+
+
+_shared_budget = None
+
+
+def replay_budget(max_mb=None):
+    """Return the process-wide replay memory budget"""
+    global _shared_budget
+    if _shared_budget is None:
+        _shared_budget = ReplayMemoryBudget()
+    if max_mb:
+        _shared_budget.max_bytes = int(max_mb * 1024 * 1024)
+    return _shared_budget
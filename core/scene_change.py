@@ -0,0 +1,71 @@
+import cv2
+import numpy as np
+
+
+class SceneChangeDetector:
+    """Measures frame-to-frame change on a downscaled grayscale image"""
+
+    def __init__(self, width=64, pixel_threshold=16):
+        self.width = width
+        self.pixel_threshold = pixel_threshold  # per-pixel delta treated as change
+        self.previous = None
+
+    def reset(self):
+        self.previous = None
+
+    def update(self, frame):
+        """Return fraction of pixels (0-1) that changed since the last frame"""
+        height = max(1, frame.shape[0] * self.width // frame.shape[1])
+        # Downscale first so the colour conversion only touches a few pixels
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        # Blur away sensor noise so a static scene reads as static
+        gray = cv2.GaussianBlur(gray, (3, 3), 0)
+
+        previous, self.previous = self.previous, gray
+        if previous is None or previous.shape != gray.shape:
+            return 1.0
+        changed = cv2.absdiff(gray, previous) > self.pixel_threshold
+        return float(np.count_nonzero(changed)) / changed.size
+
+
+class SmartRecordingGate:
+    """Decides which frames a smart recording keeps
+
+    While the scene changes every frame is recorded. Once it has been
+    static for `hold` seconds only `static_fps` frames per second are kept;
+    the recorder repeats the last kept frame on its timeline, which the
+    encoder codes as near-empty skip frames, so timestamps stay correct.
+    Frames are still probed at `probe_fps` while static so recording
+    snaps back to full rate as soon as change exceeds `threshold`.
+    """
+
+    def __init__(self, static_fps=1.0, threshold=0.01, hold=3.0, probe_fps=5.0):
+        self.static_fps = static_fps
+        self.threshold = threshold
+        self.hold = hold
+        self.probe_fps = probe_fps
+        self.detector = SceneChangeDetector()
+        self.active = True
+        self.active_until = None
+        self.next_static = 0.0
+        self.frames_skipped = 0
+
+    def keep(self, frame, timestamp):
+        """Return True if frame should be recorded"""
+        now = timestamp.monotonic
+        if self.detector.update(frame) >= self.threshold or self.active_until is None:
+            self.active_until = now + self.hold
+        self.active = now < self.active_until
+
+        if self.active or now >= self.next_static:
+            self.next_static = now + 1.0 / self.static_fps
+            return True
+        self.frames_skipped += 1
+        return False
+
+    def frame_rate(self, full_fps=None):
+        """Rate the capture thread should decode frames for recording at"""
+        if self.active:
+            return full_fps
+        return self.probe_fps if full_fps is None else min(self.probe_fps, full_fps)
@@ -0,0 +1,311 @@
+import os
+import time
+import logging
+from urllib.parse import urlsplit, parse_qs
+
+import cv2
+import numpy as np
+
+from core.recording_index import RecordingIndex
+
+logger = logging.getLogger(__name__)
+
+# URL schemes served locally instead of by a network camera:
+#   test://pattern?width=1280&height=720&fps=15&bitrate=2000&tone=440&disconnect=0
+#   file://videos/lobby.mp4?loop=1
+#   replay://recordings/Front_20250101_120000.mp4
+SYNTHETIC_SCHEMES = ('test', 'file', 'replay')
+
+
+def source_scheme(url):
+    return urlsplit(url).scheme.lower()
+
+
+def is_synthetic(url):
+    """True for sources generated or played back on this machine"""
+    return source_scheme(url) in SYNTHETIC_SCHEMES
+
+
+def source_params(url):
+    """Query parameters of a source URL as single values"""
+    return {key: values[-1] for key, values in parse_qs(urlsplit(url).query).items()}
+
+
+def source_path(url):
+    """Local file of a file:// or replay:// URL"""
+    parts = urlsplit(url)
+    # file://recordings/x.mp4 parses 'recordings' as the host
+    return parts.netloc + parts.path if parts.netloc not in ('', 'localhost') else parts.path
+
+
+def open_capture(url):
+    """Open a video source with the cv2.VideoCapture interface"""
+    scheme = source_scheme(url)
+    params = source_params(url)
+    if scheme == 'test':
+        return TestPatternCapture(
+            width=int(params.get('width', 1280)),
+            height=int(params.get('height', 720)),
+            fps=float(params.get('fps', 15)),
+            bitrate=float(params['bitrate']) if 'bitrate' in params else None,
+            disconnect=float(params.get('disconnect', 0))
+        )
+    if scheme == 'file':
+        return FileCapture(source_path(url), loop=params.get('loop', '1') != '0')
+    if scheme == 'replay':
+        return ReplayCapture(source_path(url), loop=params.get('loop', '1') != '0')
+    return cv2.VideoCapture(url)
+
+
+def ffmpeg_input_args(url):
+    """ffmpeg input arguments that decode a source's audio in real time"""
+    scheme = source_scheme(url)
+    params = source_params(url)
+    if scheme == 'test':
+        tone = float(params.get('tone', 440))
+        return ['-re', '-f', 'lavfi', '-i', f"sine=frequency={tone:g}:sample_rate=48000"]
+    if scheme in ('file', 'replay'):
+        loop = ['-stream_loop', '-1'] if params.get('loop', '1') != '0' else []
+        return ['-re', *loop, '-i', source_path(url)]
+    return ['-fflags', 'nobuffer', '-flags', 'low_delay', '-i', url]
+
+
+def synthetic_audio_codec(url):
+    """Audio codec of a synthetic source, or None when it has no audio"""
+    if source_scheme(url) == 'test':
+        return 'pcm_s16le' if float(source_params(url).get('tone', 440)) > 0 else None
+    import ffmpeg
+    try:
+        streams = ffmpeg.probe(source_path(url), select_streams='a').get('streams') or []
+    except Exception as e:
+        logger.warning(f"Audio probe failed: {e}")
+        return None
+    return streams[0].get('codec_name') if streams else None
+
+
+class PacedCapture:
+    """cv2.VideoCapture look-alike that delivers frames in real time
+
+    grab() blocks until the next frame is due, like reading a live
+    camera. A consumer that falls behind skips frames rather than
+    getting a backlog, as it would with a real camera. Subclasses
+    provide next_frame() -> (pts seconds, frame) or None at the end.
+    """
+
+    # Fall this far behind and frames are skipped to catch up
+    MAX_LAG = 0.5
+
+    def __init__(self, fps):
+        self.fps = fps
+        self.opened = True
+        self.started = None
+        self.pts = 0.0
+        self.frame = None
+
+    def isOpened(self):
+        return self.opened
+
+    def due_time(self, pts):
+        return self.started + pts
+
+    def grab(self):
+        if not self.opened:
+            return False
+        item = self.next_frame()
+        if item is None:
+            return False
+        pts, frame = item
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now - pts
+        # Skip frames when the consumer is late
+        while now - self.due_time(pts) > self.MAX_LAG:
+            item = self.next_frame()
+            if item is None:
+                return False
+            pts, frame = item
+        delay = self.due_time(pts) - now
+        if delay > 0:
+            time.sleep(delay)
+        self.pts = pts
+        self.frame = frame
+        return True
+
+    def retrieve(self):
+        if self.frame is None:
+            return False, None
+        return True, self.decode(self.frame)
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def decode(self, frame):
+        return frame
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return self.pts * 1000.0
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_BITRATE:
+            return self.bitrate()
+        return 0.0
+
+    def set(self, prop, value):
+        return False
+
+    def bitrate(self):
+        return 0.0
+
+    def release(self):
+        self.opened = False
+
+
+class TestPatternCapture(PacedCapture):
+    """Generated moving test pattern
+
+    A short loop of frames is rendered once. With a bitrate (kbit/s) the
+    frames are JPEG-encoded at a quality that meets it and decoded on
+    retrieve(), so decode cost and bitrate resemble an MJPEG camera.
+    With disconnect set, the stream drops every that many seconds to
+    exercise reconnects.
+    """
+
+    LOOP_SECONDS = 2
+
+    def __init__(self, width=1280, height=720, fps=15, bitrate=None, disconnect=0):
+        super().__init__(fps)
+        self.width = width
+        self.height = height
+        self.disconnect = disconnect
+        self.index = 0
+        self.frames = self.render()
+        self.encoded_bitrate = 0.0
+        if bitrate:
+            self.frames = self.encode(self.frames, bitrate)
+
+    def render(self):
+        width, height = self.width, self.height
+        count = max(1, int(self.fps * self.LOOP_SECONDS))
+        gradient = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+        frames = []
+        for i in range(count):
+            frame = cv2.merge([gradient, np.roll(gradient, i * width // count, axis=1), gradient[::-1]])
+            x = int((width - width // 8) * i / count)
+            cv2.rectangle(frame, (x, height // 3), (x + width // 8, 2 * height // 3), (255, 255, 255), -1)
+            cv2.putText(frame, f"TEST {width}x{height}", (20, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 3)
+            frame.setflags(write=False)
+            frames.append(frame)
+        return frames
+
+    def encode(self, frames, bitrate):
+        """JPEG-encode frames at the quality closest to bitrate kbit/s"""
+        target = bitrate * 1000 / 8 / self.fps  # bytes per frame
+        low, high = 5, 100
+        while high - low > 2:
+            quality = (low + high) // 2
+            _, jpeg = cv2.imencode('.jpg', frames[0], [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if len(jpeg) > target:
+                high = quality
+            else:
+                low = quality
+        encoded = [cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, low])[1] for frame in frames]
+        self.encoded_bitrate = sum(len(jpeg) for jpeg in encoded) / len(encoded) * 8 * self.fps / 1000
+        return encoded
+
+    def next_frame(self):
+        pts = self.index / self.fps
+        if self.disconnect and pts >= self.disconnect:
+            return None
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        return pts, frame
+
+    def decode(self, frame):
+        if frame.ndim == 1:
+            return cv2.imdecode(frame, cv2.IMREAD_COLOR)
+        return frame
+
+    def bitrate(self):
+        return self.encoded_bitrate
+
+
+class FileCapture(PacedCapture):
+    """Video file played at its own timing, optionally looped
+
+    Loops continue the PTS past the end of the file, so to the pipeline
+    it looks like one endless stream. Without looping the end of the
+    file reads as a dropped connection.
+    """
+
+    def __init__(self, path, loop=True):
+        self.path = path
+        self.loop = loop
+        self.capture = cv2.VideoCapture(path)
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        super().__init__(fps if 1 <= fps <= 240 else 25.0)
+        self.opened = self.capture.isOpened()
+        if not self.opened:
+            logger.error(f"Cannot open video file: {path}")
+        self.pts_offset = 0.0
+        self.last_pts = 0.0
+        self.position = 0  # frame number within the file
+
+    def next_frame(self):
+        ret, frame = self.capture.read()
+        if not ret:
+            if not self.loop or self.position == 0:
+                return None
+            # Wrap around and keep PTS increasing
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.pts_offset = self.last_pts + 1.0 / self.fps
+            self.position = 0
+            ret, frame = self.capture.read()
+            if not ret:
+                return None
+        self.last_pts = self.pts_offset + self.frame_time(self.position)
+        self.position += 1
+        return self.last_pts, frame
+
+    def frame_time(self, position):
+        """Seconds from the start of the file to a frame"""
+        return position / self.fps
+
+    def bitrate(self):
+        frames = self.capture.get(cv2.CAP_PROP_FRAME_COUNT)
+        if frames <= 0:
+            return 0.0
+        return os.path.getsize(self.path) * 8 / (frames / self.fps) / 1000
+
+    def release(self):
+        super().release()
+        self.capture.release()
+
+
+class ReplayCapture(FileCapture):
+    """A RedNVR recording played back as a live camera
+
+    Frames are paced by the capture times in the recording's index, so
+    the original frame rate changes and stalls come back as they
+    happened. Long outages are shortened to MAX_GAP. Recordings without
+    an index play at their nominal rate.
+    """
+
+    MAX_GAP = 5.0
+
+    def __init__(self, path, loop=True):
+        super().__init__(path, loop)
+        entries = [entry for entry in RecordingIndex.load(path, 'video') if 'gap' not in entry]
+        self.positions = None
+        if len(entries) > 1:
+            self.positions = np.array([entry['pos'] for entry in entries], dtype=np.float64)
+            times = np.array([entry['t'] for entry in entries], dtype=np.float64)
+            steps = np.clip(np.diff(times), 0, self.MAX_GAP)
+            self.times = np.concatenate([[0.0], np.cumsum(steps)])
+
+    def frame_time(self, position):
+        if self.positions is None:
+            return super().frame_time(position)
+        return float(np.interp(position, self.positions, self.times))
@@ -0,0 +1,112 @@
+import time
+import logging
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+TelemetrySnapshot = namedtuple('TelemetrySnapshot', [
+    'time',            # monotonic time of the sample
+    'cpu_percent',     # system-wide CPU use
+    'memory_percent',  # system RAM in use
+    'disk_free',       # bytes free on the recording disk
+    'disk_percent',
+    'net_sent_rate',   # bytes per second
+    'net_recv_rate',
+    'process_cpu',     # this process, percent of one core
+    'process_rss',     # bytes
+    'process_threads'
+])
+
+
+class TelemetrySampler:
+    """Background sampler of system and process statistics
+
+    psutil is only ever called from the sampler thread, using its
+    non-blocking interval=None form (CPU use since the previous call).
+    Each round builds an immutable TelemetrySnapshot and swaps it in with
+    a single assignment, so readers on any thread just take the latest
+    snapshot without locking or waiting.
+    """
+
+    # Disk usage can stall on network shares, so it is sampled less often
+    DISK_INTERVAL = 10.0
+
+    def __init__(self, interval=1.0, disk_path='.'):
+        self.interval = interval
+        self.disk_path = disk_path
+        self.snapshot = None
+        self.running = False
+        self.thread = None
+        self.wakeup = threading.Event()
+        self.process = None
+
+    def start(self):
+        """Start sampling in a daemon thread"""
+        if self.running:
+            return
+        self.running = True
+        self.wakeup.clear()
+        self.thread = threading.Thread(target=self.run, name='telemetry', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling"""
+        self.running = False
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def run(self):
+        # Imported on the sampler thread to keep it off application startup
+        import psutil
+        self.process = psutil.Process()
+        # Prime the CPU counters; the first non-blocking reading is meaningless
+        psutil.cpu_percent(interval=None)
+        self.process.cpu_percent(interval=None)
+        net = psutil.net_io_counters()
+        last = time.monotonic()
+        disk = None
+        disk_time = None
+
+        while not self.wakeup.wait(self.interval):
+            now = time.monotonic()
+            try:
+                if disk_time is None or now - disk_time >= self.DISK_INTERVAL:
+                    disk = psutil.disk_usage(self.disk_path)
+                    disk_time = now
+                elapsed = max(now - last, 1e-3)
+                current_net = psutil.net_io_counters()
+                with self.process.oneshot():
+                    process_cpu = self.process.cpu_percent(interval=None)
+                    process_rss = self.process.memory_info().rss
+                    process_threads = self.process.num_threads()
+                self.snapshot = TelemetrySnapshot(
+                    time=now,
+                    cpu_percent=psutil.cpu_percent(interval=None),
+                    memory_percent=psutil.virtual_memory().percent,
+                    disk_free=disk.free,
+                    disk_percent=disk.percent,
+                    net_sent_rate=(current_net.bytes_sent - net.bytes_sent) / elapsed,
+                    net_recv_rate=(current_net.bytes_recv - net.bytes_recv) / elapsed,
+                    process_cpu=process_cpu,
+                    process_rss=process_rss,
+                    process_threads=process_threads
+                )
+                net = current_net
+                last = now
+            except Exception as e:
+                logger.warning(f"Telemetry sample failed: {e}")
+
+
+_telemetry = None
+
+
+def telemetry(disk_path=None):
+    """Return the process-wide telemetry sampler (started on first use)"""
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = TelemetrySampler(disk_path=disk_path or '.')
+        _telemetry.start()
+    return _telemetry
@@ -0,0 +1,44 @@
+import os
+import logging
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# Last-known frame of each camera, shown at startup until the stream connects
+THUMBNAIL_DIR = os.path.join('config', 'thumbnails')
+THUMBNAIL_WIDTH = 640
+THUMBNAIL_QUALITY = 70
+
+
+def thumbnail_path(camera_id):
+    return os.path.join(THUMBNAIL_DIR, f"{camera_id}.jpg")
+
+
+def save_thumbnail(camera_id, frame, width=THUMBNAIL_WIDTH, quality=THUMBNAIL_QUALITY):
+    """Store a downscaled BGR frame as the camera's last-known image"""
+    if frame.shape[1] > width:
+        height = frame.shape[0] * width // frame.shape[1]
+        frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+    ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        return False
+    path = thumbnail_path(camera_id)
+    temp = path + '.tmp'
+    try:
+        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+        with open(temp, 'wb') as f:
+            f.write(jpeg.tobytes())
+        # Never leave a half-written image behind for the next startup
+        os.replace(temp, path)
+    except OSError as e:
+        logger.warning(f"Could not save thumbnail for {camera_id}: {e}")
+        return False
+    return True
+
+
+def remove_thumbnail(camera_id):
+    try:
+        os.remove(thumbnail_path(camera_id))
+    except OSError:
+        pass
@@ -0,0 +1,90 @@
+import os
+import json
+import time
+import logging
+import itertools
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Tracer:
+    """Opt-in span recorder with Chrome/Perfetto trace export
+
+    Spans go into a fixed-size ring buffer. Slots are claimed with
+    next() on an itertools.count, which is atomic under the GIL, so
+    threads never take a lock to record. Once the buffer wraps, the
+    oldest spans are overwritten. Call sites use begin()/end(). When
+    tracing is off, begin() returns None and end() returns at once.
+    """
+
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.enabled = False
+        self.events = [None] * capacity
+        self.counter = itertools.count()
+        self.origin = time.perf_counter()
+
+    def start(self):
+        """Start recording spans (clears previous ones)"""
+        self.events = [None] * self.capacity
+        self.counter = itertools.count()
+        self.enabled = True
+        logger.info("Tracing started")
+
+    def stop(self):
+        self.enabled = False
+        logger.info("Tracing stopped")
+
+    def begin(self):
+        """Start time of a span, or None when tracing is off"""
+        return time.perf_counter() if self.enabled else None
+
+    def end(self, name, started, camera=None):
+        """Record a span from begin() until now"""
+        if started is None:
+            return
+        index = next(self.counter) % self.capacity
+        self.events[index] = (name, started, time.perf_counter(), threading.get_ident(), camera)
+
+    def dump(self, path):
+        """Write recorded spans as Chrome trace JSON; returns the span count"""
+        events = [event for event in list(self.events) if event is not None]
+        events.sort(key=lambda event: event[1])
+        pid = os.getpid()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+        trace = []
+        for tid in {event[3] for event in events}:
+            trace.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                'args': {'name': thread_names.get(tid, str(tid))}
+            })
+        for name, started, ended, tid, camera in events:
+            trace.append({
+                'name': name,
+                'cat': 'pipeline',
+                'ph': 'X',
+                'ts': round((started - self.origin) * 1e6, 1),
+                'dur': round((ended - started) * 1e6, 1),
+                'pid': pid,
+                'tid': tid,
+                'args': {'camera': camera} if camera else {}
+            })
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+        logger.info(f"Trace with {len(events)} spans written to {path}")
+        return len(events)
+
+
+_shared_tracer = None
+
+
+def shared_tracer():
+    """Return the process-wide tracer"""
+    global _shared_tracer
+    if _shared_tracer is None:
+        _shared_tracer = Tracer()
+    return _shared_tracer
@@ -0,0 +1,112 @@
+import os
+import logging
+
+import cv2
+
+from core.recording_index import RecordingIndex
+from core.recording_profiles import fit_frame_size
+from core.tracer import shared_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class VideoRecorder:
+    """Writes frames onto the recording timeline by their capture timestamps
+
+    cv2.VideoWriter only knows a constant frame rate, so each frame is
+    placed at the output slot matching its capture time: slots the camera
+    did not fill repeat the previous frame and frames arriving ahead of the
+    timeline are dropped. Durations therefore follow the wall clock whatever
+    rate the camera really delivers, and the real timestamps of every
+    written frame go to the RecordingIndex sidecar.
+    """
+
+    # Longest gap filled with repeated frames; longer outages (reconnects)
+    # are skipped on the timeline and marked in the index instead
+    MAX_FILL_SECONDS = 5.0
+
+    def __init__(self, filepath, fps=30.0, fourcc='mp4v', max_size=None, quality=None):
+        self.filepath = str(filepath)
+        self.fps = float(fps)
+        self.fourcc = fourcc
+        self.max_size = max_size  # (width, height) the profile scales down to
+        self.quality = quality  # 0-100, where the codec supports it
+        self.writer = None
+        self.index = RecordingIndex(self.filepath)
+        self.frame_size = None
+        self.start_monotonic = None
+        self.start_wall = None
+        self.last_frame = None
+        self.on_close = []  # callbacks(recorder) run after the file is finalized
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.label = os.path.splitext(os.path.basename(self.filepath))[0]  # trace label
+        self.tracer = shared_tracer()
+
+    def open(self, frame):
+        """Open writer using the size of the first frame"""
+        height, width = frame.shape[:2]
+        self.frame_size = fit_frame_size((width, height), self.max_size)
+        fourcc = cv2.VideoWriter_fourcc(*self.fourcc)
+        self.writer = cv2.VideoWriter(self.filepath, fourcc, self.fps, self.frame_size)
+        if not self.writer.isOpened():
+            logger.error(f"Failed to open video writer: {self.filepath}")
+        elif self.quality is not None:
+            # Only honoured by some backends/codecs (e.g. MJPG)
+            self.writer.set(cv2.VIDEOWRITER_PROP_QUALITY, self.quality)
+        self.index.open()
+
+    def write(self, frame, timestamp):
+        """Write a BGR frame captured at timestamp"""
+        if self.writer is None:
+            self.open(frame)
+            self.start_monotonic = timestamp.monotonic
+            self.start_wall = timestamp.wall
+
+        tracer = self.tracer
+        if (frame.shape[1], frame.shape[0]) != self.frame_size:
+            started = tracer.begin()
+            frame = cv2.resize(frame, self.frame_size, interpolation=cv2.INTER_AREA)
+            tracer.end('resize', started, self.label)
+
+        target = int(round((timestamp.monotonic - self.start_monotonic) * self.fps))
+        if target < self.frames_written:
+            self.frames_dropped += 1
+            return
+
+        started = tracer.begin()
+        gap = target - self.frames_written
+        if gap > self.MAX_FILL_SECONDS * self.fps:
+            # Skip the outage instead of writing minutes of frozen video
+            skipped = gap / self.fps
+            self.start_monotonic += skipped
+            self.index.add('video', self.frames_written, timestamp, gap=round(skipped, 3))
+            gap = 0
+        elif self.last_frame is not None:
+            for _ in range(gap):
+                self.writer.write(self.last_frame)
+            self.frames_written += gap
+
+        self.index.add('video', self.frames_written, timestamp)
+        self.writer.write(frame)
+        self.frames_written += 1
+        self.last_frame = frame
+        tracer.end('record write', started, self.label)
+
+    def close(self):
+        """Finalize recording"""
+        if self.writer:
+            self.writer.release()
+            self.writer = None
+        self.index.close()
+        self.last_frame = None
+        for callback in self.on_close:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"Recording close handler failed: {e}")
+
+    @property
+    def duration(self):
+        """Recorded duration in seconds"""
+        return self.frames_written / self.fps
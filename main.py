@@ -1,5 +1,11 @@
+import time
+
+# Taken before the heavy imports so the startup log covers them
+STARTED = time.monotonic()
+
 import sys
 import os
+import signal
 import json
 import logging
 from datetime import datetime
@@ -9,7 +15,6 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 
-from ui.main_window import MainWindow
 from core.app_config import AppConfig
 
 # Configure logging
@@ -40,8 +45,17 @@ class RedNVR(QApplication):
         # Apply theme
         self.apply_theme()
         
-        # Create main window
-        self.main_window = MainWindow()
+        self.main_window = None
+        
+    def create_main_window(self):
+        """Import and build the main window (the bulk of startup)"""
+        # Imported here so the splash is up while the UI modules load
+        from ui.main_window import MainWindow
+        self.main_window = MainWindow(self.config)
+        
+        # kill -USR1 <pid> saves a pipeline trace
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, lambda *args: QTimer.singleShot(0, self.main_window.dump_trace))
         
     def apply_theme(self):
         """Apply modern dark theme"""
@@ -331,8 +345,6 @@ class RedNVR(QApplication):
         splash = QSplashScreen(splash_pix)
         splash.show()
         self.processEvents()
-        QTimer.singleShot(1500, splash.close)
-        QTimer.singleShot(1500, self.main_window.show)
         return splash
 
 
@@ -349,8 +361,14 @@ def main():
     # Set icon
     app.setWindowIcon(QIcon("assets/icons/rednvr.svg"))
     
-    # Show splash and start
+    # Show splash while the main window loads, then swap as soon as it is ready
     splash = app.show_splash()
+    splash_time = time.monotonic() - STARTED
+    app.create_main_window()
+    app.main_window.show()
+    splash.finish(app.main_window)
+    logging.info(f"Startup: splash after {splash_time * 1000:.0f} ms, "
+                 f"window after {(time.monotonic() - STARTED) * 1000:.0f} ms")
     
     sys.exit(app.exec_())
 
@@ -0,0 +1,89 @@
+import json
+import itertools
+
+from core.config_store import ConfigStore, CameraStore
+
+
+def camera_store(path):
+    ids = itertools.count()
+    return CameraStore(path, delay=60, new_id=lambda: f"n{next(ids)}")
+
+
+def test_flush_writes_batched_changes(tmp_path):
+    path = tmp_path / 'app.json'
+    store = ConfigStore(path, default={}, delay=60)
+    assert store.data == {}
+    with store.lock:
+        store.data['theme'] = 'dark'
+        store.data['default_fps'] = 25
+    store.mark_dirty()
+    store.mark_dirty()
+    assert not path.exists()  # waits for the batch delay
+    assert store.flush()
+    assert json.loads(path.read_text()) == {'theme': 'dark', 'default_fps': 25}
+    assert not store.dirty
+    assert not path.with_name('app.json.tmp').exists()
+    assert ConfigStore(path).data == {'theme': 'dark', 'default_fps': 25}
+
+
+def test_invalid_file_falls_back_to_default(tmp_path):
+    path = tmp_path / 'app.json'
+    path.write_text('{"theme": ')
+    assert ConfigStore(path, default={'theme': 'dark'}).data == {'theme': 'dark'}
+
+
+def test_reload_ignores_own_writes(tmp_path):
+    store = camera_store(tmp_path / 'cameras.json')
+    store.add({'id': 'a', 'name': 'Door', 'url': 'rtsp://door'})
+    assert store.flush()
+    assert store.reload() == ([], [], [])
+
+
+def test_reload_reports_external_edits(tmp_path):
+    path = tmp_path / 'cameras.json'
+    store = camera_store(path)
+    store.add_many([
+        {'id': 'a', 'name': 'Door', 'url': 'rtsp://door'},
+        {'id': 'b', 'name': 'Yard', 'url': 'rtsp://yard'},
+    ])
+    store.flush()
+    path.write_text(json.dumps([
+        {'id': 'a', 'name': 'Front door', 'url': 'rtsp://door'},
+        {'id': 'c', 'name': 'Garage', 'url': 'rtsp://garage'},
+    ]))
+    added, removed, changed = store.reload()
+    assert [camera['id'] for camera in added] == ['c']
+    assert removed == ['b']
+    assert changed == [{'id': 'a', 'name': 'Front door', 'url': 'rtsp://door'}]
+    assert store.reload() == ([], [], [])
+
+
+def test_reload_gives_id_less_entries_ids(tmp_path):
+    path = tmp_path / 'cameras.json'
+    store = camera_store(path)
+    store.add({'id': 'a', 'name': 'Door', 'url': 'rtsp://door'})
+    store.flush()
+    path.write_text(json.dumps([
+        {'id': 'a', 'name': 'Door', 'url': 'rtsp://door'},
+        {'name': 'Yard', 'url': 'rtsp://yard'},
+        {'name': 'Garage', 'url': 'rtsp://garage'},
+    ]))
+    added, removed, changed = store.reload()
+    assert [camera['name'] for camera in added] == ['Yard', 'Garage']
+    assert len({camera['id'] for camera in added}) == 2
+    assert removed == [] and changed == []
+
+    # The ids are written back, so the next reload and start see the same cameras
+    assert store.dirty
+    store.flush()
+    assert [camera['id'] for camera in json.loads(path.read_text())] == ['a'] + [camera['id'] for camera in added]
+    assert store.reload() == ([], [], [])
+    assert camera_store(path).cameras() == store.cameras()
+
+
+def test_load_gives_id_less_entries_ids(tmp_path):
+    path = tmp_path / 'cameras.json'
+    path.write_text(json.dumps([{'name': 'Yard', 'url': 'rtsp://yard'}, {'name': 'Garage', 'url': 'rtsp://garage'}]))
+    store = camera_store(path)
+    assert [camera['id'] for camera in store.cameras()] == ['n0', 'n1']
+    assert store.dirty
@@ -0,0 +1,27 @@
+from core.frame_clock import FrameClock
+
+
+def stamp_stream(clock, fps, pts_fps, seconds, start=100.0):
+    """Stamp frames arriving at fps whose PTS advance at pts_fps"""
+    stamps = []
+    for i in range(int(seconds * fps)):
+        stamps.append(clock.stamp((i + 1) * 1000.0 / pts_fps, start + i / fps))
+    return stamps
+
+
+def test_wrong_pts_rate_falls_back_to_arrival_time():
+    # MJPEG over HTTP at 15 fps with a made-up 25 fps timebase
+    clock = FrameClock()
+    stamps = stamp_stream(clock, 15, 25, clock.RATE_WINDOW * clock.RATE_CHECKS + 0.5)
+    assert not clock.trust_pts
+    assert clock.settled
+    assert clock.drift_resets < clock.MAX_DRIFT_RESETS
+    assert stamps[-1].monotonic == 100.0 + (len(stamps) - 1) / 15
+
+
+def test_matching_pts_rate_is_trusted():
+    clock = FrameClock()
+    stamps = stamp_stream(clock, 25, 25, 10)
+    assert clock.trust_pts
+    assert clock.settled
+    assert all(b.monotonic > a.monotonic for a, b in zip(stamps, stamps[1:]))
@@ -0,0 +1,23 @@
+import numpy as np
+
+from core.jitter_buffer import JitterBuffer
+
+
+def test_push_without_pull_stays_bounded():
+    rate, channels = 8000, 1
+    buffer = JitterBuffer(rate, channels, max_latency=1.0)
+    chunk = np.zeros(rate // 50, dtype=np.int16)  # 20 ms
+    for i in range(50 * 36):  # 36 s of audio, nobody pulling
+        buffer.push(chunk, i / 50)
+    assert buffer.buffered <= rate * buffer.max_latency
+    assert buffer.buffered == sum(len(frames) for _, frames in buffer.chunks)
+    assert buffer.dropped == 50 * 36 * len(chunk) - buffer.buffered
+
+
+def test_push_keeps_newest_audio():
+    buffer = JitterBuffer(1000, 1, max_latency=1.0)
+    for i in range(30):
+        buffer.push(np.full(100, i, dtype=np.int16), i / 10)
+    # The last second (10 chunks of 0.1 s) is left
+    assert buffer.head_time() == 2.0
+    assert buffer.chunks[0][1][0, 0] == 20
@@ -0,0 +1,46 @@
+import pytest
+
+from core.layout_templates import Cell, get_template, tile_rects
+
+
+def test_get_template_names():
+    assert get_template('single').cells == [Cell(0, 0, 1, 1)]
+    assert (get_template('3x4').rows, get_template('3x4').cols) == (3, 4)
+    assert len(get_template('3x4').cells) == 12
+    assert len(get_template('1+5').cells) == 6
+    assert len(get_template('1+7').cells) == 8
+    assert len(get_template('2+8').cells) == 10
+
+
+@pytest.mark.parametrize('count, shape', [(1, (1, 1)), (2, (1, 2)), (4, (2, 2)), (7, (3, 3)), (10, (3, 4)), (16, (4, 4))])
+def test_grid_fits_count(count, shape):
+    template = get_template('grid', count)
+    assert (template.rows, template.cols) == shape
+    assert len(template.cells) >= count
+
+
+@pytest.mark.parametrize('name', ['', 'huge', '0x3', None])
+def test_unknown_layout(name):
+    with pytest.raises(ValueError):
+        get_template(name)
+
+
+def test_tile_rects_centered_and_spanning():
+    # 16:9 area: 2x2 cells of 16:9 fill it exactly
+    rects = tile_rects(get_template('2x2'), 1920, 1080, spacing=0, margin=0)
+    assert rects == [(0, 0, 960, 540), (960, 0, 960, 540), (0, 540, 960, 540), (960, 540, 960, 540)]
+
+    # Big tile of 1+5 spans two cells plus the spacing between them (to the pixel)
+    rects = tile_rects(get_template('1+5'), 1920, 1080, spacing=10, margin=10)
+    big, small = rects[0], rects[1]
+    assert abs(big[2] - (2 * small[2] + 10)) <= 1
+    assert abs(big[3] - (2 * small[3] + 10)) <= 1
+    assert abs(small[0] - (big[0] + big[2] + 10)) <= 1
+    assert all(x >= 10 and y >= 10 and x + w <= 1910 and y + h <= 1070 for x, y, w, h in rects)
+
+
+def test_tile_rects_keep_aspect_ratio():
+    # Too wide for a single 16:9 tile: the tile is centered horizontally
+    (x, y, w, h), = tile_rects(get_template('single'), 2000, 900, spacing=0, margin=0)
+    assert (w, h) == (1600, 900)
+    assert (x, y) == (200, 0)
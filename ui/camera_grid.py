@@ -1,212 +1,492 @@
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-import math
+
+import time
+
+from core.layout_templates import get_template, tile_rects
 
 
 class CameraGrid(QWidget):
-    """Dynamic camera grid widget"""
+    """Dynamic camera grid widget
+    
+    Tiles are children of one container and are placed with setGeometry()
+    from a layout template (core.layout_templates); they are never
+    reparented. A relayout only moves, shows or hides the tiles that the
+    old or new layout shows, and resize bursts are coalesced into at most
+    one relayout per LAYOUT_INTERVAL_MS.
+    
+    Cameras that do not fit are split into pages. Only the current page
+    renders: the other cameras are hidden and, unless they record or are
+    on the video wall, close their streams (CameraWidget.park) shortly
+    after, so the cost of the grid follows what is on screen rather than
+    how many cameras exist. They reconnect when shown again.
+    
+    A tour cycles pages (or configured camera groups) on a timer. The
+    cameras of the next step are warmed up prewarm seconds before the
+    switch: connected first if still waiting to start, and decoding into
+    their hidden tiles, so the switch shows live video at once. Cameras
+    leaving the screen keep rendering for release_delay seconds in case
+    they come straight back.
+    
+    Cameras with a main_url have their high-resolution main stream kept
+    connected while they are likely to be opened in single view: the
+    single-view camera, the selected one and the one the mouse rests on
+    for HOVER_DELAY_MS. At most main_streams are connected; one that is
+    no longer wanted is released after main_release_delay seconds.
+    """
     
     camera_selected = pyqtSignal(str)  # camera_id
+    page_changed = pyqtSignal(int, int)  # page, page count
+    warming = pyqtSignal(list)  # camera ids about to be shown
+    
+    SPACING = 10
+    MARGIN = 10
+    LAYOUT_INTERVAL_MS = 30
+    HOVER_DELAY_MS = 300
     
-    def __init__(self):
+    def __init__(self, page_size=16, main_streams=2, main_release_delay=10.0):
         super().__init__()
         self.cameras = []  # List of camera widgets
         self.selected_camera = None
-        self.layout_mode = 'grid'  # grid, single, 2x2
-        self.before_layout_change = lambda: None
-        self.after_layout_change = lambda: None
+        self.layout_mode = 'grid'  # grid, single, 2x2, NxM, 1+5, 1+7, 2+8
+        self.page_size = page_size  # cameras per page in the automatic grid
+        self.page = 0
+        self.tiles = []  # cameras the current layout shows, in template order
+        self.announced_page = None  # (page, count) last sent with page_changed
+        self.group = None  # cameras shown instead of a page (tour groups)
+        
+        # Rendering of cameras that are not on screen
+        self.release_delay = 0.0
+        self.lingering = {}  # camera -> monotonic time it stops rendering
+        self.warm = set()  # hidden cameras rendering ahead of being shown
+        
+        # Tour
+        self.touring = False
+        self.tour_groups = None  # lists of camera ids, None tours the pages
+        self.tour_position = 0
+        self.tour_interval = 10.0
+        self.tour_prewarm = 3.0
+        self.tour_warmed = False
+        
+        # Main streams
+        self.main_streams = main_streams
+        self.main_release_delay = main_release_delay
+        self.main_warm = {}  # camera -> monotonic release time, None while wanted
+        self.main_view_camera = None  # camera painting its main stream
+        self.hover_candidate = None  # under the mouse, not long enough yet
+        self.hovered = None
         self.init_ui()
         
     def init_ui(self):
         """Initialize grid UI"""
-        # Create scroll area for cameras
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        
-        # Container widget
+        # Tiles are positioned by hand inside the container
         self.container = QWidget()
-        self.grid_layout = QGridLayout(self.container)
-        self.grid_layout.setSpacing(10)
-        self.grid_layout.setContentsMargins(10, 10, 10, 10)
         
-        self.scroll_area.setWidget(self.container)
+        # Page navigation, shown when the cameras do not fit on one page
+        self.page_bar = QWidget()
+        page_layout = QHBoxLayout(self.page_bar)
+        page_layout.setContentsMargins(0, 4, 0, 4)
+        page_layout.addStretch()
+        self.prev_page_btn = QToolButton()
+        self.prev_page_btn.setText("\u2039")
+        self.prev_page_btn.setToolTip("Previous Page (Page Up)")
+        self.prev_page_btn.clicked.connect(self.previous_page)
+        page_layout.addWidget(self.prev_page_btn)
+        self.page_label = QLabel()
+        self.page_label.setStyleSheet("color: #888;")
+        page_layout.addWidget(self.page_label)
+        self.next_page_btn = QToolButton()
+        self.next_page_btn.setText("\u203a")
+        self.next_page_btn.setToolTip("Next Page (Page Down)")
+        self.next_page_btn.clicked.connect(self.next_page)
+        page_layout.addWidget(self.next_page_btn)
+        page_layout.addStretch()
+        self.page_bar.hide()
         
         # Main layout
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(self.scroll_area)
+        layout.setSpacing(0)
+        layout.addWidget(self.container)
+        layout.addWidget(self.page_bar)
         
         # Empty state
-        self.empty_label = QLabel("No cameras added\n\nClick '+ Add' to add a camera")
+        self.empty_label = QLabel("No cameras added\n\nClick '+ Add' to add a camera", self.container)
         self.empty_label.setAlignment(Qt.AlignCenter)
         self.empty_label.setStyleSheet("""
             color: #666;
             font-size: 16px;
             padding: 40px;
         """)
-        self.grid_layout.addWidget(self.empty_label, 0, 0, Qt.AlignCenter)
+        
+        # Coalesces resize events and bulk changes into one relayout
+        self.layout_timer = QTimer(self)
+        self.layout_timer.setSingleShot(True)
+        self.layout_timer.setInterval(self.LAYOUT_INTERVAL_MS)
+        self.layout_timer.timeout.connect(self.update_layout)
+        
+        self.release_timer = QTimer(self)
+        self.release_timer.setInterval(500)
+        self.release_timer.timeout.connect(self.release_idle)
+        self.tour_timer = QTimer(self)
+        self.tour_timer.setSingleShot(True)
+        self.tour_timer.timeout.connect(self.on_tour_timer)
+        
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(self.HOVER_DELAY_MS)
+        self.hover_timer.timeout.connect(self.on_hover_timer)
+        self.main_release_timer = QTimer(self)
+        self.main_release_timer.setInterval(1000)
+        self.main_release_timer.timeout.connect(self.release_main_streams)
         
     def add_camera(self, camera_widget):
         """Add camera to grid"""
-        # Remove empty state if this is the first camera
-        if len(self.cameras) == 0:
-            self.empty_label.setParent(None)
-            
-        # Connect signals
-        camera_widget.selected.connect(self.on_camera_selected)
-        camera_widget.double_clicked.connect(self.on_camera_double_clicked)
-        
-        # Add to list
-        self.cameras.append(camera_widget)
+        self.add_cameras([camera_widget])
         
+    def add_cameras(self, camera_widgets):
+        """Add cameras with a single layout pass"""
+        if not camera_widgets:
+            return
+        for camera_widget in camera_widgets:
+            # Connect signals
+            camera_widget.selected.connect(self.on_camera_selected)
+            camera_widget.double_clicked.connect(self.on_camera_double_clicked)
+            camera_widget.hovered.connect(self.on_camera_hovered)
+            
+            # Parented once; the layout only moves, shows and hides it
+            camera_widget.hide()
+            camera_widget.set_rendering(False)
+            camera_widget.setMinimumSize(0, 0)
+            camera_widget.setParent(self.container)
+            
+            # Add to list
+            self.cameras.append(camera_widget)
+            
         # Update layout
         self.update_layout()
         
     def remove_camera(self, camera_widget):
         """Remove camera from grid"""
-        if camera_widget in self.cameras:
-            # Remove from layout
-            self.grid_layout.removeWidget(camera_widget)
-            camera_widget.setParent(None)
-            
+        self.remove_cameras([camera_widget])
+        
+    def remove_cameras(self, camera_widgets):
+        """Remove cameras with a single layout pass"""
+        camera_widgets = [camera_widget for camera_widget in camera_widgets if camera_widget in self.cameras]
+        if not camera_widgets:
+            return
+        for camera_widget in camera_widgets:
             # Remove from list
             self.cameras.remove(camera_widget)
+            if camera_widget in self.tiles:
+                self.tiles.remove(camera_widget)
+            if camera_widget is self.selected_camera:
+                self.selected_camera = None
+            if self.group and camera_widget in self.group:
+                self.group.remove(camera_widget)
+            self.lingering.pop(camera_widget, None)
+            self.warm.discard(camera_widget)
+            self.main_warm.pop(camera_widget, None)
+            if camera_widget is self.main_view_camera:
+                self.main_view_camera = None
+            if camera_widget is self.hovered:
+                self.hovered = None
+            if camera_widget is self.hover_candidate:
+                self.hover_candidate = None
+            camera_widget.hide()
+            camera_widget.setParent(None)
             
-            # Update layout
-            self.update_layout()
-            
-            # Show empty state if no cameras left
-            if len(self.cameras) == 0:
-                self.grid_layout.addWidget(self.empty_label, 0, 0, Qt.AlignCenter)
-                
+        # Update layout
+        self.update_layout()
+        
     def set_layout_mode(self, mode):
-        """Set layout mode (grid, single, 2x2)"""
+        """Set layout mode: grid, single, 2x2 or any template of core.layout_templates"""
+        get_template(mode, len(self.cameras))  # raises ValueError for unknown layouts
+        # Stay on the page that holds the first camera shown so far
+        first = self.cameras.index(self.tiles[0]) if self.tiles else 0
         self.layout_mode = mode
+        self.group = None
+        self.page = first // self.page_capacity()
         self.update_layout()
         
+    def page_capacity(self):
+        """Cameras per page in the current layout"""
+        if self.layout_mode == 'single':
+            return 1
+        if self.layout_mode == 'grid':
+            return self.page_size
+        return len(get_template(self.layout_mode).cells)
+        
+    def page_count(self):
+        capacity = self.page_capacity()
+        return max(1, (len(self.cameras) + capacity - 1) // capacity)
+        
+    def page_of(self, camera):
+        return self.cameras.index(camera) // self.page_capacity()
+        
+    def set_page(self, page):
+        """Show a page of cameras (wraps around)"""
+        page %= self.page_count()
+        if self.group is not None:
+            self.group = None
+            self.page = -1  # force a relayout
+        if self.layout_mode == 'single' and self.cameras:
+            # In single view a page is one camera; paging moves the selection
+            self.on_camera_selected(self.cameras[page].camera_id)
+        elif page != self.page:
+            self.page = page
+            self.update_layout()
+        if self.touring and not self.tour_groups:
+            # Paged by hand: the tour carries on from here
+            self.tour_position = self.page
+            
+    def next_page(self):
+        self.set_page(self.page + 1)
+        
+    def previous_page(self):
+        self.set_page(self.page - 1)
+        
+    def page_cameras(self, page):
+        """Cameras on a page of the current layout"""
+        page %= self.page_count()
+        if self.layout_mode == 'single':
+            return self.cameras[page:page + 1]
+        capacity = self.page_capacity()
+        return self.cameras[page * capacity:(page + 1) * capacity]
+        
+    def show_group(self, cameras):
+        """Show a set of cameras instead of a page"""
+        self.group = list(cameras)
+        self.update_layout()
+        
+    def layout_cameras(self):
+        """Template and the cameras filling its tiles, in order"""
+        if self.group:
+            template = get_template(self.layout_mode, len(self.group))
+            return template, self.group[:len(template.cells)]
+        if self.layout_mode == 'single':
+            camera = self.selected_camera if self.selected_camera in self.cameras else self.cameras[0]
+            self.page = self.cameras.index(camera)
+            return get_template('single'), [camera]
+        capacity = self.page_capacity()
+        self.page = min(self.page, self.page_count() - 1)
+        cameras = self.cameras[self.page * capacity:(self.page + 1) * capacity]
+        # The automatic grid is sized for the cameras on this page
+        return get_template(self.layout_mode, len(cameras)), cameras
+        
     def update_layout(self):
-        """Update camera layout based on mode"""
+        """Place the cameras of the current layout"""
+        self.layout_timer.stop()
+        width, height = self.container.width(), self.container.height()
+        self.empty_label.setVisible(not self.cameras)
         if not self.cameras:
+            self.empty_label.setGeometry(0, 0, width, height)
+            self.tiles = []
+            self.update_page_bar()
+            self.update_main_streams()
             return
-        self.before_layout_change()
-        # Tüm kameraları gizle (flash engelleme)
-        for cam in self.cameras:
-            cam.hide()
-        # Clear current layout
-        for i in reversed(range(self.grid_layout.count())):
-            self.grid_layout.itemAt(i).widget().setParent(None)
-        if self.layout_mode == 'grid':
-            self.setup_grid_layout()
-        elif self.layout_mode == 'single':
-            self.setup_single_layout()
-        elif self.layout_mode == '2x2':
-            self.setup_2x2_layout()
-        self.after_layout_change()
             
-    def setup_grid_layout(self):
-        """Setup dynamic grid layout"""
-        count = len(self.cameras)
-        if count == 0:
+        template, cameras = self.layout_cameras()
+        rects = tile_rects(template, width, height, self.SPACING, self.MARGIN)
+        
+        # Only cameras shown before or after the change are touched
+        shown = set(cameras)
+        for camera in self.tiles:
+            if camera not in shown:
+                camera.hide()
+                self.retire(camera)
+        for camera, (x, y, w, h) in zip(cameras, rects):
+            rect = QRect(x, y, w, h)
+            if camera.geometry() != rect:
+                camera.setGeometry(rect)
+            if camera.isHidden():
+                camera.show()
+                self.lingering.pop(camera, None)
+                self.warm.discard(camera)
+                camera.set_rendering(True)
+        self.tiles = cameras
+        self.update_page_bar()
+        self.update_main_streams()
+        
+    def retire(self, camera):
+        """Stop rendering a camera that left the screen, after release_delay"""
+        if camera in self.warm:
             return
-            
-        # Calculate grid dimensions
-        if count == 1:
-            cols = 1
-            rows = 1
-        elif count == 2:
-            cols = 2
-            rows = 1
-        elif count <= 4:
-            cols = 2
-            rows = 2
-        elif count <= 9:
-            cols = 3
-            rows = math.ceil(count / 3)
+        if self.release_delay > 0:
+            self.lingering[camera] = time.monotonic() + self.release_delay
+            self.release_timer.start()
         else:
-            cols = 4
-            rows = math.ceil(count / 4)
+            camera.set_rendering(False)
+            
+    def prewarm(self, cameras):
+        """Start decoding cameras that are about to be shown"""
+        cameras = [camera for camera in cameras if camera not in self.tiles]
+        for camera in cameras:
+            self.lingering.pop(camera, None)
+            self.warm.add(camera)
+            camera.set_rendering(True)
+        if cameras:
+            self.warming.emit([camera.camera_id for camera in cameras])
+            
+    def release_idle(self, now=None):
+        """Stop rendering cameras whose release delay has passed"""
+        now = time.monotonic() if now is None else now
+        for camera, deadline in list(self.lingering.items()):
+            if now >= deadline:
+                del self.lingering[camera]
+                if camera not in self.tiles and camera not in self.warm:
+                    camera.set_rendering(False)
+        if not self.lingering:
+            self.release_timer.stop()
             
-        # Calculate size for each camera
-        available_width = self.scroll_area.width() - 40  # Account for margins and scrollbar
-        available_height = self.scroll_area.height() - 40
+    def main_stream_cameras(self):
+        """Cameras whose main stream should be connected, most wanted first"""
+        candidates = [self.single_view_camera(), self.selected_camera, self.hovered]
+        cameras = []
+        for camera in candidates:
+            if camera is not None and camera.main_url and camera not in cameras:
+                cameras.append(camera)
+        return cameras[:self.main_streams]
         
-        camera_width = (available_width - (cols - 1) * 10) // cols
-        camera_height = (available_height - (rows - 1) * 10) // rows
+    def single_view_camera(self):
+        if self.layout_mode == 'single' and self.group is None and self.tiles:
+            return self.tiles[0]
+        return None
         
-        # Maintain aspect ratio (16:9)
-        aspect_ratio = 16 / 9
-        if camera_width / camera_height > aspect_ratio:
-            camera_width = int(camera_height * aspect_ratio)
-        else:
-            camera_height = int(camera_width / aspect_ratio)
+    def update_main_streams(self):
+        """Connect the wanted main streams and schedule the release of the others"""
+        wanted = self.main_stream_cameras()
+        now = time.monotonic()
+        for camera in wanted:
+            self.main_warm[camera] = None
+            camera.warm_main_stream()
+        for camera, deadline in list(self.main_warm.items()):
+            if camera not in wanted and deadline is None:
+                self.main_warm[camera] = now + self.main_release_delay
+                self.main_release_timer.start()
+        # Over the limit: release the longest idle first
+        idle = sorted((camera for camera, deadline in self.main_warm.items() if deadline is not None),
+                      key=self.main_warm.get)
+        while idle and len(self.main_warm) > self.main_streams:
+            self.release_main_stream(idle.pop(0))
             
-        # Place cameras in grid
-        for i, camera in enumerate(self.cameras):
-            row = i // cols
-            col = i % cols
+        single = self.single_view_camera()
+        if single is not self.main_view_camera:
+            if self.main_view_camera is not None:
+                self.main_view_camera.set_main_view(False)
+            self.main_view_camera = single
+            if single is not None:
+                single.set_main_view(True)
+                
+    def release_main_stream(self, camera):
+        del self.main_warm[camera]
+        camera.release_main_stream()
+        
+    def release_main_streams(self):
+        """Disconnect main streams whose release delay has passed"""
+        now = time.monotonic()
+        for camera, deadline in list(self.main_warm.items()):
+            if deadline is not None and now >= deadline:
+                self.release_main_stream(camera)
+        if all(deadline is None for deadline in self.main_warm.values()):
+            self.main_release_timer.stop()
             
-            camera.setFixedSize(camera_width, camera_height)
-            self.grid_layout.addWidget(camera, row, col)
-            camera.show()
-
-    def setup_single_layout(self):
-        """Setup single camera layout"""
-        if self.selected_camera and self.selected_camera in self.cameras:
-            camera = self.selected_camera
-        else:
-            camera = self.cameras[0]
+    def on_camera_hovered(self, camera_id, hovering):
+        """Warm the main stream of a camera the mouse rests on"""
+        camera = next((camera for camera in self.cameras if camera.camera_id == camera_id), None)
+        if hovering:
+            self.hover_candidate = camera
+            self.hover_timer.start()
+            return
+        if camera is self.hover_candidate:
+            self.hover_candidate = None
+            self.hover_timer.stop()
+        if camera is self.hovered:
+            self.hovered = None
+            self.update_main_streams()
             
-        # Hide all cameras except selected (zaten update_layout başında gizlendi)
-                
-        # Size camera to fill available space
-        available_width = self.scroll_area.width() - 20
-        available_height = self.scroll_area.height() - 20
-        
-        # Maintain aspect ratio
-        aspect_ratio = 16 / 9
-        if available_width / available_height > aspect_ratio:
-            width = int(available_height * aspect_ratio)
-            height = available_height
+    def on_hover_timer(self):
+        self.hovered = self.hover_candidate
+        self.update_main_streams()
+        
+    def start_tour(self, interval=10.0, prewarm=3.0, release_delay=5.0, groups=None):
+        """Cycle through pages, or through groups (lists of camera ids), every interval seconds"""
+        self.touring = True
+        self.tour_interval = max(1.0, interval)
+        self.tour_prewarm = min(max(0.0, prewarm), self.tour_interval)
+        self.release_delay = release_delay
+        self.tour_groups = [list(group) for group in groups] if groups else None
+        if self.tour_groups:
+            self.tour_position = 0
+            self.show_group(self.tour_cameras(0))
         else:
-            width = available_width
-            height = int(available_width / aspect_ratio)
-            
-        camera.setFixedSize(width, height)
-        self.grid_layout.addWidget(camera, 0, 0, Qt.AlignCenter)
-        camera.show()
-
-    def setup_2x2_layout(self):
-        """Setup 2x2 layout"""
-        # Show only first 4 cameras
-        visible_cameras = self.cameras[:4]
+            self.tour_position = self.page
+        self.schedule_tour()
         
-        # Hide other cameras (zaten update_layout başında gizlendi)
-            
-        # Calculate size
-        available_width = self.scroll_area.width() - 30
-        available_height = self.scroll_area.height() - 30
+    def stop_tour(self):
+        """Stop touring and release all cameras that are not on screen"""
+        self.touring = False
+        self.tour_timer.stop()
+        if self.group is not None:
+            # Back to the page grid from a group tour
+            self.group = None
+            self.update_layout()
+        self.release_delay = 0.0
+        warm, self.warm = self.warm, set()
+        for camera in warm:
+            if camera not in self.tiles:
+                camera.set_rendering(False)
+        self.release_idle(now=float('inf'))
+        
+    def schedule_tour(self):
+        self.tour_warmed = False
+        self.tour_timer.start(int((self.tour_interval - self.tour_prewarm) * 1000))
         
-        camera_width = (available_width - 10) // 2
-        camera_height = (available_height - 10) // 2
+    def tour_cameras(self, position):
+        """Cameras shown at a tour position"""
+        if not self.tour_groups:
+            return self.page_cameras(position)
+        by_id = {camera.camera_id: camera for camera in self.cameras}
+        group = self.tour_groups[position % len(self.tour_groups)]
+        return [by_id[camera_id] for camera_id in group if camera_id in by_id]
         
-        # Maintain aspect ratio
-        aspect_ratio = 16 / 9
-        if camera_width / camera_height > aspect_ratio:
-            camera_width = int(camera_height * aspect_ratio)
+    def on_tour_timer(self):
+        if not self.cameras:
+            self.schedule_tour()
+            return
+        if not self.tour_warmed:
+            # Warm up the next step, then switch prewarm seconds later
+            self.tour_warmed = True
+            self.prewarm(self.tour_cameras(self.tour_position + 1))
+            self.tour_timer.start(int(self.tour_prewarm * 1000))
+            return
+        self.tour_position += 1
+        warm, self.warm = self.warm, set()
+        if self.tour_groups:
+            self.show_group(self.tour_cameras(self.tour_position))
         else:
-            camera_height = int(camera_width / aspect_ratio)
-            
-        # Place cameras
-        positions = [(0, 0), (0, 1), (1, 0), (1, 1)]
-        for i, camera in enumerate(visible_cameras):
-            row, col = positions[i]
-            camera.setFixedSize(camera_width, camera_height)
-            self.grid_layout.addWidget(camera, row, col)
-            camera.show()
-            
+            self.set_page(self.tour_position)
+            self.tour_position = self.page
+        # Warmed cameras left out of the step (e.g. layout change) wind down too
+        for camera in warm:
+            if camera not in self.tiles:
+                self.retire(camera)
+        self.schedule_tour()
+        
+    def update_page_bar(self):
+        """Refresh the page indicator and announce page changes"""
+        page, count = self.page, self.page_count()
+        self.page_label.setText(f"Page {page + 1} / {count}")
+        self.page_bar.setVisible(count > 1 and self.layout_mode != 'single' and self.group is None)
+        if (page, count) != self.announced_page:
+            self.announced_page = (page, count)
+            self.page_changed.emit(page, count)
+        
+    def visible_cameras(self):
+        """Cameras the current layout shows"""
+        return list(self.tiles)
+        
     def on_camera_selected(self, camera_id):
         """Handle camera selection"""
         # Find camera widget
@@ -218,6 +498,14 @@ class CameraGrid(QWidget):
                     
                 self.selected_camera = camera
                 camera.set_selected(True)
+                if self.layout_mode == 'single':
+                    self.update_layout()
+                elif camera not in self.tiles:
+                    # Picked elsewhere (e.g. the camera list): go to its page
+                    self.page = self.page_of(camera)
+                    self.update_layout()
+                
+                self.update_main_streams()
                 
                 # Emit signal
                 self.camera_selected.emit(camera_id)
@@ -229,11 +517,12 @@ class CameraGrid(QWidget):
         if self.layout_mode == 'single' and self.selected_camera and self.selected_camera.camera_id == camera_id:
             self.set_layout_mode('grid')
         else:
-            self.set_layout_mode('single')
             self.on_camera_selected(camera_id)
+            self.set_layout_mode('single')
         
     def resizeEvent(self, event):
         """Handle resize event"""
         super().resizeEvent(event)
-        # Update layout when resized
-        QTimer.singleShot(100, self.update_layout)
\ No newline at end of file
+        # At most one relayout per interval while the window is dragged
+        if not self.layout_timer.isActive():
+            self.layout_timer.start()
\ No newline at end of file
@@ -2,13 +2,24 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 import cv2
-import numpy as np
+import os
 from datetime import datetime
 import logging
-import ffmpeg
-import pyaudio
-import threading
-import subprocess
+import time
+
+from core.frame_clock import FrameClock
+from core.frame_pacer import FramePacer
+from core.video_recorder import VideoRecorder
+from core.encoder_pool import shared_pool
+from core.recording_profiles import FORMATS, QUALITY_LEVELS, parse_resolution
+from core.scene_change import SmartRecordingGate
+from core.replay_buffer import ReplayBuffer, replay_budget
+from core.frame_clock import FrameTimestamp
+from core.pipeline_metrics import PipelineMetrics
+from core.tracer import shared_tracer
+from core.camera_manager import build_stream_url
+from core.thumbnails import save_thumbnail
+from core.frame_hub import shared_hub
 
 logger = logging.getLogger(__name__)
 
@@ -22,29 +33,128 @@ class CameraWidget(QWidget):
     snapshot_taken = pyqtSignal(str, str)  # camera_id, filepath
     error_occurred = pyqtSignal(str, str)  # camera_id, error
     double_clicked = pyqtSignal(str)  # camera_id
+    audio_event = pyqtSignal(str, dict)  # camera_id, event
+    first_frame = pyqtSignal(str)  # camera_id, once per capture start
+    hovered = pyqtSignal(str, bool)  # camera_id, mouse over the tile
+    
+    PARK_DELAY_MS = 10000
     
-    def __init__(self, camera_id, name, url, username="", password=""):
+    def __init__(self, camera_id, name, url, username="", password="", pacing='drain', display_fps=None,
+                 recording_profile=None, instant_replay=False, replay_seconds=30, record_audio=False,
+                 audio_events='off', audio_event_options=None, autostart=True, main_url=""):
         super().__init__()
         self.camera_id = camera_id
         self.name = name
         self.url = url
         self.username = username
         self.password = password
+        self.pacing = pacing
+        self.display_fps = display_fps
+        self.recording_profile = recording_profile or {}
+        self.rendering = True  # False while the grid does not show this camera
+        self.activated = False  # started by the startup scheduler
+        self.wall_views = 0  # video wall screens showing this camera
         
         self.is_recording = False
         self.is_selected = False
         self.has_ptz = False  # Will be detected from camera
         self.current_frame = None
+        self.current_timestamp = None
+        self.latency = None  # smoothed capture-to-paint latency (seconds)
         self.audio_enabled = False  # Default muted
         self.audio_volume = 0       # Default 0
+        self.audio_source = None    # Decodes only while needed
+        self.record_audio = record_audio
+        self.audio_events = audio_events  # 'off', 'bookmark' or 'record'
+        self.audio_event_options = audio_event_options or {}
+        self.audio_analyzer = None
+        self.audio_listening = False
         
         # Video capture
         self.capture_thread = None
         self.capture = None
+        self.awaiting_first_frame = False
+        self.metrics = PipelineMetrics()  # kept across capture restarts
+        self.tracer = shared_tracer()
+        
+        # High-resolution main stream for single view (url is then the substream)
+        self.main_url = main_url
+        self.main_thread = None  # connected while the grid keeps it warm
+        self.main_metrics = PipelineMetrics()
+        self.main_view = False  # single view wants main-stream frames
+        self.showing_main = False  # painted frames come from the main stream
+        self.retired_threads = set()  # released main streams still winding down
+        
+        # Instant replay (RAM only)
+        self.replay_seconds = replay_seconds
+        self.replay_buffer = None
+        self.replay_frames = []
+        self.replay_position = 0
+        self.replay_timer = QTimer(self)
+        self.replay_timer.setSingleShot(True)
+        self.replay_timer.timeout.connect(self.show_next_replay_frame)
+        
+        # Streams nothing uses are closed after a grace period
+        self.park_timer = QTimer(self)
+        self.park_timer.setSingleShot(True)
+        self.park_timer.setInterval(self.PARK_DELAY_MS)
+        self.park_timer.timeout.connect(self.park)
         
         self.setObjectName("cameraWidget")
         self.init_ui()
-        self.start()
+        self.set_instant_replay(instant_replay)
+        if autostart:
+            self.activate()
+            
+    def activate(self):
+        """Connect the stream and audio analytics (deferred by the startup scheduler)"""
+        if self.activated:
+            return
+        self.activated = True
+        self.update_connection()
+        if self.capture_thread is None:
+            # Parked until shown or recorded; counts as started for the scheduler
+            self.first_frame.emit(self.camera_id)
+        self.apply_audio_events()
+        
+    @property
+    def is_active(self):
+        return self.activated
+        
+    def needs_stream(self):
+        """Whether anything uses the video stream (audio has its own decoder)"""
+        return (self.rendering or self.is_recording or self.wall_views > 0
+                or self.replay_buffer is not None)
+        
+    def update_connection(self):
+        """Connect while the stream is needed; disconnect PARK_DELAY_MS after it no longer is"""
+        if not self.activated:
+            return
+        if self.needs_stream():
+            self.park_timer.stop()
+            if self.capture_thread is None:
+                self.start()
+        elif self.capture_thread is not None and not self.park_timer.isActive():
+            self.park_timer.start()
+            
+    def park(self):
+        """Close the stream of a camera nothing uses; update_connection() reopens it
+        
+        grab() decodes every packet in OpenCV's FFmpeg backend, so only a
+        closed stream stops costing CPU. The tile keeps its last image.
+        """
+        if self.needs_stream():
+            return
+        thread, self.capture_thread = self.capture_thread, None
+        if thread is not None:
+            self.retire_thread(thread)
+            
+    def retire_thread(self, thread):
+        """Let a capture thread wind down without blocking the GUI on a pending read"""
+        thread.running = False
+        if not thread.isFinished():
+            self.retired_threads.add(thread)
+            thread.finished.connect(lambda: self.retired_threads.discard(thread))
         
     def init_ui(self):
         """Initialize UI"""
@@ -73,6 +183,22 @@ class CameraWidget(QWidget):
         self.overlay = OverlayWidget(self.video_label)
         self.overlay.snapshot_clicked.connect(self.take_snapshot)
         self.overlay.record_clicked.connect(self.toggle_recording)
+        self.overlay.replay_clicked.connect(self.toggle_replay)
+        
+        # Pipeline stats overlay (hidden until enabled)
+        self.stats_label = QLabel(self.video_label)
+        self.stats_label.setStyleSheet("""
+            background-color: rgba(0, 0, 0, 160);
+            color: #E0E0E0;
+            font-family: monospace;
+            font-size: 10px;
+            padding: 4px;
+        """)
+        self.stats_label.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.stats_label.move(6, 6)
+        self.stats_label.hide()
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update_stats_overlay)
         
         layout.addWidget(self.video_container)
         
@@ -123,9 +249,20 @@ class CameraWidget(QWidget):
         
     def start(self):
         """Start video capture"""
-        self.capture_thread = CaptureThread(self.url, self.username, self.password, self.audio_enabled, self.audio_volume)
+        self.capture_thread = CaptureThread(
+            self.url, self.username, self.password,
+            pacing=self.pacing, display_fps=self.current_display_fps(),
+            recording_profile=self.recording_profile, replay_buffer=self.replay_buffer,
+            metrics=self.metrics, name=self.name, camera_id=self.camera_id,
+            hub=shared_hub() if self.wall_views else None
+        )
         self.capture_thread.frame_ready.connect(self.update_frame)
+        self.capture_thread.connected.connect(self.on_connected)
         self.capture_thread.error.connect(self.handle_error)
+        if self.is_recording:
+            # Recording was requested before the stream was connected
+            self.capture_thread.start_recording(self.name, self.get_audio_source() if self.record_audio else None)
+        self.awaiting_first_frame = True
         self.capture_thread.start()
         
     def stop(self):
@@ -133,11 +270,100 @@ class CameraWidget(QWidget):
         if self.capture_thread:
             self.capture_thread.stop()
             self.capture_thread.wait()
+        if self.main_thread:
+            self.main_thread.stop()
+            self.main_thread = None
+            self.showing_main = False
+        for thread in list(self.retired_threads):
+            thread.wait()
+        self.retired_threads.clear()
+            
+    def warm_main_stream(self):
+        """Connect the main stream ahead of single view
+        
+        Until single view asks for its frames the thread only grabs: the
+        stream stays connected and decoded up to the latest frame, but
+        nothing is converted or painted.
+        """
+        if not self.main_url or self.main_thread is not None:
+            return
+        self.main_thread = CaptureThread(
+            self.main_url, self.username, self.password,
+            pacing=self.pacing, display_fps=self.main_display_fps(),
+            metrics=self.main_metrics, name=f"{self.name} (main)"
+        )
+        self.main_thread.frame_ready.connect(self.update_main_frame)
+        self.main_thread.error.connect(self.handle_main_error)
+        self.main_thread.start()
+        
+    def handle_main_error(self, error_msg):
+        """Main stream failed: show the substream until it delivers frames again"""
+        if self.sender() is not self.main_thread or not self.showing_main:
+            return
+        logger.warning(f"{self.name}: main stream error ({error_msg}), showing substream")
+        self.showing_main = False
+        self.apply_display_fps()
+        
+    def release_main_stream(self):
+        """Disconnect the main stream; the tile goes back to the substream"""
+        thread, self.main_thread = self.main_thread, None
+        if thread is None:
+            return
+        if self.showing_main:
+            self.showing_main = False
+            self.apply_display_fps()
+        self.retire_thread(thread)
             
-    def update_frame(self, frame):
+    def set_main_view(self, enabled):
+        """Paint the main stream (single view) or the substream
+        
+        The substream keeps painting until the main stream delivers its
+        first frame, so switching never shows a blank tile.
+        """
+        if enabled == self.main_view:
+            return
+        self.main_view = enabled
+        if not enabled:
+            self.showing_main = False
+        self.apply_display_fps()
+        
+    def update_main_frame(self, frame, timestamp=None):
+        """Main-stream frame; the first one in single view takes over from the substream"""
+        thread = self.sender()
+        if thread is not self.main_thread or not self.main_view:
+            # From a released thread, or decoded just before leaving single view
+            thread.frame_displayed()
+            return
+        if not self.showing_main:
+            self.showing_main = True
+            self.apply_display_fps()  # the substream stops decoding for display
+            logger.info(f"{self.name}: showing main stream ({frame.shape[1]}x{frame.shape[0]})")
+        self.show_frame(frame, timestamp, thread)
+        
+    def update_frame(self, frame, timestamp=None):
         """Update video frame"""
+        if self.showing_main or not self.rendering:
+            # Decoded for the video wall only, or before the main stream took over
+            if self.capture_thread:
+                self.capture_thread.frame_displayed()
+            return
+        self.show_frame(frame, timestamp, self.capture_thread)
+        
+    def show_frame(self, frame, timestamp, thread):
+        """Paint a frame and acknowledge it to the capture thread that sent it"""
         self.current_frame = frame
+        self.current_timestamp = timestamp
         
+        if self.is_replaying():
+            # Live frames are kept but not painted while replaying
+            if thread:
+                thread.frame_displayed()
+            return
+        if self.replay_buffer:
+            self.replay_buffer.touch()
+        tracer = self.tracer
+        painting = tracer.begin()
+            
         # Convert to QImage
         height, width, channel = frame.shape
         bytes_per_line = 3 * width
@@ -145,13 +371,173 @@ class CameraWidget(QWidget):
         
         # Scale to widget size
         pixmap = QPixmap.fromImage(q_image)
+        started = tracer.begin()
         scaled_pixmap = pixmap.scaled(self.video_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        tracer.end('resize', started, self.name)
         
         self.video_label.setPixmap(scaled_pixmap)
+        tracer.end('paint', painting, self.name)
+        self.metrics.displayed += 1
+        
+        if thread:
+            thread.frame_displayed()
+        if timestamp is not None:
+            self.update_latency(time.monotonic() - timestamp.monotonic)
+        if self.awaiting_first_frame:
+            self.awaiting_first_frame = False
+            self.first_frame.emit(self.camera_id)
         
         # Update status
         self.status_indicator.setStyleSheet("color: #4CAF50;")
         
+    def show_placeholder(self, image):
+        """Show the last-known image (QImage) until the live stream delivers a frame"""
+        if self.current_frame is not None:
+            return
+        pixmap = QPixmap.fromImage(image)
+        self.video_label.setPixmap(pixmap.scaled(self.video_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self.status_indicator.setStyleSheet("color: #888;")
+        self.status_indicator.setToolTip("Connecting - showing the last image from the previous session")
+        
+    def update_latency(self, latency):
+        """Track smoothed glass-to-glass latency"""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += 0.1 * (latency - self.latency)
+        self.metrics.display_latency = self.latency
+        tooltip = f"Latency: {self.latency * 1000:.0f} ms"
+        if self.audio_source and self.audio_source.running:
+            # Hold audio back to the video latency so both line up
+            self.audio_source.set_video_latency(self.latency)
+            stats = self.audio_source.stats()
+            tooltip += (f"\nAudio latency: {stats['latency'] * 1000:.0f} ms"
+                        f" (underruns: {stats['underruns']})")
+        self.status_indicator.setToolTip(tooltip)
+        
+    def on_connected(self):
+        """Stream delivers frames; counts as started when nothing is painted"""
+        if self.awaiting_first_frame and not self.rendering:
+            self.awaiting_first_frame = False
+            self.first_frame.emit(self.camera_id)
+            
+    def current_display_fps(self):
+        """Display rate for the capture thread; 0 while nothing is painted"""
+        if self.wall_views:
+            return self.display_fps
+        if not self.rendering or self.is_replaying() or self.showing_main:
+            return 0
+        return self.display_fps
+        
+    def main_display_fps(self):
+        """Display rate for the main-stream thread; 0 keeps it connected without decoding"""
+        if not self.main_view or not self.rendering or self.is_replaying():
+            return 0
+        return self.display_fps
+        
+    def apply_display_fps(self):
+        """Pass the current display rates to the capture threads"""
+        if self.capture_thread:
+            self.capture_thread.set_display_fps(self.current_display_fps())
+        if self.main_thread:
+            self.main_thread.set_display_fps(self.main_display_fps())
+        
+    def set_display_fps(self, fps):
+        """Set rate at which frames are decoded for display"""
+        self.display_fps = fps
+        self.apply_display_fps()
+            
+    def add_wall_view(self):
+        """A video wall screen shows this camera; publish its frames to the frame hub"""
+        self.wall_views += 1
+        if self.capture_thread:
+            self.capture_thread.hub = shared_hub()
+        self.apply_display_fps()
+        self.update_connection()
+        
+    def remove_wall_view(self):
+        self.wall_views = max(0, self.wall_views - 1)
+        if not self.wall_views and self.capture_thread:
+            self.capture_thread.hub = None
+        self.apply_display_fps()
+        self.update_connection()
+        
+    def set_rendering(self, rendering):
+        """Stop or resume decoding and painting video (recording is unaffected)"""
+        if rendering == self.rendering:
+            return
+        self.rendering = rendering
+        if not rendering:
+            self.stop_replay()
+        self.apply_display_fps()
+        self.update_connection()
+            
+    def set_instant_replay(self, enabled):
+        """Enable or disable the in-memory replay buffer"""
+        if enabled and self.replay_buffer is None:
+            self.replay_buffer = ReplayBuffer(self.camera_id, replay_budget(), seconds=self.replay_seconds)
+        elif not enabled and self.replay_buffer is not None:
+            self.stop_replay()
+            self.replay_buffer.clear()
+            self.replay_buffer = None
+        self.overlay.set_replay_available(enabled)
+        if self.capture_thread:
+            self.capture_thread.set_replay_buffer(self.replay_buffer)
+        self.update_connection()
+            
+    def is_replaying(self):
+        return bool(self.replay_frames)
+        
+    def toggle_replay(self):
+        """Start or stop instant replay"""
+        if self.is_replaying():
+            self.stop_replay()
+        else:
+            self.start_replay()
+            
+    def start_replay(self):
+        """Play the buffered last seconds inline"""
+        if not self.replay_buffer:
+            return
+        self.replay_frames = self.replay_buffer.snapshot()
+        if not self.replay_frames:
+            self.overlay.show_feedback("Nothing to replay yet")
+            return
+        self.replay_buffer.touch()
+        self.replay_position = 0
+        # Live frames are not shown during replay, so stop decoding them
+        self.apply_display_fps()
+        duration = self.replay_frames[-1][0].monotonic - self.replay_frames[0][0].monotonic
+        self.overlay.show_feedback(f"Replay -{duration:.0f}s")
+        self.show_next_replay_frame()
+        
+    def stop_replay(self):
+        """Return to live video"""
+        self.replay_timer.stop()
+        if self.replay_frames:
+            self.replay_frames = []
+            self.apply_display_fps()
+                
+    def show_next_replay_frame(self):
+        """Paint the next replay frame and schedule the following one"""
+        if self.replay_position >= len(self.replay_frames):
+            self.stop_replay()
+            self.overlay.show_feedback("Live")
+            return
+            
+        timestamp, data = self.replay_frames[self.replay_position]
+        image = QImage.fromData(data, "JPG")
+        pixmap = QPixmap.fromImage(image)
+        self.video_label.setPixmap(pixmap.scaled(self.video_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        
+        # Honour the original frame spacing
+        self.replay_position += 1
+        if self.replay_position < len(self.replay_frames):
+            delay = self.replay_frames[self.replay_position][0].monotonic - timestamp.monotonic
+            self.replay_timer.start(max(1, int(delay * 1000)))
+        else:
+            self.replay_timer.start(0)
+            
     def handle_error(self, error_msg):
         """Handle capture error"""
         self.status_indicator.setStyleSheet("color: #F44336;")
@@ -195,9 +581,12 @@ class CameraWidget(QWidget):
         self.overlay.set_recording(True)
         self.recording_toggled.emit(self.camera_id, True)
         
-        # Start actual recording
+        # Start actual recording (start() picks it up when the stream is parked)
         if self.capture_thread:
-            self.capture_thread.start_recording(self.name)
+            # The source is created here: get_audio_source() is not thread-safe
+            audio_source = self.get_audio_source() if self.record_audio else None
+            self.capture_thread.start_recording(self.name, audio_source)
+        self.update_connection()
             
     def stop_recording(self):
         """Stop recording"""
@@ -209,6 +598,7 @@ class CameraWidget(QWidget):
         # Stop actual recording
         if self.capture_thread:
             self.capture_thread.stop_recording()
+        self.update_connection()
             
     def set_selected(self, selected):
         """Set selection state"""
@@ -231,16 +621,83 @@ class CameraWidget(QWidget):
             
     def update_settings(self, settings):
         """Update camera settings"""
+        stream_changed = (
+            settings.get('url', self.url) != self.url
+            or settings.get('username', self.username) != self.username
+            or settings.get('password', self.password) != self.password
+            or settings.get('main_url', self.main_url) != self.main_url
+            or settings.get('recording', self.recording_profile) != self.recording_profile
+        )
         self.name = settings.get('name', self.name)
         self.url = settings.get('url', self.url)
+        self.main_url = settings.get('main_url', self.main_url)
         self.username = settings.get('username', self.username)
         self.password = settings.get('password', self.password)
+        self.recording_profile = settings.get('recording', self.recording_profile)
+        if 'instant_replay' in settings:
+            self.set_instant_replay(settings['instant_replay'])
+        self.audio_events = settings.get('audio_events', self.audio_events)
+        self.record_audio = settings.get('record_audio', self.record_audio)  # from the next recording on
         
         self.name_label.setText(self.name)
         
+        if not self.is_active:
+            # Not connected yet; the startup scheduler will start it with these settings
+            return
+        if not stream_changed:
+            # Name, replay or analytics only; keep the stream running
+            self.apply_audio_events()
+            return
+            
         # Restart capture with new settings
+        main_warm = self.main_thread is not None
         self.stop()
-        self.start()
+        self.capture_thread = None
+        self.close_audio()
+        self.update_connection()
+        if main_warm:
+            self.warm_main_stream()
+        self.update_audio_listening()
+        self.apply_audio_events()
+        
+    def recording_bytes(self):
+        """Bytes recorded so far (kept while the stream is parked)"""
+        if self.capture_thread:
+            return self.capture_thread.recording_bytes()
+        return self.metrics.bytes_reported
+        
+    def stats(self):
+        """Pipeline metrics snapshot for overlays and the stats panel"""
+        stats = self.metrics.snapshot()
+        stats['name'] = self.name
+        stats['recording'] = self.is_recording
+        return stats
+        
+    def set_stats_visible(self, visible):
+        """Show or hide the pipeline stats overlay"""
+        self.stats_label.setVisible(visible)
+        if visible:
+            self.update_stats_overlay()
+            self.stats_timer.start(1000)
+        else:
+            self.stats_timer.stop()
+            
+    def update_stats_overlay(self):
+        """Refresh the stats overlay text"""
+        stats = self.stats()
+        latency = stats['display_latency_ms']
+        bitrate = f"{stats['bitrate_kbps']:.0f} kbps" if stats['bitrate_kbps'] else "n/a"
+        self.stats_label.setText(
+            f"{stats['fps']:.1f} fps  rx {stats['received_fps']:.1f}  "
+            f"disp {stats['display_fps']:.1f}  rec {stats['record_fps']:.1f}\n"
+            f"decode {stats['decode_ms']:.1f} ms (p95 {stats['decode_p95_ms']:.0f})  "
+            f"convert {stats['convert_ms']:.1f} ms\n"
+            f"dropped {stats['dropped']} ({stats['drop_rate']:.1f}/s)  "
+            f"reconnects {stats['reconnects']}\n"
+            f"bitrate {bitrate}  latency "
+            + (f"{latency:.0f} ms" if latency is not None else "n/a")
+        )
+        self.stats_label.adjustSize()
         
     def resizeEvent(self, event):
         """Handle resize event"""
@@ -248,15 +705,84 @@ class CameraWidget(QWidget):
         if hasattr(self, 'overlay'):
             self.overlay.resize(self.video_label.size())
             
+    def enterEvent(self, event):
+        super().enterEvent(event)
+        self.hovered.emit(self.camera_id, True)
+        
+    def leaveEvent(self, event):
+        super().leaveEvent(event)
+        self.hovered.emit(self.camera_id, False)
+            
+    def get_audio_source(self):
+        """Audio decoder for this camera, created on first use"""
+        if self.audio_source is None:
+            from core.audio_source import AudioSource
+            self.audio_source = AudioSource(build_stream_url(self.url, self.username, self.password))
+            self.audio_source.volume = self.audio_volume
+        return self.audio_source
+        
     def set_audio_enabled(self, enabled):
         self.audio_enabled = enabled
-        if self.capture_thread:
-            self.capture_thread.set_audio_enabled(enabled)
+        self.update_audio_listening()
 
     def set_audio_volume(self, volume):
         self.audio_volume = volume
+        if self.audio_source:
+            self.audio_source.volume = volume
+        self.update_audio_listening()
+        
+    def apply_audio_events(self):
+        """Run the audio analyzer while audio events are enabled"""
+        if self.audio_events != 'off' and self.audio_analyzer is None:
+            from core.audio_analyzer import AudioAnalyzer
+            source = self.get_audio_source()
+            self.audio_analyzer = AudioAnalyzer(
+                source.mixer.rate, source.mixer.channels,
+                on_event=lambda event: self.audio_event.emit(self.camera_id, event),
+                **self.audio_event_options
+            )
+            source.add_sink(self.audio_analyzer)
+            # Keeps audio decoding even while muted or video is not shown
+            source.acquire('analyze')
+        elif self.audio_events == 'off' and self.audio_analyzer is not None:
+            self.audio_source.remove_sink(self.audio_analyzer)
+            self.audio_source.release('analyze')
+            self.audio_analyzer = None
+            
+    def add_bookmark(self, label, wall_time=None):
+        """Mark an event in the current recording"""
         if self.capture_thread:
-            self.capture_thread.set_audio_volume(volume)
+            return self.capture_thread.add_bookmark(label, wall_time)
+        return False
+        
+    @property
+    def audio_stats(self):
+        """Audio latency/underrun counters (None when not decoding)"""
+        return self.audio_source.stats() if self.audio_source else None
+        
+    @property
+    def audio_level(self):
+        """Current audio input level 0-100"""
+        return self.audio_source.level if self.audio_source else 0
+        
+    def update_audio_listening(self):
+        """Decode audio for playback only while audible (unmuted, volume > 0)"""
+        audible = self.audio_enabled and self.audio_volume > 0
+        if audible == self.audio_listening:
+            return
+        self.audio_listening = audible
+        if audible:
+            self.get_audio_source().acquire('listen')
+        elif self.audio_source:
+            self.audio_source.release('listen')
+            
+    def close_audio(self):
+        """Stop audio decoding immediately"""
+        if self.audio_source:
+            self.audio_source.close()
+            self.audio_source = None
+        self.audio_listening = False
+        self.audio_analyzer = None
 
 
 class VideoLabel(QLabel):
@@ -283,6 +809,7 @@ class OverlayWidget(QWidget):
     
     snapshot_clicked = pyqtSignal()
     record_clicked = pyqtSignal()
+    replay_clicked = pyqtSignal()
     
     def __init__(self, parent):
         super().__init__(parent)
@@ -303,6 +830,25 @@ class OverlayWidget(QWidget):
         top_layout = QHBoxLayout()
         top_layout.addStretch()
         
+        # Instant replay button
+        self.replay_btn = QPushButton()
+        self.replay_btn.setFixedSize(36, 36)
+        self.replay_btn.setIcon(self.create_icon("replay"))
+        self.replay_btn.setToolTip("Instant Replay")
+        self.replay_btn.setStyleSheet("""
+            QPushButton {
+                background-color: rgba(45, 45, 50, 0.8);
+                border: none;
+                border-radius: 18px;
+            }
+            QPushButton:hover {
+                background-color: rgba(61, 61, 66, 0.9);
+            }
+        """)
+        self.replay_btn.clicked.connect(self.replay_clicked.emit)
+        self.replay_btn.setVisible(False)
+        top_layout.addWidget(self.replay_btn)
+        
         # Snapshot button
         self.snapshot_btn = QPushButton()
         self.snapshot_btn.setFixedSize(36, 36)
@@ -376,6 +922,11 @@ class OverlayWidget(QWidget):
             painter.drawLine(9, 8, 11, 6)
             painter.drawLine(11, 6, 13, 6)
             painter.drawLine(13, 6, 15, 8)
+        elif name == "replay":
+            # Counter-clockwise arrow
+            painter.drawArc(6, 6, 12, 12, 90 * 16, 270 * 16)
+            painter.drawLine(12, 6, 15, 3)
+            painter.drawLine(12, 6, 15, 9)
         elif name == "record":
             # Record icon
             if self.is_recording:
@@ -416,6 +967,10 @@ class OverlayWidget(QWidget):
                 }
             """)
             
+    def set_replay_available(self, available):
+        """Show replay button when the camera has a replay buffer"""
+        self.replay_btn.setVisible(available)
+        
     def show_feedback(self, message):
         """Show feedback message"""
         self.feedback_label.setText(message)
@@ -439,35 +994,53 @@ class OverlayWidget(QWidget):
 class CaptureThread(QThread):
     """Thread for video capture"""
     
-    frame_ready = pyqtSignal(np.ndarray)
+    frame_ready = pyqtSignal(object, object)  # RGB ndarray, FrameTimestamp
+    connected = pyqtSignal()  # first frame read, once per start
     error = pyqtSignal(str)
     
-    def __init__(self, url, username="", password="", audio_enabled=False, audio_volume=0):
+    THUMBNAIL_INTERVAL = 60.0
+    
+    def __init__(self, url, username="", password="",
+                 pacing='drain', display_fps=None, recording_profile=None, replay_buffer=None,
+                 metrics=None, name="", camera_id="", hub=None):
         super().__init__()
         self.url = url
+        self.name = name
+        self.camera_id = camera_id
         self.username = username
         self.password = password
         self.running = True
         self.recording = False
-        self.video_writer = None
-        self.audio_thread = None
-        self.audio_running = False
-        self.audio_process = None
-        self.pyaudio_instance = None
-        self.audio_stream = None
-        self.audio_enabled = audio_enabled
-        self.audio_volume = audio_volume
-        self._audio_muted = not audio_enabled
+        self.recording_profile = recording_profile or {}
+        self.encoder = None  # EncoderChannel on the shared pool
+        self.record_fps = None  # None records every frame
+        self.smart_gate = None  # SmartRecordingGate in smart mode
+        self.audio_recorder = None
+        self.clock = FrameClock()
+        self.stream_fps = 30.0
+        
+        # Frame pacing
+        self.pacing = pacing
+        self.pacer = FramePacer()
+        self.display_fps = display_fps
+        self.pacer.set_rate('display', display_fps)
+        self.display_pending = False
+        self.metrics = metrics or PipelineMetrics()
+        self.tracer = shared_tracer()
+        self.replay_buffer = None
+        self.set_replay_buffer(replay_buffer)
+        self.next_thumbnail = None  # monotonic time the last-known image is next saved
+        self.hub = hub  # FrameHub shared with video wall screens, None when not shown there
 
     def run(self):
         """Run capture loop"""
+        from core.sources import open_capture
+        
         # Build URL with credentials
-        if self.username and self.password:
-            import re
-            self.url = re.sub(r'(rtsp://)', rf'\1{self.username}:{self.password}@', self.url)
+        self.url = build_stream_url(self.url, self.username, self.password)
             
         # Open capture
-        cap = cv2.VideoCapture(self.url)
+        cap = open_capture(self.url)
         
         if not cap.isOpened():
             self.error.emit("Failed to connect to camera")
@@ -475,151 +1048,287 @@ class CaptureThread(QThread):
             
         # Set buffer size to reduce latency
         cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        
-        # Ses thread'ini başlat
-        self.audio_running = True
-        self.audio_thread = threading.Thread(target=self.play_audio, daemon=True)
-        self.audio_thread.start()
+        self.update_stream_fps(cap)
+        self.metrics.connected_since = time.monotonic()
+        announced = False
         
         while self.running:
-            ret, frame = cap.read()
-            if ret:
-                # Convert BGR to RGB
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Emit frame
-                self.frame_ready.emit(rgb_frame)
-                
-                # Record if enabled
-                if self.recording and self.video_writer:
-                    self.video_writer.write(frame)
-                    
-                # Small delay to control frame rate
-                self.msleep(33)  # ~30 FPS
+            if self.pacing == 'drain':
+                ok = self.capture_paced(cap)
             else:
+                ok = self.capture_fixed(cap)
+                
+            if ok and not announced:
+                announced = True
+                self.connected.emit()
+            elif not ok:
                 self.error.emit("Failed to read frame")
                 self.msleep(1000)  # Wait before retry
                 
                 # Try to reconnect
                 cap.release()
-                cap = cv2.VideoCapture(self.url)
+                cap = open_capture(self.url)
+                self.clock.reset()
+                self.update_stream_fps(cap)
+                self.metrics.reconnects += 1
+                self.metrics.connected_since = time.monotonic()
                 
         # Cleanup
         cap.release()
-        if self.video_writer:
-            self.video_writer.release()
-        self.audio_running = False
-        if self.audio_thread:
-            self.audio_thread.join(timeout=2)
-        try:
-            if self.audio_stream:
-                if hasattr(self.audio_stream, 'is_active') and self.audio_stream.is_active():
-                    self.audio_stream.stop_stream()
-                self.audio_stream.close()
-        except Exception:
-            pass
-        try:
-            if self.pyaudio_instance:
-                self.pyaudio_instance.terminate()
-        except Exception:
-            pass
-        try:
-            if self.audio_process:
-                self.audio_process.terminate()
-        except Exception:
-            pass
-
-    def set_audio_enabled(self, enabled):
-        self.audio_enabled = enabled
-        self._audio_muted = not enabled
-
-    def set_audio_volume(self, volume):
-        self.audio_volume = volume
-        # pyaudio volume ayarı için (destekliyorsa)
-        if self.audio_stream:
-            try:
-                self.audio_stream._volume = volume / 100.0
-            except Exception:
-                pass
+        self.stop_recording()
 
-    def play_audio(self):
-        """RTSP ses akışını ffmpeg ile çekip pyaudio ile oynat"""
-        # ffmpeg komutu: sadece ses streamini PCM olarak çıkar
-        # Not: ffmpeg'in sistemde kurulu olması gerekir
-        if self.username and self.password:
-            import re
-            url = re.sub(r'(rtsp://)', rf'\\1{self.username}:{self.password}@', self.url)
+    def capture_paced(self, cap):
+        """Grab (demux and decode) every packet, convert only frames a consumer is due for"""
+        # grab() reads and decodes the next packet, so the loop keeps pace
+        # with the camera and the FFmpeg buffer never backs up; retrieve()
+        # only converts, so skipping it saves the conversion, not the decode
+        tracer = self.tracer
+        started = tracer.begin()
+        if not cap.grab():
+            return False
+        tracer.end('read', started, self.name)
+        timestamp = self.clock.stamp(cap.get(cv2.CAP_PROP_POS_MSEC))
+        metrics = self.metrics
+        metrics.received += 1
+        
+        consumers = self.pacer.due(timestamp.monotonic)
+        if 'display' in consumers and self.display_pending:
+            # GUI has not painted the previous frame yet; skip rather than queue
+            consumers.remove('display')
+            metrics.dropped += 1
+        if not consumers:
+            return True
+            
+        traced = tracer.begin()
+        started = time.perf_counter()
+        ret, frame = cap.retrieve()
+        if not ret:
+            return False
+        metrics.decode_time.observe(time.perf_counter() - started)
+        tracer.end('decode', traced, self.name)
+        metrics.decoded += 1
+        self.deliver(frame, timestamp, consumers)
+        return True
+        
+    def capture_fixed(self, cap):
+        """Legacy pacing: read every frame and sleep a fixed ~33 ms"""
+        traced = self.tracer.begin()
+        started = time.perf_counter()
+        ret, frame = cap.read()
+        if not ret:
+            return False
+        self.tracer.end('read', traced, self.name)
+        timestamp = self.clock.stamp(cap.get(cv2.CAP_PROP_POS_MSEC))
+        metrics = self.metrics
+        metrics.decode_time.observe(time.perf_counter() - started)
+        metrics.received += 1
+        metrics.decoded += 1
+        self.deliver(frame, timestamp, ['display', 'record'])
+        
+        # Small delay to control frame rate
+        self.msleep(33)  # ~30 FPS
+        return True
+        
+    def deliver(self, frame, timestamp, consumers):
+        """Hand a decoded BGR frame to the due consumers"""
+        metrics = self.metrics
+        metrics.ingest_latency = time.monotonic() - timestamp.monotonic
+        
+        if 'display' in consumers:
+            # Convert BGR to RGB
+            traced = self.tracer.begin()
+            started = time.perf_counter()
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            metrics.convert_time.observe(time.perf_counter() - started)
+            self.tracer.end('convert', traced, self.name)
+            
+            # Emit frame
+            hub = self.hub
+            if hub:
+                hub.publish(self.camera_id, rgb_frame, timestamp)
+            self.display_pending = True
+            self.frame_ready.emit(rgb_frame, timestamp)
+            
+        if self.camera_id:
+            self.update_thumbnail(frame, timestamp)
+            
+        replay_buffer = self.replay_buffer
+        if 'replay' in consumers and replay_buffer:
+            replay_buffer.add(frame, timestamp)
+            
+        # Record if enabled
+        encoder = self.encoder
+        if 'record' in consumers and encoder:
+            gate = self.smart_gate
+            if gate is None:
+                self.submit_frame(encoder, frame, timestamp)
+            else:
+                was_active = gate.active
+                if gate.keep(frame, timestamp):
+                    self.submit_frame(encoder, frame, timestamp)
+                if gate.active != was_active:
+                    # Decode fewer frames while the scene is static
+                    self.pacer.set_rate('record', gate.frame_rate(self.record_fps))
+                    
+    def update_thumbnail(self, frame, timestamp):
+        """Save the camera's last-known image every THUMBNAIL_INTERVAL seconds"""
+        if self.next_thumbnail is None:
+            # Skip the first frames; some streams start grey until a keyframe
+            self.next_thumbnail = timestamp.monotonic + 5.0
+        elif timestamp.monotonic >= self.next_thumbnail:
+            self.next_thumbnail = timestamp.monotonic + self.THUMBNAIL_INTERVAL
+            save_thumbnail(self.camera_id, frame)
+            
+    def submit_frame(self, encoder, frame, timestamp):
+        """Queue a frame for encoding and count the outcome"""
+        traced = self.tracer.begin()
+        queued = encoder.submit(frame, timestamp)
+        self.tracer.end('enqueue', traced, self.name)
+        if queued:
+            self.metrics.recorded += 1
         else:
-            url = self.url
-        ffmpeg_cmd = [
-            'ffmpeg',
-            '-i', url,
-            '-vn',  # video yok
-            '-acodec', 'pcm_s16le',
-            '-ar', '44100',
-            '-ac', '2',
-            '-f', 's16le',
-            '-loglevel', 'quiet',
-            '-'
-        ]
-        try:
-            self.pyaudio_instance = pyaudio.PyAudio()
-            self.audio_stream = self.pyaudio_instance.open(
-                format=pyaudio.paInt16,
-                channels=2,
-                rate=44100,
-                output=True
-            )
-            self.audio_process = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE, bufsize=4096)
-            while self.audio_running:
-                data = self.audio_process.stdout.read(4096)
-                if not data:
-                    break
-                # Mute kontrolü
-                if self._audio_muted or self.audio_volume == 0:
-                    self.audio_stream.write(b'\x00' * len(data))
-                else:
-                    # Volume ayarı (basit çarpan)
-                    import array
-                    arr = array.array('h', data)
-                    factor = self.audio_volume / 100.0
-                    arr = array.array('h', [int(s * factor) for s in arr])
-                    self.audio_stream.write(arr.tobytes())
-        except Exception as e:
-            logger.error(f"Audio playback error: {e}")
-        finally:
-            if self.audio_stream:
-                self.audio_stream.stop_stream()
-                self.audio_stream.close()
-            if self.pyaudio_instance:
-                self.pyaudio_instance.terminate()
-            if self.audio_process:
-                self.audio_process.terminate()
+            self.metrics.dropped += 1
+            
+    def add_bookmark(self, label, wall_time=None):
+        """Add a bookmark entry to the active recording's index"""
+        encoder = self.encoder
+        if not encoder:
+            return False
+        recorder = encoder.recorder
+        if wall_time is None:
+            wall_time = time.time()
+        monotonic = time.monotonic() - (time.time() - wall_time)
+        position = wall_time - recorder.start_wall if recorder.start_wall else 0.0
+        recorder.index.add('bookmark', round(position, 3), FrameTimestamp(None, monotonic, wall_time), label=label)
+        return True
+        
+    def set_replay_buffer(self, buffer):
+        """Feed an instant replay buffer at its own frame rate"""
+        self.replay_buffer = buffer
+        if buffer:
+            self.pacer.set_rate('replay', buffer.fps)
+        else:
+            self.pacer.remove('replay')
+            
+    def frame_displayed(self):
+        """Called by the GUI once the last emitted frame has been painted"""
+        self.display_pending = False
+        
+    def set_display_fps(self, fps):
+        """Set display rate (None for every frame, 0 to stop rendering)"""
+        self.display_fps = fps
+        self.pacer.set_rate('display', fps)
+        
+    def update_stream_fps(self, cap):
+        """Read nominal stream frame rate used as the recording timebase"""
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        # Some RTSP servers report 0, 90000 or 180000 here
+        self.stream_fps = fps if 1 <= fps <= 120 else 30.0
+        # Container/codec bitrate in kbit/s; 0 when the demuxer does not know
+        self.metrics.bitrate = max(cap.get(cv2.CAP_PROP_BITRATE), 0.0)
 
     def stop(self):
         """Stop capture"""
         self.running = False
-        self.audio_running = False
         self.wait()
         
-    def start_recording(self, camera_name):
-        """Start recording video"""
+    def start_recording(self, camera_name, audio_source=None):
+        """Start recording video (and audio when the camera's AudioSource is given)"""
         if not self.recording:
+            profile = self.recording_profile
+            extension, fourcc = FORMATS.get(profile.get('format'), FORMATS['mp4'])
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"recordings/{camera_name}_{timestamp}.mp4"
+            filename = f"recordings/{camera_name}_{timestamp}.{extension}"
+            
+            # Only decode as many frames as the profile records
+            fps = self.stream_fps
+            profile_fps = profile.get('fps')
+            if profile_fps and profile_fps < fps:
+                fps = float(profile_fps)
+                self.record_fps = fps
+            else:
+                self.record_fps = None
+            self.pacer.set_rate('record', self.record_fps)
             
-            # Create video writer
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            self.video_writer = cv2.VideoWriter(filename, fourcc, 30.0, (1920, 1080))
+            if profile.get('mode') == 'smart':
+                self.smart_gate = SmartRecordingGate(
+                    static_fps=profile.get('static_fps', 1.0),
+                    threshold=profile.get('change_threshold', 0.01)
+                )
+            else:
+                self.smart_gate = None
+                
+            # Writer opens on the first frame; encoding runs on the shared pool
+            recorder = VideoRecorder(
+                filename, fps, fourcc,
+                max_size=parse_resolution(profile.get('resolution')),
+                quality=QUALITY_LEVELS.get(profile.get('quality'))
+            )
+            if audio_source:
+                from core.audio_recorder import AudioRecorder
+                self.audio_recorder = AudioRecorder(
+                    recorder, build_stream_url(self.url, self.username, self.password), audio_source
+                )
+                self.audio_recorder.start()
+            recorder.on_close.append(self.count_recorded_bytes)
+            self.encoder = shared_pool().open_channel(recorder)
             
             self.recording = True
-            logger.info(f"Started recording: {filename}")
+            logger.info(f"Started recording: {filename} ({profile.get('profile', 'default')} profile, "
+                        f"{profile.get('mode', 'continuous')} mode)")
             
+    def count_recorded_bytes(self, recorder):
+        """Add a finalized recording's size to the metrics (encoder pool thread)"""
+        size = os.path.getsize(recorder.filepath) if os.path.exists(recorder.filepath) else 0
+        metrics = self.metrics
+        # Uncount the file before adding its size: a reader in between sees
+        # a dip, which recording_bytes() hides, never a double count
+        if recorder in metrics.finalizing:
+            metrics.finalizing.remove(recorder)
+        metrics.bytes_recorded += size
+            
+    def encoder_queue_depth(self):
+        """Frames of this camera waiting to be encoded"""
+        encoder = self.encoder
+        return len(encoder.pending) if encoder else 0
+        
+    def recording_bytes(self):
+        """Bytes recorded so far, including files still being written or finalized
+        
+        Exported as a counter, so it never goes down (a file can shrink
+        briefly while it is finalized or muxed).
+        """
+        metrics = self.metrics
+        # Read in the opposite order of count_recorded_bytes() so a file is never counted twice
+        total = metrics.bytes_recorded
+        recorders = list(metrics.finalizing)
+        encoder = self.encoder
+        if encoder and encoder.recorder not in recorders:
+            recorders.append(encoder.recorder)
+        for recorder in recorders:
+            try:
+                total += os.path.getsize(recorder.filepath)
+            except OSError:
+                pass
+        metrics.bytes_reported = max(metrics.bytes_reported, total)
+        return metrics.bytes_reported
+        
     def stop_recording(self):
         """Stop recording video"""
         if self.recording:
             self.recording = False
-            if self.video_writer:
-                self.video_writer.release()
-                self.video_writer = None
-            logger.info("Stopped recording")
\ No newline at end of file
+            self.pacer.remove('record')
+            if self.encoder:
+                # Still counted by recording_bytes() until the pool has finalized it
+                self.metrics.finalizing.append(self.encoder.recorder)
+            encoder, self.encoder = self.encoder, None
+            if self.audio_recorder:
+                # Muxed into the video file once the encoder finalizes it
+                self.audio_recorder.stop()
+                self.audio_recorder = None
+            if self.smart_gate:
+                logger.info(f"Smart recording skipped {self.smart_gate.frames_skipped} static frames")
+                self.smart_gate = None
+            if encoder:
+                # Finalized by the pool once queued frames are written
+                encoder.close()
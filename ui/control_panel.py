@@ -2,6 +2,8 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 
+from core.recording_profiles import PROFILES
+
 
 class ControlPanel(QWidget):
     """Right-side control panel"""
@@ -12,12 +14,17 @@ class ControlPanel(QWidget):
     recording_toggled = pyqtSignal(str, bool)  # camera_id, state
     settings_changed = pyqtSignal(str, dict)  # camera_id, settings
     
+    # Audio meter refresh rate cap (Hz)
+    METER_FPS = 15
+    
     def __init__(self):
         super().__init__()
         self.current_camera_id = None
         self.cameras = {}  # camera_id -> camera_name
+        self.camera_settings = {}  # camera_id -> recording profile
         self.audio_states = {}  # camera_id -> muted/unmuted
         self.audio_volumes = {}  # camera_id -> volume (0-100)
+        self.audio_level_provider = lambda camera_id: 0  # set by MainWindow
         self.setObjectName("controlPanel")
         self.init_ui()
         # Default: all muted
@@ -238,6 +245,11 @@ class ControlPanel(QWidget):
         self.audio_meter = AudioMeter()
         self.audio_meter.setFixedHeight(20)
         layout.addWidget(self.audio_meter)
+        
+        # Poll the selected camera's level at a capped rate
+        self.meter_timer = QTimer(self)
+        self.meter_timer.timeout.connect(self.update_audio_meter)
+        self.meter_timer.start(1000 // self.METER_FPS)
 
         return group
         
@@ -253,11 +265,37 @@ class ControlPanel(QWidget):
         """)
         return btn
         
-    def add_camera_to_list(self, camera_id, camera_name):
+    def add_camera_to_list(self, camera_id, camera_name, settings=None):
         """Add camera to list"""
         self.cameras[camera_id] = camera_name
+        self.camera_settings[camera_id] = settings or {}
         self.camera_list.addItem(camera_name)
         
+    def update_camera_in_list(self, camera_id, camera_name, settings=None):
+        """Rename a listed camera and replace its settings"""
+        old_name = self.cameras.get(camera_id)
+        if old_name is None:
+            return
+        self.cameras[camera_id] = camera_name
+        if settings is not None:
+            self.camera_settings[camera_id] = settings
+        items = self.camera_list.findItems(old_name, Qt.MatchExactly)
+        if items:
+            items[0].setText(camera_name)
+            
+    def remove_camera_from_list(self, camera_id):
+        """Drop a camera removed outside the panel"""
+        camera_name = self.cameras.pop(camera_id, None)
+        self.camera_settings.pop(camera_id, None)
+        if camera_name is None:
+            return
+        items = self.camera_list.findItems(camera_name, Qt.MatchExactly)
+        if items:
+            self.camera_list.takeItem(self.camera_list.row(items[0]))
+        if self.current_camera_id == camera_id:
+            self.current_camera_id = None
+            self.update_controls_state()
+            
     def show_add_camera_dialog(self):
         """Show add camera dialog"""
         dialog = AddCameraDialog(self)
@@ -301,10 +339,12 @@ class ControlPanel(QWidget):
             dialog = CameraSettingsDialog(
                 self.current_camera_id,
                 self.cameras[self.current_camera_id],
-                self
+                self,
+                self.camera_settings.get(self.current_camera_id)
             )
             if dialog.exec_():
                 settings = dialog.get_settings()
+                self.camera_settings[self.current_camera_id] = settings
                 self.settings_changed.emit(self.current_camera_id, settings)
                 
     def on_camera_selected(self, item):
@@ -369,6 +409,14 @@ class ControlPanel(QWidget):
         if self.current_camera_id:
             self.audio_states[self.current_camera_id] = enabled
 
+    def update_audio_meter(self):
+        """Show the selected camera's audio level"""
+        level = 0
+        if self.current_camera_id and self.audio_check.isChecked():
+            level = self.audio_level_provider(self.current_camera_id)
+        if level != self.audio_meter.level:
+            self.audio_meter.set_level(level)
+            
     def on_volume_changed(self, value):
         self.volume_label.setText(f"{value}%")
         # Kamera widget'ına volume bildir
@@ -401,7 +449,7 @@ class AddCameraDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Add Camera")
-        self.setFixedSize(480, 360)
+        self.setFixedSize(480, 400)
         self.init_ui()
         
     def init_ui(self):
@@ -420,8 +468,23 @@ class AddCameraDialog(QDialog):
         # RTSP URL
         self.url_edit = QLineEdit()
         self.url_edit.setPlaceholderText("rtsp://192.168.1.100:554/stream")
+        self.url_edit.setToolTip(
+            "Camera stream URL, or a local source:\n"
+            "test://pattern?width=1280&height=720&fps=15&bitrate=2000\n"
+            "file://videos/clip.mp4?loop=1\n"
+            "replay://recordings/Camera_20250101_120000.mp4"
+        )
         form_layout.addRow("RTSP URL:", self.url_edit)
         
+        # Main stream for single view
+        self.main_url_edit = QLineEdit()
+        self.main_url_edit.setPlaceholderText("Optional")
+        self.main_url_edit.setToolTip(
+            "High-resolution stream shown in single view.\n"
+            "The RTSP URL above is then the low-resolution substream used in the grid."
+        )
+        form_layout.addRow("Main stream:", self.main_url_edit)
+        
         # Username
         self.username_edit = QLineEdit()
         self.username_edit.setPlaceholderText("Optional")
@@ -474,17 +537,14 @@ class AddCameraDialog(QDialog):
         self.status_label.setStyleSheet("color: #888;")
         QApplication.processEvents()
         
-        # Simple connection test
-        import cv2
+        # Simple connection test (also accepts test://, file:// and replay:// sources)
+        from core.sources import open_capture
+        from core.camera_manager import build_stream_url
         
         # Build URL with credentials if provided
-        if self.username_edit.text() and self.password_edit.text():
-            import re
-            test_url = re.sub(r'(rtsp://)', rf'\1{self.username_edit.text()}:{self.password_edit.text()}@', url)
-        else:
-            test_url = url
+        test_url = build_stream_url(url, self.username_edit.text(), self.password_edit.text())
             
-        cap = cv2.VideoCapture(test_url)
+        cap = open_capture(test_url)
         
         if cap.isOpened():
             ret, _ = cap.read()
@@ -517,6 +577,7 @@ class AddCameraDialog(QDialog):
         return {
             'name': self.name_edit.text().strip(),
             'url': self.url_edit.text().strip(),
+            'main_url': self.main_url_edit.text().strip(),
             'username': self.username_edit.text().strip(),
             'password': self.password_edit.text().strip()
         }
@@ -525,13 +586,15 @@ class AddCameraDialog(QDialog):
 class CameraSettingsDialog(QDialog):
     """Camera settings dialog"""
     
-    def __init__(self, camera_id, camera_name, parent=None):
+    def __init__(self, camera_id, camera_name, parent=None, settings=None):
         super().__init__(parent)
         self.camera_id = camera_id
         self.camera_name = camera_name
+        self.settings = settings or {}
         self.setWindowTitle(f"Camera Settings - {camera_name}")
-        self.setFixedSize(480, 360)
+        self.setFixedSize(480, 590)
         self.init_ui()
+        self.load_settings()
         
     def init_ui(self):
         """Initialize settings UI"""
@@ -549,6 +612,14 @@ class CameraSettingsDialog(QDialog):
         video_group = QGroupBox("Video Settings")
         video_layout = QFormLayout(video_group)
         
+        # Recording profile
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItem("Custom", "custom")
+        for key, profile in PROFILES.items():
+            self.profile_combo.addItem(profile['name'], key)
+        self.profile_combo.currentIndexChanged.connect(self.on_profile_changed)
+        video_layout.addRow("Profile:", self.profile_combo)
+        
         # Resolution
         self.resolution_combo = QComboBox()
         self.resolution_combo.addItems(["1920x1080", "1280x720", "640x480"])
@@ -556,7 +627,7 @@ class CameraSettingsDialog(QDialog):
         
         # FPS
         self.fps_combo = QComboBox()
-        self.fps_combo.addItems(["30", "25", "20", "15", "10"])
+        self.fps_combo.addItems(["30", "25", "20", "15", "10", "5"])
         video_layout.addRow("FPS:", self.fps_combo)
         
         # Quality
@@ -573,9 +644,28 @@ class CameraSettingsDialog(QDialog):
         self.motion_check = QCheckBox("Motion Detection")
         features_layout.addWidget(self.motion_check)
         
+        self.smart_check = QCheckBox("Smart Recording (1 fps while static)")
+        features_layout.addWidget(self.smart_check)
+        
+        self.replay_check = QCheckBox("Instant Replay (keep last seconds in memory)")
+        features_layout.addWidget(self.replay_check)
+        
         self.audio_check = QCheckBox("Enable Audio")
         features_layout.addWidget(self.audio_check)
         
+        self.record_audio_check = QCheckBox("Record Audio")
+        self.record_audio_check.setToolTip("Runs a separate audio decoder for this camera while it records")
+        features_layout.addWidget(self.record_audio_check)
+        
+        audio_events_layout = QHBoxLayout()
+        audio_events_layout.addWidget(QLabel("Audio Events:"))
+        self.audio_events_combo = QComboBox()
+        self.audio_events_combo.addItem("Off", "off")
+        self.audio_events_combo.addItem("Bookmark", "bookmark")
+        self.audio_events_combo.addItem("Record", "record")
+        audio_events_layout.addWidget(self.audio_events_combo)
+        features_layout.addLayout(audio_events_layout)
+        
         self.ptz_check = QCheckBox("PTZ Camera")
         features_layout.addWidget(self.ptz_check)
         
@@ -599,13 +689,49 @@ class CameraSettingsDialog(QDialog):
         
         layout.addLayout(button_layout)
         
+    def load_settings(self):
+        """Show current recording settings"""
+        index = self.profile_combo.findData(self.settings.get('profile', 'custom'))
+        self.profile_combo.setCurrentIndex(max(index, 0))
+        self.set_combo_text(self.resolution_combo, self.settings.get('resolution'))
+        self.set_combo_text(self.fps_combo, self.settings.get('fps'))
+        self.set_combo_text(self.quality_combo, str(self.settings.get('quality', '')).capitalize())
+        self.smart_check.setChecked(self.settings.get('mode') == 'smart')
+        self.replay_check.setChecked(self.settings.get('instant_replay', False))
+        self.record_audio_check.setChecked(self.settings.get('record_audio', False))
+        index = self.audio_events_combo.findData(self.settings.get('audio_events', 'off'))
+        self.audio_events_combo.setCurrentIndex(max(index, 0))
+        
+    def set_combo_text(self, combo, text):
+        """Select combo item by text if present"""
+        index = combo.findText(str(text))
+        if index >= 0:
+            combo.setCurrentIndex(index)
+            
+    def on_profile_changed(self, index):
+        """Fill video settings from the selected profile"""
+        profile = PROFILES.get(self.profile_combo.itemData(index))
+        custom = profile is None
+        for widget in (self.resolution_combo, self.fps_combo, self.quality_combo, self.smart_check):
+            widget.setEnabled(custom)
+        if profile:
+            self.set_combo_text(self.resolution_combo, profile['resolution'])
+            self.set_combo_text(self.fps_combo, profile['fps'])
+            self.set_combo_text(self.quality_combo, profile['quality'].capitalize())
+            self.smart_check.setChecked(profile.get('mode') == 'smart')
+            
     def get_settings(self):
         """Get settings from dialog"""
         return {
             'name': self.name_edit.text().strip(),
+            'profile': self.profile_combo.currentData(),
             'resolution': self.resolution_combo.currentText(),
             'fps': int(self.fps_combo.currentText()),
             'quality': self.quality_combo.currentText(),
+            'mode': 'smart' if self.smart_check.isChecked() else 'continuous',
+            'instant_replay': self.replay_check.isChecked(),
+            'record_audio': self.record_audio_check.isChecked(),
+            'audio_events': self.audio_events_combo.currentData(),
             'motion_detection': self.motion_check.isChecked(),
             'audio_enabled': self.audio_check.isChecked(),
             'ptz_enabled': self.ptz_check.isChecked()
@@ -0,0 +1,76 @@
+import sys
+import time
+import logging
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QTimer
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor(QObject):
+    """Measures GUI event-loop lag and logs the GUI stack on stalls
+    
+    A QTimer heartbeat on the GUI thread records when the loop last ran
+    and how late each beat fired. A watchdog thread checks the heartbeat.
+    When the loop has not run for threshold seconds, it copies the GUI
+    thread's Python stack from sys._current_frames(). Once the loop
+    recovers, the stall is logged with its duration and that stack, so
+    blocking calls can be traced without a profiler attached.
+    """
+    
+    def __init__(self, interval=0.05, threshold=0.25, parent=None):
+        super().__init__(parent)
+        self.interval = interval
+        self.threshold = threshold
+        self.gui_thread = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.lag = 0.0  # smoothed heartbeat delay (seconds)
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.stall_stack = None
+        self.running = False
+        self.thread = None
+        
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.beat)
+    
+    def start(self):
+        """Start heartbeat and watchdog"""
+        if self.running:
+            return
+        self.running = True
+        self.last_beat = time.monotonic()
+        self.timer.start(int(self.interval * 1000))
+        self.thread = threading.Thread(target=self.watch, name='lag-monitor', daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.running = False
+        self.timer.stop()
+    
+    def beat(self):
+        """Heartbeat on the GUI thread"""
+        now = time.monotonic()
+        lag = max(0.0, now - self.last_beat - self.interval)
+        self.last_beat = now
+        self.lag += 0.1 * (lag - self.lag)
+        self.max_lag = max(self.max_lag, lag)
+        
+        stack = self.stall_stack
+        if stack is not None:
+            self.stall_stack = None
+            self.stalls += 1
+            logger.warning(f"GUI thread stalled for {lag * 1000:.0f} ms; stack at detection:\n{stack}")
+    
+    def watch(self):
+        """Watchdog thread: catch the GUI thread while it is blocked"""
+        while self.running:
+            time.sleep(self.interval)
+            stalled = time.monotonic() - self.last_beat
+            if stalled < self.threshold or self.stall_stack is not None:
+                continue
+            frame = sys._current_frames().get(self.gui_thread)
+            if frame is not None:
+                self.stall_stack = ''.join(traceback.format_stack(frame))
@@ -1,25 +1,55 @@
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-import json
-from pathlib import Path
+from datetime import datetime
 
 from .camera_grid import CameraGrid
 from .control_panel import ControlPanel
 from .camera_widget import CameraWidget
+from .stats_panel import StatsPanel
+from .lag_monitor import EventLoopMonitor
+from .startup_scheduler import StartupScheduler
+from .thumbnail_loader import ThumbnailLoader
 from core.camera_manager import CameraManager
 from core.recording_manager import RecordingManager
+from core.app_config import AppConfig
+from core.recording_profiles import build_profile
+from core.encoder_pool import shared_pool
+from core.replay_buffer import replay_budget
+from core.telemetry import telemetry
+from core.tracer import shared_tracer
+from core.thumbnails import remove_thumbnail
+from core.config_store import CameraStore
 import logging
 
 
 class MainWindow(QMainWindow):
     """Main application window with modern UI"""
     
-    def __init__(self):
+    def __init__(self, config=None):
         super().__init__()
+        self.config = config or AppConfig()
         self.cameras = {}
+        self.event_recordings = {}  # camera_id -> QTimer stopping an event-triggered recording
+        self.stats_panel = None
+        self.stats_overlay = False
         self.camera_manager = CameraManager()
         self.recording_manager = RecordingManager()
+        replay_budget(self.config.get('replay_memory_mb'))
+        self.telemetry = telemetry(str(self.recording_manager.recording_path))
+        self.recording_manager.start_retention(self.config.get('retention_days'))
+        self.lag_monitor = EventLoopMonitor(threshold=self.config.get('lag_threshold_ms', 250) / 1000, parent=self)
+        # Start once the event loop runs so startup is not reported as a stall
+        QTimer.singleShot(0, self.lag_monitor.start)
+        self.tracer = shared_tracer()
+        if self.config.get('tracing'):
+            self.tracer.start()
+        self.metrics_server = None
+        if self.config.get('metrics_port'):
+            from core.metrics_server import MetricsServer
+            self.metrics_server = MetricsServer(self.config.get('metrics_port'))
+            self.metrics_server.add_collector(self.collect_metrics)
+            self.metrics_server.start()
         
         self.setWindowTitle("RedNVR v1.0")
         self.setMinimumSize(1280, 720)
@@ -31,17 +61,45 @@ class MainWindow(QMainWindow):
         # Initialize UI
         self.init_ui()
         
+        # Cameras connect a few at a time, visible ones first
+        self.startup = StartupScheduler(
+            self.config.get('startup_concurrency', 4), self.camera_grid.visible_cameras, parent=self
+        )
+        self.startup.first_screen_ready.connect(
+            lambda seconds, count: self.status_bar.showMessage(
+                f"{count} cameras on screen in {seconds:.1f}s", 5000
+            )
+        )
+        
         # Load cameras
+        self.camera_store = CameraStore(new_id=self.camera_manager.generate_id)
         self.load_cameras()
         
+        # Edits to cameras.json made outside the app apply live
+        self.config_reload_timer = QTimer(self)
+        self.config_reload_timer.setSingleShot(True)
+        self.config_reload_timer.setInterval(300)
+        self.config_reload_timer.timeout.connect(self.reload_cameras)
+        self.config_watcher = QFileSystemWatcher(self)
+        self.config_watcher.addPath(str(self.camera_store.path.parent))
+        if self.camera_store.path.exists():
+            self.config_watcher.addPath(str(self.camera_store.path))
+        self.config_watcher.fileChanged.connect(self.on_config_changed)
+        self.config_watcher.directoryChanged.connect(self.on_config_changed)
+        
+        # Last-known images fill the tiles until their streams connect
+        visible = [camera.camera_id for camera in self.camera_grid.visible_cameras()]
+        self.thumbnail_loader = ThumbnailLoader(
+            visible + [camera_id for camera_id in self.cameras if camera_id not in visible], parent=self
+        )
+        self.thumbnail_loader.loaded.connect(self.on_thumbnail_loaded)
+        self.thumbnail_loader.start()
+        
         # Setup shortcuts
         self.setup_shortcuts()
         
         self.single_view_camera_id = None
-        
-        # Kamera grid'de layout değişimlerinde flash engelleme
-        self.camera_grid.before_layout_change = self.before_camera_grid_layout_change
-        self.camera_grid.after_layout_change = self.after_camera_grid_layout_change
+        self.video_wall = None
 
     def init_ui(self):
         """Initialize the user interface"""
@@ -65,8 +123,13 @@ class MainWindow(QMainWindow):
         left_layout.addWidget(header)
         
         # Camera grid
-        self.camera_grid = CameraGrid()
+        self.camera_grid = CameraGrid(
+            page_size=self.config.get('grid_page_size', 16),
+            main_streams=self.config.get('main_streams_warm', 2),
+            main_release_delay=self.config.get('main_stream_release_delay', 10)
+        )
         self.camera_grid.camera_selected.connect(self.on_camera_selected)
+        self.camera_grid.warming.connect(self.on_cameras_warming)
         left_layout.addWidget(self.camera_grid)
         
         main_layout.addWidget(left_panel, 3)
@@ -78,6 +141,7 @@ class MainWindow(QMainWindow):
         self.control_panel.camera_removed.connect(self.remove_camera)
         self.control_panel.recording_toggled.connect(self.toggle_recording)
         self.control_panel.settings_changed.connect(self.update_camera_settings)
+        self.control_panel.audio_level_provider = self.get_audio_level
         
         main_layout.addWidget(self.control_panel, 1)
         
@@ -140,8 +204,44 @@ class MainWindow(QMainWindow):
         view_group.addButton(quad_btn)
         layout.addWidget(quad_btn)
         
+        # Other layout templates
+        self.templates_btn = QToolButton()
+        self.templates_btn.setIcon(self.create_icon("layouts"))
+        self.templates_btn.setToolTip("More Layouts")
+        self.templates_btn.setCheckable(True)
+        self.templates_btn.setPopupMode(QToolButton.InstantPopup)
+        templates_menu = QMenu(self.templates_btn)
+        for mode in ('3x3', '4x4', '1+5', '1+7', '2+8'):
+            templates_menu.addAction(mode, lambda mode=mode: self.set_layout_template(mode))
+        self.templates_btn.setMenu(templates_menu)
+        view_group.addButton(self.templates_btn)
+        layout.addWidget(self.templates_btn)
+        
         layout.addSpacing(20)
         
+        # Statistics button
+        stats_btn = QToolButton()
+        stats_btn.setIcon(self.create_icon("stats"))
+        stats_btn.setToolTip("Camera Statistics (Ctrl+Shift+S)")
+        stats_btn.clicked.connect(self.show_stats_panel)
+        layout.addWidget(stats_btn)
+        
+        # Tour button
+        self.tour_btn = QToolButton()
+        self.tour_btn.setIcon(self.create_icon("tour"))
+        self.tour_btn.setToolTip("Camera Tour (T)")
+        self.tour_btn.setCheckable(True)
+        self.tour_btn.clicked.connect(self.toggle_tour)
+        layout.addWidget(self.tour_btn)
+        
+        # Video wall button
+        self.wall_btn = QToolButton()
+        self.wall_btn.setIcon(self.create_icon("wall"))
+        self.wall_btn.setToolTip("Video Wall on All Screens (W, Esc to close)")
+        self.wall_btn.setCheckable(True)
+        self.wall_btn.clicked.connect(self.toggle_video_wall)
+        layout.addWidget(self.wall_btn)
+        
         # Fullscreen button
         fullscreen_btn = QToolButton()
         fullscreen_btn.setIcon(self.create_icon("fullscreen"))
@@ -175,6 +275,14 @@ class MainWindow(QMainWindow):
         self.cpu_label = QLabel("CPU: 0%")
         self.status_bar.addPermanentWidget(self.cpu_label)
         
+        # Memory usage
+        self.memory_label = QLabel("RAM: 0%")
+        self.status_bar.addPermanentWidget(self.memory_label)
+        
+        # Network throughput
+        self.network_label = QLabel("Net: 0 Mbps")
+        self.status_bar.addPermanentWidget(self.network_label)
+        
         # Storage
         self.storage_label = QLabel("Storage: 0 GB free")
         self.status_bar.addPermanentWidget(self.storage_label)
@@ -221,6 +329,28 @@ class MainWindow(QMainWindow):
             painter.drawLine(2, 22, 8, 22)
             painter.drawLine(22, 16, 22, 22)
             painter.drawLine(16, 22, 22, 22)
+        elif name == "layouts":
+            # Draw one large and three small tiles
+            painter.drawRect(2, 2, 13, 13)
+            painter.drawRect(17, 2, 5, 5)
+            painter.drawRect(17, 10, 5, 5)
+            painter.drawRect(2, 17, 20, 5)
+        elif name == "tour":
+            # Draw circular arrow
+            painter.drawArc(4, 4, 16, 16, 90 * 16, 270 * 16)
+            painter.drawLine(12, 4, 16, 1)
+            painter.drawLine(12, 4, 16, 7)
+        elif name == "wall":
+            # Draw two monitors side by side
+            painter.drawRect(1, 4, 10, 12)
+            painter.drawRect(13, 4, 10, 12)
+            painter.drawLine(4, 20, 20, 20)
+        elif name == "stats":
+            # Draw bar chart icon
+            painter.drawLine(2, 22, 22, 22)
+            painter.drawRect(4, 12, 4, 10)
+            painter.drawRect(10, 4, 4, 18)
+            painter.drawRect(16, 9, 4, 13)
             
         painter.end()
         
@@ -248,104 +378,296 @@ class MainWindow(QMainWindow):
         QShortcut(QKeySequence("1"), self, lambda: self.camera_grid.set_layout_mode('grid'))
         QShortcut(QKeySequence("2"), self, lambda: self.camera_grid.set_layout_mode('2x2'))
         QShortcut(QKeySequence("3"), self, lambda: self.camera_grid.set_layout_mode('single'))
+        QShortcut(QKeySequence(Qt.Key_PageDown), self, self.camera_grid.next_page)
+        QShortcut(QKeySequence(Qt.Key_PageUp), self, self.camera_grid.previous_page)
+        QShortcut(QKeySequence("T"), self, self.toggle_tour)
+        QShortcut(QKeySequence("W"), self, self.toggle_video_wall)
         
         # Record all
         QShortcut(QKeySequence("Ctrl+R"), self, self.toggle_all_recording)
         
+        # Statistics
+        QShortcut(QKeySequence("Ctrl+Shift+S"), self, self.show_stats_panel)
+        QShortcut(QKeySequence("Ctrl+Shift+O"), self, lambda: self.set_stats_overlay(not self.stats_overlay))
+        
+        # Pipeline tracing
+        QShortcut(QKeySequence("Ctrl+Shift+T"), self, self.toggle_tracing)
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.dump_trace)
+        
     def load_cameras(self):
         """Load cameras from config"""
-        config_file = Path("config/cameras.json")
-        if config_file.exists():
-            try:
-                with open(config_file, 'r') as f:
-                    cameras_data = json.load(f)
-                    for camera_data in cameras_data:
-                        self.add_camera(camera_data)
-            except Exception as e:
-                logging.error(f"Failed to load cameras: {e}")
-                
-    def save_cameras(self):
-        """Save cameras to config"""
-        cameras_data = []
-        for camera_id, camera in self.cameras.items():
-            cameras_data.append({
-                'id': camera_id,
-                'name': camera.name,
-                'url': camera.url,
-                'username': camera.username,
-                'password': camera.password
-            })
-            
-        config_file = Path("config/cameras.json")
-        with open(config_file, 'w') as f:
-            json.dump(cameras_data, f, indent=2)
-            
+        self.add_cameras(self.camera_store.cameras(), persist=False)
+        
+    def camera_entry(self, camera):
+        """A camera's entry in cameras.json"""
+        return {
+            'id': camera.camera_id,
+            'name': camera.name,
+            'url': camera.url,
+            'main_url': camera.main_url,
+            'username': camera.username,
+            'password': camera.password,
+            'recording': camera.recording_profile,
+            'instant_replay': camera.replay_buffer is not None,
+            'record_audio': camera.record_audio,
+            'audio_events': camera.audio_events
+        }
+        
+    def camera_settings(self, camera_data):
+        """CameraWidget.update_settings() arguments for a cameras.json entry"""
+        return {
+            'name': camera_data['name'],
+            'url': camera_data['url'],
+            'main_url': camera_data.get('main_url', ''),
+            'username': camera_data.get('username', ''),
+            'password': camera_data.get('password', ''),
+            'recording': build_profile(camera_data.get('recording'), self.config.config),
+            'instant_replay': camera_data.get('instant_replay', False),
+            'record_audio': camera_data.get('record_audio', self.config.get('enable_audio', True)),
+            'audio_events': camera_data.get('audio_events', 'off')
+        }
+        
+    def panel_settings(self, camera):
+        """Settings shown by the control panel's camera dialog"""
+        return dict(camera.recording_profile, instant_replay=camera.replay_buffer is not None,
+                    record_audio=camera.record_audio, audio_events=camera.audio_events)
+        
     def add_camera(self, camera_data):
         """Add new camera"""
-        camera_id = camera_data.get('id') or self.camera_manager.generate_id()
-        
-        # Create camera widget
-        camera_widget = CameraWidget(
-            camera_id,
-            camera_data['name'],
-            camera_data['url'],
-            camera_data.get('username', ''),
-            camera_data.get('password', '')
-        )
-        
-        # Connect signals
-        camera_widget.recording_toggled.connect(self.on_recording_toggled)
-        camera_widget.snapshot_taken.connect(self.on_snapshot_taken)
-        camera_widget.error_occurred.connect(self.on_camera_error)
+        self.add_cameras([camera_data])
         
+    def add_cameras(self, cameras_data, persist=True):
+        """Add cameras with one grid layout pass and one config write"""
+        widgets = []
+        for camera_data in cameras_data:
+            camera_id = camera_data.get('id') or self.camera_manager.generate_id()
+            
+            # Create camera widget
+            camera_widget = CameraWidget(
+                camera_id,
+                camera_data['name'],
+                camera_data['url'],
+                camera_data.get('username', ''),
+                camera_data.get('password', ''),
+                pacing=self.config.get('capture_pacing', 'drain'),
+                display_fps=self.config.get('display_fps'),
+                recording_profile=build_profile(camera_data.get('recording'), self.config.config),
+                instant_replay=camera_data.get('instant_replay', False),
+                replay_seconds=self.config.get('replay_seconds', 30),
+                record_audio=camera_data.get('record_audio', self.config.get('enable_audio', True)),
+                audio_events=camera_data.get('audio_events', 'off'),
+                audio_event_options={
+                    'threshold_db': self.config.get('audio_event_threshold_db', -20.0),
+                    'anomaly_sigma': self.config.get('audio_event_sigma', 4.0)
+                },
+                autostart=False,
+                main_url=camera_data.get('main_url', '')
+            )
+            
+            camera_widget.set_stats_visible(self.stats_overlay)
+            
+            # Connect signals
+            camera_widget.recording_toggled.connect(self.on_recording_toggled)
+            camera_widget.snapshot_taken.connect(self.on_snapshot_taken)
+            camera_widget.error_occurred.connect(self.on_camera_error)
+            camera_widget.audio_event.connect(self.on_audio_event)
+            
+            # Store reference
+            self.cameras[camera_id] = camera_widget
+            widgets.append(camera_widget)
+            
+            # Update control panel
+            self.control_panel.add_camera_to_list(camera_id, camera_data['name'], self.panel_settings(camera_widget))
+            
         # Add to grid
-        self.camera_grid.add_camera(camera_widget)
-        
-        # Store reference
-        self.cameras[camera_id] = camera_widget
-        
-        # Update control panel
-        self.control_panel.add_camera_to_list(camera_id, camera_data['name'])
+        self.camera_grid.add_cameras(widgets)
         
+        # Connect when a startup slot is free
+        for camera_widget in widgets:
+            self.startup.add(camera_widget)
+            
         # Save config
-        self.save_cameras()
-        
+        if persist:
+            self.camera_store.add_many([self.camera_entry(camera_widget) for camera_widget in widgets])
+            
         # Update status
         self.update_camera_count()
         
     def remove_camera(self, camera_id):
         """Remove camera"""
-        if camera_id in self.cameras:
+        self.remove_cameras([camera_id])
+        
+    def remove_cameras(self, camera_ids, persist=True):
+        """Remove cameras with one grid layout pass and one config write"""
+        widgets = []
+        for camera_id in camera_ids:
+            camera_widget = self.cameras.pop(camera_id, None)
+            if camera_widget is None:
+                continue
+                
             # Stop camera
-            camera_widget = self.cameras[camera_id]
+            if self.video_wall:
+                self.video_wall.remove_camera(camera_widget)
+            self.startup.remove(camera_widget)
             camera_widget.stop()
+            camera_widget.close_audio()
+            camera_widget.set_instant_replay(False)
+            timer = self.event_recordings.pop(camera_id, None)
+            if timer:
+                timer.stop()
+            remove_thumbnail(camera_id)
+            self.control_panel.remove_camera_from_list(camera_id)
+            widgets.append(camera_widget)
             
-            # Remove from grid
-            self.camera_grid.remove_camera(camera_widget)
-            
-            # Remove reference
-            del self.cameras[camera_id]
-            
-            # Save config
-            self.save_cameras()
+        # Remove from grid
+        self.camera_grid.remove_cameras(widgets)
+        
+        # Save config
+        if persist and widgets:
+            self.camera_store.remove_many([camera_widget.camera_id for camera_widget in widgets])
             
-            # Update status
-            self.update_camera_count()
+        # Update status
+        self.update_camera_count()
+        
+    def on_config_changed(self, path):
+        """cameras.json or its folder changed on disk"""
+        # Atomic replaces (ours and most editors') drop the file from the watch list
+        camera_file = str(self.camera_store.path)
+        if camera_file not in self.config_watcher.files() and self.camera_store.path.exists():
+            self.config_watcher.addPath(camera_file)
+        # Editors save in several steps; settle first
+        self.config_reload_timer.start()
+        
+    def reload_cameras(self):
+        """Apply an external edit of cameras.json, leaving unaffected cameras running"""
+        added, removed, changed = self.camera_store.reload()
+        if not (added or removed or changed):
+            return
+        self.remove_cameras(removed, persist=False)
+        for camera_data in changed:
+            camera = self.cameras.get(camera_data.get('id'))
+            if camera:
+                # Restarts the stream only if its URL, login or recording changed
+                camera.update_settings(self.camera_settings(camera_data))
+                self.control_panel.update_camera_in_list(camera.camera_id, camera.name, self.panel_settings(camera))
+        self.add_cameras(added, persist=False)
+        logging.info(f"Reloaded cameras.json: {len(added)} added, {len(removed)} removed, {len(changed)} changed")
+        self.status_bar.showMessage(
+            f"Camera config reloaded: {len(added)} added, {len(removed)} removed, {len(changed)} changed", 5000
+        )
+        
+    def on_thumbnail_loaded(self, camera_id, image):
+        camera = self.cameras.get(camera_id)
+        if camera:
+            camera.show_placeholder(image)
             
     def on_camera_selected(self, camera_id):
         """Handle camera selection"""
         self.control_panel.select_camera(camera_id)
+        self.startup.promote(camera_id)
         
         # Update PTZ controls if camera supports it
         if camera_id in self.cameras:
             camera = self.cameras[camera_id]
             self.control_panel.set_ptz_enabled(camera.has_ptz)
             
+    def get_audio_level(self, camera_id):
+        """Audio level of a camera for the control panel meter"""
+        camera = self.cameras.get(camera_id)
+        return camera.audio_level if camera else 0
+        
+    def camera_stats(self):
+        """Pipeline metrics of every camera, keyed by camera id"""
+        return {camera_id: camera.stats() for camera_id, camera in self.cameras.items()}
+        
+    def collect_metrics(self):
+        """Prometheus metric families (called on the metrics server thread)
+
+        Only reads plain counters; no Qt calls are made from here.
+        """
+        cameras = list(self.cameras.items())
+        
+        def per_camera(value):
+            return [({'camera': camera_id, 'name': camera.name}, value(camera)) for camera_id, camera in cameras]
+            
+        frames = []
+        for stage in ('received', 'decoded', 'displayed', 'recorded'):
+            frames += [({'camera': camera_id, 'name': camera.name, 'stage': stage}, getattr(camera.metrics, stage))
+                       for camera_id, camera in cameras]
+        yield ('rednvr_frames_total', 'counter', 'Frames through each pipeline stage', frames)
+        yield ('rednvr_frames_dropped_total', 'counter', 'Frames dropped for a busy GUI or full encoder queue',
+               per_camera(lambda camera: camera.metrics.dropped))
+        yield ('rednvr_reconnects_total', 'counter', 'Stream reconnects',
+               per_camera(lambda camera: camera.metrics.reconnects))
+        yield ('rednvr_recorded_bytes_total', 'counter', 'Bytes written to recordings',
+               per_camera(lambda camera: camera.recording_bytes()))
+        yield ('rednvr_encoder_queue_frames', 'gauge', 'Frames waiting to be encoded',
+               per_camera(lambda camera: camera.capture_thread.encoder_queue_depth() if camera.capture_thread else 0))
+        yield ('rednvr_ingest_bitrate_kbps', 'gauge', 'Stream bitrate reported by the demuxer',
+               per_camera(lambda camera: camera.metrics.bitrate))
+        yield ('rednvr_ingest_latency_seconds', 'gauge', 'Capture to decode latency',
+               per_camera(lambda camera: camera.metrics.ingest_latency))
+        yield ('rednvr_recording', 'gauge', 'Whether the camera is recording',
+               per_camera(lambda camera: int(camera.is_recording)))
+        
+        pool = shared_pool()
+        yield ('rednvr_encoder_pending_bytes', 'gauge', 'Raw frame bytes waiting in the encoder pool',
+               [({}, pool.pending_bytes)])
+        yield ('rednvr_retention_deleted_total', 'counter', 'Recordings deleted by retention',
+               [({}, self.recording_manager.retention_deleted)])
+        yield ('rednvr_retention_deleted_bytes_total', 'counter', 'Bytes deleted by retention',
+               [({}, self.recording_manager.retention_deleted_bytes)])
+        
+        yield ('rednvr_gui_lag_seconds', 'gauge', 'Smoothed GUI event loop lag', [({}, self.lag_monitor.lag)])
+        yield ('rednvr_gui_stalls_total', 'counter', 'GUI thread stalls over the lag threshold',
+               [({}, self.lag_monitor.stalls)])
+        
+        snapshot = self.telemetry.snapshot
+        if snapshot:
+            yield ('rednvr_disk_free_bytes', 'gauge', 'Free space on the recording disk', [({}, snapshot.disk_free)])
+            yield ('rednvr_process_cpu_percent', 'gauge', 'Process CPU use (percent of one core)',
+                   [({}, snapshot.process_cpu)])
+            yield ('rednvr_process_resident_bytes', 'gauge', 'Process resident memory', [({}, snapshot.process_rss)])
+            
+    def show_stats_panel(self):
+        """Open the camera statistics table"""
+        if self.stats_panel is None:
+            self.stats_panel = StatsPanel(self.camera_stats, self)
+            self.stats_panel.overlay_check.setChecked(self.stats_overlay)
+            self.stats_panel.overlay_check.toggled.connect(self.set_stats_overlay)
+        self.stats_panel.show()
+        self.stats_panel.raise_()
+        
+    def set_stats_overlay(self, visible):
+        """Show or hide the stats overlay on every camera tile"""
+        self.stats_overlay = visible
+        for camera in self.cameras.values():
+            camera.set_stats_visible(visible)
+        if self.stats_panel:
+            self.stats_panel.overlay_check.setChecked(visible)
+            
+    def toggle_tracing(self):
+        """Start or stop recording pipeline trace spans"""
+        if self.tracer.enabled:
+            self.tracer.stop()
+            self.status_bar.showMessage("Tracing stopped (Ctrl+Shift+D to save)", 3000)
+        else:
+            self.tracer.start()
+            self.status_bar.showMessage("Tracing started", 3000)
+            
+    def dump_trace(self):
+        """Save recorded spans as a Chrome/Perfetto trace"""
+        filepath = f"logs/trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        count = self.tracer.dump(filepath)
+        self.status_bar.showMessage(f"Trace saved: {filepath} ({count} spans)", 5000)
+        return filepath
+        
     def toggle_recording(self, camera_id, state):
         """Toggle camera recording"""
         if camera_id in self.cameras:
             camera = self.cameras[camera_id]
             if state:
+                self.startup.promote(camera_id)
                 camera.start_recording()
             else:
                 camera.stop_recording()
@@ -367,14 +689,54 @@ class MainWindow(QMainWindow):
         """Update camera settings"""
         if camera_id in self.cameras:
             camera = self.cameras[camera_id]
+            settings['recording'] = build_profile(settings, self.config.config)
             camera.update_settings(settings)
-            self.save_cameras()
+            self.camera_store.update(camera_id, self.camera_entry(camera))
             
     def on_recording_toggled(self, camera_id, is_recording):
         """Handle recording state change"""
         self.control_panel.update_recording_state(camera_id, is_recording)
         self.update_recording_count()
+        if not is_recording:
+            # A later recording (e.g. started by hand) must not be cut by an old event timer
+            timer = self.event_recordings.pop(camera_id, None)
+            if timer:
+                timer.stop()
+        
+    def on_audio_event(self, camera_id, event):
+        """Bookmark or record on an audio event (loudness spike)"""
+        camera = self.cameras.get(camera_id)
+        if not camera:
+            return
+        label = f"audio:{event['type']}"
+        logging.info(f"Audio event on {camera.name}: {event}")
+        self.status_bar.showMessage(
+            f"Audio event - {camera.name}: {event['type']} ({event['loudness']:.0f} dBFS)", 5000
+        )
         
+        if camera.audio_events == 'record':
+            timer = self.event_recordings.get(camera_id)
+            if not camera.is_recording:
+                camera.start_recording()
+                timer = QTimer(self)
+                timer.setSingleShot(True)
+                timer.timeout.connect(lambda: self.stop_event_recording(camera_id))
+                self.event_recordings[camera_id] = timer
+            if timer:
+                # Each new event extends an event-triggered recording
+                timer.start(int(self.config.get('event_recording_seconds', 30) * 1000))
+        if not camera.add_bookmark(label, event['time']):
+            # Not recording: keep the bookmark in the camera's event log instead
+            if not self.recording_manager.log_event(camera_id, label, event['time']):
+                self.status_bar.showMessage(f"Could not save audio event bookmark for {camera.name}", 5000)
+        
+    def stop_event_recording(self, camera_id):
+        """End a recording started by an audio event"""
+        self.event_recordings.pop(camera_id, None)
+        camera = self.cameras.get(camera_id)
+        if camera and camera.is_recording:
+            camera.stop_recording()
+            
     def on_snapshot_taken(self, camera_id, filepath):
         """Handle snapshot taken"""
         self.status_bar.showMessage(f"Snapshot saved: {filepath}", 3000)
@@ -385,6 +747,49 @@ class MainWindow(QMainWindow):
         if camera:
             self.status_bar.showMessage(f"Error - {camera.name}: {error}", 5000)
             
+    def toggle_tour(self):
+        """Start or stop cycling through camera pages"""
+        if self.camera_grid.touring:
+            self.camera_grid.stop_tour()
+            self.status_bar.showMessage("Tour stopped", 3000)
+        else:
+            self.camera_grid.start_tour(
+                interval=self.config.get('tour_interval', 10),
+                prewarm=self.config.get('tour_prewarm', 3),
+                release_delay=self.config.get('tour_release_delay', 5),
+                groups=self.config.get('tour_groups')
+            )
+            self.status_bar.showMessage(f"Tour started ({self.camera_grid.tour_interval:.0f}s per page)", 3000)
+        self.tour_btn.setChecked(self.camera_grid.touring)
+        
+    def toggle_video_wall(self):
+        """Open or close a full-screen camera grid on every screen"""
+        if self.video_wall:
+            self.video_wall.close()
+            self.video_wall = None
+            self.status_bar.showMessage("Video wall closed", 3000)
+        elif self.cameras:
+            from .video_wall import VideoWall
+            self.video_wall = VideoWall(
+                self.camera_grid.cameras,
+                layouts=self.config.get('video_wall_layouts'),
+                assignments=self.config.get('video_wall_cameras'),
+                max_fps=self.config.get('video_wall_fps', 25),
+                parent=self
+            )
+            self.video_wall.closed.connect(self.toggle_video_wall)
+            self.video_wall.open()
+            # Wall cameras may still be waiting for a startup slot
+            for camera in reversed(self.video_wall.viewed):
+                self.startup.promote(camera.camera_id)
+            self.status_bar.showMessage(f"Video wall on {len(self.video_wall.screens)} screens", 3000)
+        self.wall_btn.setChecked(self.video_wall is not None)
+        
+    def on_cameras_warming(self, camera_ids):
+        """Connect cameras of the next tour step ahead of cameras that wait for startup"""
+        for camera_id in reversed(camera_ids):
+            self.startup.promote(camera_id)
+            
     def toggle_fullscreen(self):
         """Toggle fullscreen mode"""
         if self.isFullScreen():
@@ -404,14 +809,32 @@ class MainWindow(QMainWindow):
         
     def update_status(self):
         """Update status bar information"""
+        # Latest background sample; never blocks the GUI thread
+        snapshot = self.telemetry.snapshot
+        if snapshot is None:
+            return
+            
         # Update CPU usage
-        import psutil
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        self.cpu_label.setText(f"CPU: {cpu_percent:.0f}%")
+        self.cpu_label.setText(f"CPU: {snapshot.cpu_percent:.0f}%")
+        self.cpu_label.setToolTip(
+            f"RedNVR: {snapshot.process_cpu:.0f}% of one core, {snapshot.process_threads} threads\n"
+            f"UI lag: {self.lag_monitor.lag * 1000:.0f} ms (max {self.lag_monitor.max_lag * 1000:.0f} ms, "
+            f"{self.lag_monitor.stalls} stalls)"
+        )
+        
+        # Update memory
+        self.memory_label.setText(f"RAM: {snapshot.memory_percent:.0f}%")
+        self.memory_label.setToolTip(f"RedNVR: {snapshot.process_rss / (1024**2):.0f} MB")
+        
+        # Update network
+        received = snapshot.net_recv_rate * 8 / 1e6
+        self.network_label.setText(f"Net: {received:.1f} Mbps")
+        self.network_label.setToolTip(
+            f"In: {received:.1f} Mbps  Out: {snapshot.net_sent_rate * 8 / 1e6:.1f} Mbps"
+        )
         
         # Update storage
-        disk_usage = psutil.disk_usage('.')
-        free_gb = disk_usage.free / (1024**3)
+        free_gb = snapshot.disk_free / (1024**3)
         self.storage_label.setText(f"Storage: {free_gb:.1f} GB free")
         
     def closeEvent(self, event):
@@ -424,26 +847,40 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
+            if self.video_wall:
+                self.video_wall.close()
+                
             # Stop all cameras
             for camera in self.cameras.values():
                 camera.stop()
+                camera.close_audio()
+            from core.audio_mixer import shared_mixer
+            shared_mixer().terminate()
                 
             # Stop recording manager
             self.recording_manager.stop_all()
             
+            # Flush frames still queued for encoding
+            shared_pool().shutdown()
+            self.telemetry.stop()
+            self.lag_monitor.stop()
+            self.thumbnail_loader.wait()
+            
+            # Write config changes still waiting in a batch
+            self.camera_store.flush()
+            self.config.store.flush()
+            if self.metrics_server:
+                self.metrics_server.stop()
+            
             event.accept()
         else:
             event.ignore()
             
-    def before_camera_grid_layout_change(self):
-        # Tüm kameraları gizle (flash engelleme)
-        for cam in self.cameras.values():
-            cam.hide()
-
-    def after_camera_grid_layout_change(self):
-        # Gerekli olanlar zaten grid tarafından gösterilecek
-        pass
-
+    def set_layout_template(self, mode):
+        """Switch the grid to a layout from the templates menu"""
+        self.camera_grid.set_layout_mode(mode)
+        self.templates_btn.setChecked(True)
+        
     def on_camera_double_clicked(self, camera_id):
         """Handle camera double click"""
         # Toggle single/grid view
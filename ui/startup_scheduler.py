@@ -0,0 +1,136 @@
+import time
+import logging
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class StartupScheduler(QObject):
+    """Connects cameras a few at a time instead of all at once
+    
+    At most max_concurrent cameras are connecting (started but without a
+    first frame) at any moment. A connection slot frees up on the first
+    frame, on an error, or after CONNECT_TIMEOUT. The next camera is
+    picked by priority: cameras on screen first, then cameras that are
+    recording or record on events, then the rest in configured order.
+    Time-to-first-frame is measured per camera and for the first screen.
+    """
+    
+    first_screen_ready = pyqtSignal(float, int)  # seconds since startup, cameras
+    all_started = pyqtSignal(float, int)
+    
+    CONNECT_TIMEOUT = 15.0
+    
+    def __init__(self, max_concurrent=4, visible_cameras=None, parent=None):
+        super().__init__(parent)
+        self.max_concurrent = max(1, max_concurrent)
+        self.visible_cameras = visible_cameras or (lambda: [])
+        self.origin = time.monotonic()
+        self.pending = []  # CameraWidgets not started yet, in configured order
+        self.connecting = {}  # camera_id -> monotonic start
+        self.started_at = {}  # camera_id -> monotonic start
+        self.ttff = {}  # camera_id -> seconds from start to first frame
+        self.promoted = set()  # camera ids the user asked for
+        self.first_screen = None  # camera ids visible when startup began
+        self.first_screen_time = None
+        self.reported_all = False
+        
+        self.dispatch_timer = QTimer(self)
+        self.dispatch_timer.setSingleShot(True)
+        self.dispatch_timer.timeout.connect(self.dispatch)
+        self.timeout_timer = QTimer(self)
+        self.timeout_timer.timeout.connect(self.dispatch)
+    
+    def add(self, camera):
+        """Queue a camera for connecting"""
+        camera.first_frame.connect(self.on_first_frame)
+        camera.error_occurred.connect(self.on_error)
+        self.pending.append(camera)
+        self.reported_all = False
+        self.schedule()
+    
+    def remove(self, camera):
+        """Forget a removed camera"""
+        if camera in self.pending:
+            self.pending.remove(camera)
+        self.connecting.pop(camera.camera_id, None)
+        self.started_at.pop(camera.camera_id, None)
+        self.schedule()
+    
+    def promote(self, camera_id):
+        """Connect a camera next (selected, opened or recorded by the user)"""
+        for camera in self.pending:
+            if camera.camera_id == camera_id:
+                self.pending.remove(camera)
+                self.pending.insert(0, camera)
+                self.promoted.add(camera_id)
+                self.schedule()
+                break
+    
+    def schedule(self):
+        # Coalesce bursts (loading many cameras) into one dispatch
+        self.dispatch_timer.start(0)
+    
+    def priority(self, camera, visible):
+        if camera.camera_id in self.promoted:
+            return 0
+        if camera.camera_id in visible:
+            return 1
+        if camera.is_recording or camera.audio_events == 'record':
+            return 2
+        return 3
+    
+    def dispatch(self):
+        """Start cameras while connection slots are free"""
+        now = time.monotonic()
+        for camera_id, started in list(self.connecting.items()):
+            if now - started > self.CONNECT_TIMEOUT:
+                # Keeps retrying in its own thread; just stop holding a slot
+                logger.info(f"Camera {camera_id} still connecting after {self.CONNECT_TIMEOUT:.0f}s")
+                del self.connecting[camera_id]
+        
+        visible = {camera.camera_id for camera in self.visible_cameras()}
+        if self.first_screen is None and self.pending:
+            pending_ids = [camera.camera_id for camera in self.pending]
+            self.first_screen = {camera_id for camera_id in pending_ids if camera_id in visible} \
+                or set(pending_ids[:self.max_concurrent])
+        
+        while self.pending and len(self.connecting) < self.max_concurrent:
+            order = {id(camera): i for i, camera in enumerate(self.pending)}
+            camera = min(self.pending, key=lambda c: (self.priority(c, visible), order[id(c)]))
+            self.pending.remove(camera)
+            self.connecting[camera.camera_id] = now
+            self.started_at[camera.camera_id] = now
+            camera.activate()
+        
+        if self.connecting:
+            self.timeout_timer.start(1000)
+        else:
+            self.timeout_timer.stop()
+    
+    def on_first_frame(self, camera_id):
+        started = self.started_at.get(camera_id)
+        if started is not None and camera_id not in self.ttff:
+            self.ttff[camera_id] = time.monotonic() - started
+        if self.connecting.pop(camera_id, None) is not None:
+            self.schedule()
+        self.check_progress()
+    
+    def on_error(self, camera_id, error):
+        if self.connecting.pop(camera_id, None) is not None:
+            self.schedule()
+    
+    def check_progress(self):
+        """Report first screen and full startup times once"""
+        elapsed = time.monotonic() - self.origin
+        if self.first_screen_time is None and self.first_screen and self.first_screen <= set(self.ttff):
+            self.first_screen_time = elapsed
+            times = sorted(self.ttff[camera_id] for camera_id in self.first_screen)
+            logger.info(f"First screen ready in {elapsed:.2f}s ({len(times)} cameras, "
+                        f"time to first frame median {times[len(times) // 2]:.2f}s, max {times[-1]:.2f}s)")
+            self.first_screen_ready.emit(elapsed, len(times))
+        if not self.reported_all and not self.pending and set(self.started_at) <= set(self.ttff):
+            self.reported_all = True
+            logger.info(f"All {len(self.ttff)} cameras streaming after {elapsed:.2f}s")
+            self.all_started.emit(elapsed, len(self.ttff))
@@ -0,0 +1,101 @@
+from PyQt5.QtWidgets import *
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+
+
+class NumericItem(QTableWidgetItem):
+    """Table item that sorts by its numeric value instead of its text"""
+    
+    def __init__(self, text, value):
+        super().__init__(text)
+        self.value = value
+    
+    def __lt__(self, other):
+        if isinstance(other, NumericItem):
+            return self.value < other.value
+        return super().__lt__(other)
+
+
+class StatsPanel(QDialog):
+    """Sortable table of per-camera pipeline metrics"""
+    
+    # (header, stats key, format)
+    COLUMNS = [
+        ("Camera", 'name', None),
+        ("FPS", 'fps', "{:.1f}"),
+        ("Received", 'received_fps', "{:.1f}"),
+        ("Displayed", 'display_fps', "{:.1f}"),
+        ("Recorded", 'record_fps', "{:.1f}"),
+        ("Dropped/s", 'drop_rate', "{:.1f}"),
+        ("Dropped", 'dropped', "{:d}"),
+        ("Decode ms", 'decode_ms', "{:.1f}"),
+        ("Decode p95", 'decode_p95_ms', "{:.0f}"),
+        ("Convert ms", 'convert_ms', "{:.1f}"),
+        ("Bitrate kbps", 'bitrate_kbps', "{:.0f}"),
+        ("Latency ms", 'display_latency_ms', "{:.0f}"),
+        ("Reconnects", 'reconnects', "{:d}"),
+    ]
+    
+    def __init__(self, stats_provider, parent=None):
+        super().__init__(parent)
+        self.stats_provider = stats_provider  # callable -> {camera_id: stats dict}
+        self.setWindowTitle("Camera Statistics")
+        self.resize(1000, 420)
+        self.init_ui()
+        
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh()
+    
+    def init_ui(self):
+        """Initialize table UI"""
+        layout = QVBoxLayout(self)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([header for header, _, _ in self.COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSortingEnabled(True)
+        # Busiest decoder first
+        self.table.sortByColumn(7, Qt.DescendingOrder)
+        layout.addWidget(self.table)
+        
+        bottom_layout = QHBoxLayout()
+        self.overlay_check = QCheckBox("Show stats on camera tiles")
+        bottom_layout.addWidget(self.overlay_check)
+        bottom_layout.addStretch()
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        bottom_layout.addWidget(close_btn)
+        layout.addLayout(bottom_layout)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start(1000)
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+    
+    def refresh(self):
+        """Reload all rows from the current metrics"""
+        stats = self.stats_provider()
+        # Sorting while filling would move rows under our feet
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(stats))
+        for row, (camera_id, camera_stats) in enumerate(stats.items()):
+            for column, (_, key, fmt) in enumerate(self.COLUMNS):
+                value = camera_stats.get(key)
+                if fmt is None:
+                    item = QTableWidgetItem(str(value))
+                    item.setData(Qt.UserRole, camera_id)
+                else:
+                    text = "n/a" if value is None else fmt.format(value)
+                    item = NumericItem(text, -1 if value is None else value)
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
@@ -0,0 +1,35 @@
+import os
+import logging
+
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from core.thumbnails import thumbnail_path
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailLoader(QThread):
+    """Reads and decodes the cameras' last-known images off the GUI thread
+    
+    Emits each image as soon as it is decoded, in the order given, so the
+    tiles on screen can be listed first. QImage (unlike QPixmap) is safe
+    to create outside the GUI thread.
+    """
+    
+    loaded = pyqtSignal(str, QImage)  # camera_id, image
+    
+    def __init__(self, camera_ids, parent=None):
+        super().__init__(parent)
+        self.camera_ids = list(camera_ids)
+    
+    def run(self):
+        for camera_id in self.camera_ids:
+            path = thumbnail_path(camera_id)
+            if not os.path.exists(path):
+                continue
+            image = QImage(path)
+            if image.isNull():
+                logger.warning(f"Unreadable thumbnail: {path}")
+                continue
+            self.loaded.emit(camera_id, image)
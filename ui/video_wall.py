@@ -0,0 +1,266 @@
+import math
+import time
+import logging
+import threading
+
+from PyQt5.QtWidgets import QWidget, QApplication
+from PyQt5.QtCore import Qt, QThread, QObject, QRect, QRectF, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter, QColor
+
+from core.frame_hub import shared_hub
+from core.layout_templates import get_template, tile_rects
+
+logger = logging.getLogger(__name__)
+
+
+class WallRenderThread(QThread):
+    """Composes one screen of the video wall off the GUI thread
+    
+    Waits for new frames in the frame hub and paints only the tiles whose
+    camera has a newer frame into a screen-sized QImage, at most max_fps
+    times a second. The GUI thread just blits the finished image. Like
+    the capture threads, a new image is not sent while the previous one
+    has not been painted yet.
+    """
+    
+    frame_ready = pyqtSignal(QImage)
+    
+    SPACING = 4
+    MARGIN = 4
+    
+    def __init__(self, hub, template, cameras, max_fps=25):
+        super().__init__()
+        self.hub = hub
+        self.template = template
+        self.cameras = cameras  # (camera_id, name) per tile
+        self.interval = 1.0 / max(1, max_fps)
+        self.lock = threading.Lock()
+        self.size = None  # (width, height) of the screen window
+        self.running = True
+        self.pending = False
+    
+    def set_size(self, width, height):
+        with self.lock:
+            self.size = (width, height)
+    
+    def frame_shown(self):
+        """Called by the GUI once the last image has been painted"""
+        self.pending = False
+    
+    def stop(self):
+        self.running = False
+        self.wait()
+    
+    def run(self):
+        sequence = 0
+        size = None
+        canvas = None
+        rects = []
+        shown = {}  # camera_id -> sequence of the frame in its tile
+        dirty = False
+        while self.running:
+            # Sleep until a camera publishes; poll while a finished image waits for the GUI
+            sequence = self.hub.wait(sequence, self.interval if dirty else 0.5)
+            if not self.running:
+                break
+            started = time.monotonic()
+            with self.lock:
+                new_size = self.size
+            if new_size is None:
+                continue
+            if new_size != size:
+                size = new_size
+                canvas = QImage(size[0], size[1], QImage.Format_RGB32)
+                canvas.fill(Qt.black)
+                rects = tile_rects(self.template, size[0], size[1], self.SPACING, self.MARGIN)
+                shown.clear()
+                dirty = True
+            
+            painter = None
+            for (camera_id, name), rect in zip(self.cameras, rects):
+                latest = self.hub.latest(camera_id)
+                if latest is None:
+                    if shown.pop(camera_id, None) is not None:
+                        # Camera went away; blank its tile
+                        painter = painter or self.begin(canvas)
+                        painter.fillRect(QRect(*rect), Qt.black)
+                        dirty = True
+                    continue
+                if shown.get(camera_id) == latest[0]:
+                    continue
+                shown[camera_id] = latest[0]
+                painter = painter or self.begin(canvas)
+                self.paint_tile(painter, rect, latest[1], name)
+                dirty = True
+            if painter:
+                painter.end()
+            
+            if dirty and not self.pending:
+                dirty = False
+                self.pending = True
+                # QImage is implicitly shared: the next paint detaches from the copy the GUI holds
+                self.frame_ready.emit(canvas)
+            
+            elapsed = time.monotonic() - started
+            if elapsed < self.interval:
+                self.msleep(int((self.interval - elapsed) * 1000))
+    
+    def begin(self, canvas):
+        painter = QPainter(canvas)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        return painter
+    
+    def paint_tile(self, painter, rect, frame, name):
+        """Paint a frame scaled to fit its tile, with the camera name"""
+        x, y, w, h = rect
+        height, width = frame.shape[:2]
+        image = QImage(frame.data, width, height, 3 * width, QImage.Format_RGB888)
+        scale = min(w / width, h / height)
+        target = QRectF(x + (w - width * scale) / 2, y + (h - height * scale) / 2, width * scale, height * scale)
+        if target.width() < w or target.height() < h:
+            painter.fillRect(QRect(x, y, w, h), Qt.black)
+        painter.drawImage(target, image)
+        
+        # Name in the bottom-left corner
+        metrics = painter.fontMetrics()
+        label = QRect(x, y + h - metrics.height() - 8, metrics.horizontalAdvance(name) + 16, metrics.height() + 8)
+        painter.fillRect(label, QColor(0, 0, 0, 160))
+        painter.setPen(QColor("#E0E0E0"))
+        painter.drawText(label, Qt.AlignCenter, name)
+
+
+class VideoWallScreen(QWidget):
+    """Borderless full-screen camera grid on one monitor"""
+    
+    closed = pyqtSignal()
+    
+    def __init__(self, screen, template, cameras, max_fps=25, hub=None):
+        super().__init__(None, Qt.Window | Qt.FramelessWindowHint)
+        self.target_screen = screen
+        self.image = None
+        self.stopping = False
+        self.setWindowTitle(f"RedNVR Video Wall - {screen.name()}")
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setCursor(Qt.BlankCursor)
+        self.setGeometry(screen.geometry())
+        
+        self.render_thread = WallRenderThread(
+            hub or shared_hub(), template,
+            [(camera.camera_id, camera.name) for camera in cameras], max_fps
+        )
+        self.render_thread.frame_ready.connect(self.show_image)
+    
+    def open(self):
+        """Cover the screen and start rendering"""
+        self.show()
+        self.windowHandle().setScreen(self.target_screen)
+        self.setGeometry(self.target_screen.geometry())
+        self.showFullScreen()
+        self.render_thread.set_size(self.width(), self.height())
+        self.render_thread.start()
+    
+    def stop(self):
+        self.stopping = True
+        self.render_thread.stop()
+        self.close()
+    
+    def closeEvent(self, event):
+        """Closed from outside (window manager, Alt+F4): close the whole wall"""
+        super().closeEvent(event)
+        if not self.stopping:
+            self.stopping = True
+            self.render_thread.stop()
+            self.closed.emit()
+    
+    def show_image(self, image):
+        self.image = image
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.image is None or self.image.size() != self.size():
+            painter.fillRect(self.rect(), Qt.black)
+        if self.image is not None:
+            painter.drawImage(0, 0, self.image)
+        painter.end()
+        self.render_thread.frame_shown()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.render_thread.set_size(self.width(), self.height())
+    
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.closed.emit()
+        else:
+            super().keyPressEvent(event)
+
+
+class VideoWall(QObject):
+    """A full-screen camera grid on every attached monitor
+    
+    Each screen has its own layout template and its own render thread.
+    The cameras' capture threads publish display frames to the shared
+    frame hub while the wall is open, so a camera that appears on several
+    screens (or also in the main window) is still decoded only once.
+    """
+    
+    closed = pyqtSignal()
+    
+    def __init__(self, cameras, layouts=None, assignments=None, max_fps=25, parent=None):
+        super().__init__(parent)
+        self.cameras = list(cameras)  # CameraWidgets in grid order
+        self.layouts = layouts or []  # layout name per screen, 'grid' when missing
+        self.assignments = assignments  # camera ids per screen, None spreads all cameras
+        self.max_fps = max_fps
+        self.screens = []  # open VideoWallScreens
+        self.viewed = []  # cameras counted with add_wall_view()
+    
+    def screen_cameras(self, count):
+        """Cameras for each of count screens"""
+        if self.assignments:
+            by_id = {camera.camera_id: camera for camera in self.cameras}
+            groups = [[by_id[camera_id] for camera_id in group if camera_id in by_id]
+                      for group in self.assignments[:count]]
+            return groups + [[] for _ in range(count - len(groups))]
+        per_screen = max(1, math.ceil(len(self.cameras) / count))
+        return [self.cameras[i * per_screen:(i + 1) * per_screen] for i in range(count)]
+    
+    def open(self):
+        """Open one wall screen per monitor"""
+        screens = QApplication.screens()
+        for i, (screen, cameras) in enumerate(zip(screens, self.screen_cameras(len(screens)))):
+            layout = self.layouts[i] if i < len(self.layouts) and self.layouts[i] else 'grid'
+            try:
+                template = get_template(layout, len(cameras))
+            except ValueError:
+                logger.error(f"Unknown video wall layout for screen {i + 1}: {layout}")
+                template = get_template('grid', len(cameras))
+            cameras = cameras[:len(template.cells)]
+            for camera in cameras:
+                camera.add_wall_view()
+                self.viewed.append(camera)
+            wall_screen = VideoWallScreen(screen, template, cameras, self.max_fps)
+            wall_screen.closed.connect(self.closed)
+            self.screens.append(wall_screen)
+            wall_screen.open()
+        logger.info(f"Video wall opened on {len(self.screens)} screens, {len(set(self.viewed))} cameras")
+    
+    def close(self):
+        """Close all wall screens and stop decoding for them"""
+        for wall_screen in self.screens:
+            wall_screen.stop()
+        self.screens = []
+        hub = shared_hub()
+        for camera in self.viewed:
+            camera.remove_wall_view()
+            if not camera.wall_views:
+                hub.remove(camera.camera_id)
+        self.viewed = []
+    
+    def remove_camera(self, camera):
+        """Forget a camera that was removed while the wall is open"""
+        while camera in self.viewed:
+            self.viewed.remove(camera)
+            camera.remove_wall_view()
+        shared_hub().remove(camera.camera_id)